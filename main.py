@@ -6,6 +6,7 @@ Usage:
   python main.py --mode cli           # Run CLI interface
   python main.py --mode web           # Run web interface
   python main.py --mode evaluate      # Run evaluation
+  python main.py --mode evaluate --offline  # Replay cached searches only
 """
 
 import argparse
@@ -27,8 +28,13 @@ def run_web():
     subprocess.run([sys.executable, "-m", "streamlit", "run", "src/ui/streamlit_app.py"])
 
 
-async def run_evaluation():
-    """Run system evaluation using SystemEvaluator."""
+async def run_evaluation(offline: bool = False):
+    """
+    Run system evaluation using SystemEvaluator.
+
+    Args:
+        offline: Serve searches only from the search result cache
+    """
     import yaml
     from dotenv import load_dotenv
     from src.autogen_orchestrator import AutoGenOrchestrator
@@ -41,6 +47,11 @@ async def run_evaluation():
     with open("config.yaml", 'r') as f:
         config = yaml.safe_load(f)
 
+    if offline:
+        search_cache_config = config.setdefault("cache", {}).setdefault("search_results", {})
+        search_cache_config.update({"enabled": True, "offline": True})
+        print("Offline mode: searches are replayed from the search result cache")
+
     # Initialize AutoGen orchestrator
     print("Initializing AutoGen orchestrator...")
     orchestrator = AutoGenOrchestrator(config)
@@ -127,6 +138,11 @@ def main():
         default="config.yaml",
         help="Path to configuration file"
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Evaluate using cached search results only (no search API calls)"
+    )
 
     args = parser.parse_args()
 
@@ -135,7 +151,7 @@ def main():
     elif args.mode == "web":
         run_web()
     elif args.mode == "evaluate":
-        asyncio.run(run_evaluation())
+        asyncio.run(run_evaluation(offline=args.offline))
     elif args.mode == "autogen":
         run_autogen()
 
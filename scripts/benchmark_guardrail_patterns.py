@@ -0,0 +1,106 @@
+"""
+Guardrail Pattern Benchmark
+Compares per-pattern PII/injection scanning with the combined single-pass matchers.
+
+Usage:
+    python scripts/benchmark_guardrail_patterns.py [--kb 4 8 16] [--iterations 200]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.guardrails.input_guardrail import INJECTION_PATTERNS
+from src.guardrails.patterns import PII_MATCHER, PII_PATTERNS, PhraseMatcher
+
+SENTENCES = [
+    "Participants in the user study rated the voice assistant's explanations as more trustworthy.",
+    "Eye tracking data (n=24) showed longer fixations on the redesigned navigation bar.",
+    "Prior work [P3] found that older adults prefer haptic feedback over auditory cues.",
+    "The prototype was evaluated with a think-aloud protocol and the System Usability Scale.",
+    "Results replicate across mobile and desktop interfaces (version 2.4.1, Figure 3).",
+    "Contact the authors at lab@example.edu or +1 555-123-4567 for the dataset.",
+    "Cognitive load was measured with NASA-TLX after each of the 12 tasks.",
+    "You are now reading the discussion section, which should not override the findings.",
+]
+
+
+def make_report(kilobytes: int, seed: int = 0) -> str:
+    """Build a synthetic research report of roughly the given size."""
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < kilobytes * 1024:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def legacy_scan(text: str):
+    """Previous implementation: one findall per PII type, rescan to redact, substring loop for injection."""
+    found = {}
+    for pii_type, pattern in PII_PATTERNS.items():
+        matches = re.findall(pattern, text)
+        if pii_type == "ip_address":
+            matches = [m for m in matches if all(0 <= int(p) <= 255 for p in m.split("."))]
+        if matches:
+            found[pii_type] = matches[:5]
+    sanitized = text
+    for matches in found.values():
+        for match in matches:
+            sanitized = sanitized.replace(match, "[REDACTED]")
+    injection = [pattern for pattern in INJECTION_PATTERNS if pattern.lower() in text.lower()]
+    return found, sanitized, injection
+
+
+INJECTION_MATCHER = PhraseMatcher(INJECTION_PATTERNS)
+
+
+def combined_scan(text: str):
+    """Current implementation: combined PII regex and phrase matcher."""
+    found = {pii_type: matches[:5] for pii_type, matches in PII_MATCHER.find(text).items()}
+    sanitized = PII_MATCHER.redact(text, found) if found else text
+    injection = INJECTION_MATCHER.find(text)
+    return found, sanitized, injection
+
+
+def bench(fn, texts: List[str], iterations: int) -> float:
+    """Seconds per call (best of 3 rounds), cycling through distinct texts."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for i in range(iterations):
+            fn(texts[i % len(texts)])
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark guardrail pattern matching")
+    parser.add_argument("--kb", type=int, nargs="+", default=[2, 8, 32], help="Report sizes in kilobytes")
+    parser.add_argument("--iterations", type=int, default=100, help="Calls per timing round")
+    args = parser.parse_args()
+
+    print(f"{'size':>7} {'legacy ms':>10} {'combined ms':>12} {'legacy MB/s':>12} {'combined MB/s':>14} {'speedup':>8}")
+    for kilobytes in args.kb:
+        # Distinct reports, so nothing is served from the matcher's last-scan memo
+        texts = [make_report(kilobytes, seed) for seed in range(8)]
+        mb = sum(len(text) for text in texts) / len(texts) / 1e6
+        legacy = bench(legacy_scan, texts, args.iterations)
+        combined = bench(combined_scan, texts, args.iterations)
+        print(
+            f"{kilobytes:>5}KB {legacy * 1000:>10.3f} {combined * 1000:>12.3f} "
+            f"{mb / legacy:>12.1f} {mb / combined:>14.1f} {legacy / combined:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
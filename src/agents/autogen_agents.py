@@ -9,16 +9,102 @@ https://microsoft.github.io/autogen/stable/user-guide/agentchat-user-guide/examp
 """
 
 import os
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, AsyncGenerator, List, Optional, Sequence, Union
 from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import Response, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, ToolCallExecutionEvent, ToolCallRequestEvent
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.conditions import TextMentionTermination
+from autogen_core import CancellationToken
 from autogen_core.tools import FunctionTool
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_core.models import ModelFamily
 # Import our research tools
-from src.tools.web_search import web_search
-from src.tools.paper_search import paper_search
+from src.tools.web_search import web_search_async
+from src.tools.paper_search import paper_search_async
+from src.agents.context import create_model_context
+from src.agents.parallel_research import ParallelResearchTeam
+from src.agents.termination import ReviewTermination
+from src.budget import BudgetTermination
+from src.tracing import Span, Tracer, get_tracer
+
+
+# Pipeline stage each agent's turns are counted under in traces
+AGENT_STAGES = {
+    "Planner": "planning",
+    "Researcher": "research",
+    "Writer": "writing",
+    "Critic": "critique",
+}
+
+
+class TracedAssistantAgent(AssistantAgent):
+    """
+    AssistantAgent that records a trace span for every turn.
+
+    LLM requests and tool calls inside the turn are recorded as child spans,
+    timed from the agent's own event stream: an LLM request runs until the
+    model's tool call request or reply arrives, a tool call until its result
+    arrives.
+    """
+
+    async def on_messages_stream(
+        self,
+        messages: Sequence[BaseChatMessage],
+        cancellation_token: CancellationToken,
+    ) -> AsyncGenerator[Union[BaseAgentEvent, BaseChatMessage, Response], None]:
+        tracer = get_tracer()
+        turn = tracer.start_span(f"agent.{self.name}", AGENT_STAGES.get(self.name, "agent"), agent=self.name)
+        if turn is None:
+            async for item in super().on_messages_stream(messages, cancellation_token):
+                yield item
+            return
+
+        segment_start = turn.start_ns
+        error = None
+        try:
+            async for item in super().on_messages_stream(messages, cancellation_token):
+                now = time.time_ns()
+                if isinstance(item, ToolCallRequestEvent):
+                    self._record_llm_span(tracer, turn, segment_start, now, item)
+                    segment_start = now
+                elif isinstance(item, ToolCallExecutionEvent):
+                    for result in item.content:
+                        span = tracer.start_span(
+                            f"tool.{result.name}", "tool", parent=turn, start_ns=segment_start, call_id=result.call_id
+                        )
+                        span.end(now, error=result.content[:200] if result.is_error else None)
+                    segment_start = now
+                elif isinstance(item, Response) and item.chat_message.models_usage is not None:
+                    # Replies built from tool results alone involve no model call
+                    self._record_llm_span(tracer, turn, segment_start, now, item.chat_message)
+                yield item
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            turn.end(error=error)
+
+    def _record_llm_span(
+        self,
+        tracer: Tracer,
+        turn: Span,
+        start_ns: int,
+        end_ns: int,
+        message: Union[BaseAgentEvent, BaseChatMessage],
+    ):
+        """Record one model request, with its token usage if reported."""
+        span = tracer.start_span("llm.create", "llm", parent=turn, start_ns=start_ns, agent=self.name)
+        if message.models_usage is not None:
+            span.set_attribute("llm.prompt_tokens", message.models_usage.prompt_tokens)
+            span.set_attribute("llm.completion_tokens", message.models_usage.completion_tokens)
+        span.end(end_ns)
+
+
+def compact_tool_output(config: Dict[str, Any]) -> bool:
+    """Whether search tools return compact lines with source IDs (tools.output.format)."""
+    return config.get("tools", {}).get("output", {}).get("format", "compact") == "compact"
 
 
 def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
@@ -48,6 +134,9 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
         }
         if base_url and base_url.strip():
             client_kwargs["base_url"] = base_url
+        if model_client_stream_enabled(config):
+            # Streamed responses only report token usage when asked to
+            client_kwargs["stream_options"] = {"include_usage": True}
         
         try:
             return OpenAIChatCompletionClient(**client_kwargs)
@@ -63,6 +152,10 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
         if not base_url or not base_url.strip():
             raise ValueError("OPENAI_BASE_URL is required for vllm provider. Please set it in your .env file.")
         
+        client_kwargs = {}
+        if model_client_stream_enabled(config):
+            client_kwargs["stream_options"] = {"include_usage": True}
+        
         try:
             return OpenAIChatCompletionClient(
                 model=model_config.get("name", "gpt-4o-mini"),
@@ -75,6 +168,7 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
                     "family": ModelFamily.GPT_4O,
                     "structured_output": True,
                 },
+                **client_kwargs,
             )
         except Exception as e:
             raise ValueError(f"Failed to create vLLM client: {e}. Check your API key and base_url configuration.") from e
@@ -83,6 +177,19 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
         raise ValueError(f"Unsupported provider: {provider}")
 
 
+def model_client_stream_enabled(config: Dict[str, Any]) -> bool:
+    """
+    Check whether agents should stream model output token by token.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        True if models.default.stream is enabled
+    """
+    return bool(config.get("models", {}).get("default", {}).get("stream", False))
+
+
 def create_planner_agent(config: Dict[str, Any], model_client: OpenAIChatCompletionClient) -> AssistantAgent:
     """
     Create a Planner Agent using AutoGen.
@@ -118,11 +225,13 @@ Be specific about what information to gather and why it's relevant."""
     else:
         system_message = default_system_message
 
-    planner = AssistantAgent(
+    planner = TracedAssistantAgent(
         name="Planner",
         model_client=model_client,
         description="Breaks down research queries into actionable steps",
         system_message=system_message,
+        model_client_stream=model_client_stream_enabled(config),
+        model_context=create_model_context(config),
     )
     
     return planner
@@ -156,6 +265,12 @@ You have access to tools for web search and paper search. When conducting resear
 6. IMPORTANT: Limit your searches - use paper_search with max_results=10 at most, and web_search with max_results=5. Do NOT make excessive API calls.
 7. After gathering sufficient information (5-10 sources total), summarize your findings and move to the next step."""
 
+    if compact_tool_output(config):
+        default_system_message = default_system_message.replace(
+            "4. Note all source URLs and citations",
+            "4. Tag every finding with the source IDs from the tool output, e.g. [P1] or [W2]",
+        )
+
     # Use custom prompt from config if available
     custom_prompt = agent_config.get("system_prompt", "")
     if custom_prompt and custom_prompt != "You are a researcher. Find and collect relevant information from various sources.":
@@ -163,24 +278,28 @@ You have access to tools for web search and paper search. When conducting resear
     else:
         system_message = default_system_message
 
-    # Wrap tools in FunctionTool
+    # Wrap tools in FunctionTool (async functions run directly on the team's event loop)
     web_search_tool = FunctionTool(
-        web_search,
+        web_search_async,
+        name="web_search",
         description="Search the web for articles, blog posts, and general information. Returns formatted search results with titles, URLs, and snippets."
     )
     
     paper_search_tool = FunctionTool(
-        paper_search,
+        paper_search_async,
+        name="paper_search",
         description="Search academic papers on Semantic Scholar. Returns papers with authors, abstracts, citation counts, and URLs. Use year_from parameter to filter recent papers."
     )
 
     # Create the researcher with tool access
-    researcher = AssistantAgent(
+    researcher = TracedAssistantAgent(
         name="Researcher",
         model_client=model_client,
         tools=[web_search_tool, paper_search_tool],
         description="Gathers evidence from web and academic sources using search tools",
         system_message=system_message,
+        model_client_stream=model_client_stream_enabled(config),
+        model_context=create_model_context(config),
     )
     
     return researcher
@@ -215,6 +334,18 @@ When writing:
 
 Format your response professionally with clear headings, paragraphs, in-text citations, and a References section at the end."""
 
+    if compact_tool_output(config):
+        default_system_message = default_system_message.replace(
+            "3. Cite sources inline using [Source: Title/Author]",
+            "3. Cite sources inline by their IDs from the research, e.g. [P1] or [W2]",
+        ).replace(
+            "6. Include a references section at the end",
+            "6. Do not write a references section; one is built from the cited IDs",
+        ).replace(
+            "in-text citations, and a References section at the end.",
+            "and in-text citations by source ID.",
+        )
+
     # Use custom prompt from config if available
     custom_prompt = agent_config.get("system_prompt", "")
     if custom_prompt and custom_prompt != "You are a writer. Synthesize research findings into a coherent report.":
@@ -222,11 +353,13 @@ Format your response professionally with clear headings, paragraphs, in-text cit
     else:
         system_message = default_system_message
 
-    writer = AssistantAgent(
+    writer = TracedAssistantAgent(
         name="Writer",
         model_client=model_client,
         description="Synthesizes research findings into coherent, well-cited responses",
         system_message=system_message,
+        model_client_stream=model_client_stream_enabled(config),
+        model_context=create_model_context(config),
     )
     
     return writer
@@ -258,7 +391,9 @@ Evaluate the research and writing on these criteria:
 4. **Accuracy**: Are there any factual errors or contradictions?
 5. **Clarity**: Is the writing clear and well-organized?
 
-Provide constructive but thorough feedback. End your evaluation with either "TERMINATE" if approved, or suggest specific improvements."""
+Provide constructive but thorough feedback. End your evaluation with exactly one verdict:
+- "APPROVED - RESEARCH COMPLETE" if the response is ready to be returned
+- "NEEDS REVISION" followed by the specific improvements required"""
 
     # Use custom prompt from config if available
     custom_prompt = agent_config.get("system_prompt", "")
@@ -267,43 +402,146 @@ Provide constructive but thorough feedback. End your evaluation with either "TER
     else:
         system_message = default_system_message
 
-    critic = AssistantAgent(
+    critic = TracedAssistantAgent(
         name="Critic",
         model_client=model_client,
         description="Evaluates research quality and provides feedback",
         system_message=system_message,
+        model_client_stream=model_client_stream_enabled(config),
+        model_context=create_model_context(config),
     )
     
     return critic
 
 
-def create_research_team(config: Dict[str, Any]) -> RoundRobinGroupChat:
+def create_research_team(
+    config: Dict[str, Any],
+    budget: Optional[BudgetTermination] = None,
+    review: Optional[ReviewTermination] = None
+) -> Union[RoundRobinGroupChat, ParallelResearchTeam]:
     """
-    Create the research team as a RoundRobinGroupChat.
+    Create the research team.
+    
+    Uses a RoundRobinGroupChat by default. With system.orchestration_mode set to
+    "parallel", a ParallelResearchTeam is created instead, which dispatches the
+    Planner's sub-questions to several Researcher workers concurrently.
     
     Args:
         config: Configuration dictionary
+        budget: Optional budget termination that stops the team once the
+            query's token or round budget is spent
+        review: Optional review policy (stop on Critic approval, cap revisions,
+            skip the Critic); built from agents.critic settings if not given
         
     Returns:
-        RoundRobinGroupChat with all agents configured
+        RoundRobinGroupChat or ParallelResearchTeam with all agents configured
     """
     # Create model client (shared by all agents)
     model_client = create_model_client(config)
     
+    if review is None:
+        review = ReviewTermination(
+            max_revisions=config.get("agents", {}).get("critic", {}).get("max_revisions", 1)
+        )
+    
+    mode = config.get("system", {}).get("orchestration_mode", "round_robin")
+    if mode == "parallel":
+        return create_parallel_research_team(config, model_client, budget, review)
+    if mode != "round_robin":
+        raise ValueError(f"Unknown orchestration_mode: {mode}")
+    
     # Create all agents
     planner = create_planner_agent(config, model_client)
     researcher = create_researcher_agent(config, model_client)
     writer = create_writer_agent(config, model_client)
     critic = create_critic_agent(config, model_client)
     
-    # Create termination condition
-    termination = TextMentionTermination("TERMINATE")
+    participants = [planner, researcher, writer, critic]
+    
+    # Create termination condition: Critic verdicts drive the review loop,
+    # "TERMINATE" is still honoured for custom prompts that use it
+    termination = review | TextMentionTermination("TERMINATE")
+    if budget is not None:
+        budget.agents_per_round = len(participants)
+        termination = termination | budget
     
     # Create team with round-robin ordering
     team = RoundRobinGroupChat(
-        participants=[planner, researcher, writer, critic],
+        participants=participants,
         termination_condition=termination,
     )
     
     return team
 
+
+async def close_research_team(team: Union[RoundRobinGroupChat, ParallelResearchTeam]) -> None:
+    """
+    Close the model clients used by a team's agents.
+
+    All agents of a team share one client, so each client is closed once.
+
+    Args:
+        team: Team built by create_research_team()
+    """
+    if isinstance(team, ParallelResearchTeam):
+        agents = team.participants
+    else:
+        agents = getattr(team, "_participants", [])
+    clients = {}
+    for agent in agents:
+        client = getattr(agent, "_model_client", None)
+        if client is not None:
+            clients[id(client)] = client
+    for client in clients.values():
+        await client.close()
+
+
+def _combine_conditions(*conditions: Optional[TerminationCondition]) -> Optional[TerminationCondition]:
+    """OR together the given termination conditions, ignoring missing ones."""
+    combined = None
+    for condition in conditions:
+        if condition is not None:
+            combined = condition if combined is None else combined | condition
+    return combined
+
+
+def create_parallel_research_team(
+    config: Dict[str, Any],
+    model_client: OpenAIChatCompletionClient,
+    budget: Optional[BudgetTermination] = None,
+    review: Optional[ReviewTermination] = None
+) -> ParallelResearchTeam:
+    """
+    Create a research team that researches the Planner's sub-questions in parallel.
+    
+    Args:
+        config: Configuration dictionary
+        model_client: Model client shared by all agents
+        budget: Optional budget termination checked as agents reply
+        review: Optional review policy (used to skip the Critic for simple queries)
+        
+    Returns:
+        ParallelResearchTeam with one planner, several researcher workers,
+        a writer and (if enabled) a critic
+    """
+    researcher_config = config.get("agents", {}).get("researcher", {})
+    num_workers = max(1, researcher_config.get("num_workers", 3))
+    
+    critic_config = config.get("agents", {}).get("critic", {})
+    critic = None
+    if critic_config.get("enabled", True):
+        critic = create_critic_agent(config, model_client)
+    
+    team = ParallelResearchTeam(
+        planner=create_planner_agent(config, model_client),
+        researchers=[create_researcher_agent(config, model_client) for _ in range(num_workers)],
+        writer=create_writer_agent(config, model_client),
+        critic=critic,
+        max_sub_questions=researcher_config.get("max_sub_questions", 4),
+        termination_condition=_combine_conditions(review, budget),
+        speculative_drafting=config.get("agents", {}).get("writer", {}).get("speculative_drafting", False),
+        max_revisions=review.max_revisions if review is not None else critic_config.get("max_revisions", 1),
+    )
+    if budget is not None:
+        budget.agents_per_round = len(team.participants)
+    return team
@@ -0,0 +1,198 @@
+"""
+Compacting Model Context
+
+By default every AssistantAgent resends its entire conversation history to
+the model on every turn, so prompts (and per-turn latency) grow with the
+length of the conversation. CompactingChatCompletionContext bounds what is
+sent while the team is running:
+
+- The first message (the research query) is always kept
+- Only the most recent messages are kept verbatim; older ones are replaced
+  by a short extractive summary (one line per dropped message)
+- Tool outputs that are no longer the latest are truncated, since search
+  results have usually been digested by the agent's reply already
+
+The full history is still stored, so saving/loading agent state and the
+final conversation_history are unaffected.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from autogen_core import Component
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import (
+    AssistantMessage,
+    FunctionExecutionResult,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    UserMessage,
+)
+from pydantic import BaseModel
+from typing_extensions import Self
+
+
+class CompactingChatCompletionContextConfig(BaseModel):
+    keep_recent_messages: int = 8
+    max_tool_output_chars: int = 1500
+    max_message_chars: int = 4000
+    summary_line_chars: int = 160
+    initial_messages: Optional[List[LLMMessage]] = None
+
+
+class CompactingChatCompletionContext(ChatCompletionContext, Component[CompactingChatCompletionContextConfig]):
+    """
+    Model context that keeps the query plus recent turns and compacts the rest.
+    """
+
+    component_config_schema = CompactingChatCompletionContextConfig
+    component_provider_override = "src.agents.context.CompactingChatCompletionContext"
+
+    MAX_SUMMARY_LINES = 20
+
+    def __init__(
+        self,
+        keep_recent_messages: int = 8,
+        max_tool_output_chars: int = 1500,
+        max_message_chars: int = 4000,
+        summary_line_chars: int = 160,
+        initial_messages: Optional[List[LLMMessage]] = None,
+    ):
+        """
+        Initialize compacting context.
+
+        Args:
+            keep_recent_messages: Number of most recent messages sent verbatim
+            max_tool_output_chars: Length older tool outputs are truncated to
+            max_message_chars: Length any kept message other than the latest is truncated to
+            summary_line_chars: Length of each line in the summary of dropped messages
+            initial_messages: Optional initial messages
+        """
+        super().__init__(initial_messages)
+        if keep_recent_messages <= 0:
+            raise ValueError("keep_recent_messages must be greater than 0")
+        self.keep_recent_messages = keep_recent_messages
+        self.max_tool_output_chars = max_tool_output_chars
+        self.max_message_chars = max_message_chars
+        self.summary_line_chars = summary_line_chars
+
+    async def get_messages(self) -> List[LLMMessage]:
+        """Get the compacted view of the conversation sent to the model."""
+        messages = list(self._messages)
+        if len(messages) > self.keep_recent_messages + 1:
+            head = messages[:1]
+            dropped = messages[1:-self.keep_recent_messages]
+            recent = messages[-self.keep_recent_messages:]
+            # A tool result whose call was dropped would be rejected by the API,
+            # so extend the window back to the call instead of dropping the result
+            # (it may be the tool output the model is answering)
+            while dropped and isinstance(recent[0], FunctionExecutionResultMessage):
+                recent.insert(0, dropped.pop())
+            summary = self._summarize(dropped) if dropped else None
+            messages = head + ([summary] if summary else []) + recent
+        else:
+            summary = None
+
+        # The last message is what the model is responding to, keep it whole
+        latest_tool_output = max(
+            (i for i, m in enumerate(messages) if isinstance(m, FunctionExecutionResultMessage)),
+            default=-1,
+        )
+        compacted = []
+        for i, message in enumerate(messages):
+            if i == len(messages) - 1 or i == latest_tool_output or message is summary:
+                compacted.append(message)
+            elif isinstance(message, FunctionExecutionResultMessage):
+                compacted.append(self._truncate_tool_results(message))
+            else:
+                compacted.append(self._truncate_text(message, self.max_message_chars))
+        return compacted
+
+    def _summarize(self, dropped: List[LLMMessage]) -> UserMessage:
+        """Replace dropped messages with one line each."""
+        lines = []
+        for message in dropped:
+            if isinstance(message, FunctionExecutionResultMessage):
+                names = ", ".join(result.name for result in message.content)
+                lines.append(f"- [tool output from {names}]")
+                continue
+            content = message.content if isinstance(getattr(message, "content", None), str) else None
+            if content is None:
+                if isinstance(message, AssistantMessage):
+                    names = ", ".join(call.name for call in message.content)
+                    lines.append(f"- {message.source}: [called {names}]")
+                continue
+            source = getattr(message, "source", "user")
+            text = " ".join(content.split())
+            if len(text) > self.summary_line_chars:
+                text = text[:self.summary_line_chars] + "..."
+            lines.append(f"- {source}: {text}")
+
+        # Keep the summary itself bounded in very long conversations
+        if len(lines) > self.MAX_SUMMARY_LINES:
+            omitted = len(lines) - self.MAX_SUMMARY_LINES
+            lines = [f"- ... {omitted} older message(s) omitted"] + lines[-self.MAX_SUMMARY_LINES:]
+
+        return UserMessage(
+            content=f"[{len(dropped)} earlier message(s) condensed]\n" + "\n".join(lines),
+            source="context_summary",
+        )
+
+    def _truncate_tool_results(self, message: FunctionExecutionResultMessage) -> FunctionExecutionResultMessage:
+        """Shorten each result in a tool output message."""
+        results = [
+            FunctionExecutionResult(
+                content=self._clip(result.content, self.max_tool_output_chars),
+                name=result.name,
+                call_id=result.call_id,
+                is_error=result.is_error,
+            )
+            for result in message.content
+        ]
+        return FunctionExecutionResultMessage(content=results)
+
+    def _truncate_text(self, message: LLMMessage, max_chars: int) -> LLMMessage:
+        """Shorten a text message (messages with images or tool calls are left alone)."""
+        content = getattr(message, "content", None)
+        if not isinstance(content, str) or len(content) <= max_chars:
+            return message
+        return message.model_copy(update={"content": self._clip(content, max_chars)})
+
+    @staticmethod
+    def _clip(text: str, max_chars: int) -> str:
+        """Cut text to max_chars, noting how much was removed."""
+        if len(text) <= max_chars:
+            return text
+        return f"{text[:max_chars]}... [truncated {len(text) - max_chars} characters]"
+
+    def _to_config(self) -> CompactingChatCompletionContextConfig:
+        return CompactingChatCompletionContextConfig(
+            keep_recent_messages=self.keep_recent_messages,
+            max_tool_output_chars=self.max_tool_output_chars,
+            max_message_chars=self.max_message_chars,
+            summary_line_chars=self.summary_line_chars,
+            initial_messages=self._initial_messages,
+        )
+
+    @classmethod
+    def _from_config(cls, config: CompactingChatCompletionContextConfig) -> Self:
+        return cls(**config.model_dump())
+
+
+def create_model_context(config: Dict[str, Any]) -> Optional[CompactingChatCompletionContext]:
+    """
+    Create a compacting model context for one agent from agents.context.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        New context instance, or None to keep AutoGen's unbounded default
+    """
+    context_config = config.get("agents", {}).get("context", {})
+    if not context_config.get("compact", True):
+        return None
+    return CompactingChatCompletionContext(
+        keep_recent_messages=context_config.get("keep_recent_messages", 8),
+        max_tool_output_chars=context_config.get("max_tool_output_chars", 1500),
+        max_message_chars=context_config.get("max_message_chars", 4000),
+    )
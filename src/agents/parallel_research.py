@@ -0,0 +1,540 @@
+"""
+Parallel Research Team
+
+Alternative to the RoundRobinGroupChat workflow where the Planner's
+sub-questions are researched concurrently instead of through one
+Researcher turn at a time.
+
+Workflow:
+1. Planner: Breaks the query into sub-questions
+2. Researcher workers: Each sub-question is dispatched to a free worker,
+   workers run in parallel and call web_search / paper_search themselves
+3. Writer: Synthesizes the merged findings
+4. Critic: Evaluates the draft; on "NEEDS REVISION" the Writer revises it and
+   the Critic reviews again, until approval or max_revisions revisions
+
+With speculative drafting enabled, the Writer starts drafting as soon as
+the first findings arrive and revises the draft as the rest land, so the
+time after the slowest search is one incremental revision instead of a
+full draft.
+
+The team exposes the same run()/run_stream()/reset() surface as
+RoundRobinGroupChat, so the orchestrator and team pool can use either
+interchangeably.
+"""
+
+import asyncio
+import logging
+import re
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import Response, TaskResult, TerminationCondition
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    ModelClientStreamingChunkEvent,
+    StopMessage,
+    TextMessage,
+)
+from autogen_core import CancellationToken
+
+from src.agents.termination import parse_verdict
+
+
+PLANNER_FANOUT_INSTRUCTIONS = """
+Your plan will be researched in parallel. List between 2 and {max_sub_questions} independent
+sub-questions, each on its own line starting with "SUB-QUESTION:". Each sub-question must be
+answerable on its own with a few web or paper searches."""
+
+REVISION_INSTRUCTIONS = """New research findings have arrived. Revise your previous draft to incorporate
+them, keeping everything that is still accurate and citing the new sources.
+
+"""
+
+AgentMessage = Union[BaseAgentEvent, BaseChatMessage]
+Emit = Callable[[AgentMessage], Awaitable[None]]
+
+
+def parse_sub_questions(plan: str, max_sub_questions: int) -> List[str]:
+    """
+    Extract sub-questions from the Planner's output.
+
+    Prefers explicit "SUB-QUESTION:" lines and falls back to numbered or
+    bulleted lines that end with a question mark.
+
+    Args:
+        plan: Planner response text
+        max_sub_questions: Maximum number of sub-questions to return
+
+    Returns:
+        List of sub-question strings (may be empty)
+    """
+    explicit = re.findall(r"^\s*(?:[-*\d.)\s]*)SUB-QUESTION:\s*(.+?)\s*$", plan, re.MULTILINE | re.IGNORECASE)
+    if explicit:
+        questions = explicit
+    else:
+        questions = re.findall(r"^\s*(?:\d+[.)]|[-*])\s+(.+\?)\s*$", plan, re.MULTILINE)
+
+    # Deduplicate while keeping order
+    seen = set()
+    unique = []
+    for question in questions:
+        key = question.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(question.strip())
+    return unique[:max_sub_questions]
+
+
+class ParallelResearchTeam:
+    """
+    Planner-guided research team with concurrent Researcher workers.
+
+    Each worker is its own AssistantAgent (agents keep conversation state),
+    so at most num_workers sub-questions are researched at the same time.
+    """
+
+    def __init__(
+        self,
+        planner: AssistantAgent,
+        researchers: List[AssistantAgent],
+        writer: AssistantAgent,
+        critic: Optional[AssistantAgent] = None,
+        max_sub_questions: int = 4,
+        termination_condition: Optional[TerminationCondition] = None,
+        speculative_drafting: bool = False,
+        max_revisions: int = 1,
+    ):
+        """
+        Initialize parallel research team.
+
+        Args:
+            planner: Planner agent
+            researchers: Researcher worker agents (at least one)
+            writer: Writer agent
+            critic: Optional Critic agent
+            max_sub_questions: Maximum number of sub-questions researched per query
+            termination_condition: Optional condition checked on every message;
+                once it fires, the workflow stops at the next stage boundary
+            speculative_drafting: Start the Writer on the first findings and
+                revise the draft as more findings arrive
+            max_revisions: Number of "NEEDS REVISION" verdicts the Writer
+                revises for before the latest draft is returned
+        """
+        if not researchers:
+            raise ValueError("ParallelResearchTeam needs at least one researcher worker")
+
+        self.planner = planner
+        self.researchers = researchers
+        self.writer = writer
+        self.critic = critic
+        self.max_sub_questions = max_sub_questions
+        self.termination_condition = termination_condition
+        self.speculative_drafting = speculative_drafting
+        self.max_revisions = max(0, max_revisions)
+        # Draft counts of the last run (speculative drafting only)
+        self.drafting_stats: Optional[Dict[str, int]] = None
+        self.logger = logging.getLogger("agents.parallel_research")
+        self._is_running = False
+        self._stop_message: Optional[StopMessage] = None
+
+    @property
+    def participants(self) -> List[AssistantAgent]:
+        """All agents in the team."""
+        agents = [self.planner, *self.researchers, self.writer]
+        if self.critic:
+            agents.append(self.critic)
+        return agents
+
+    async def run(
+        self,
+        task: str,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> TaskResult:
+        """
+        Run the full plan → parallel research → write → critique workflow.
+
+        Args:
+            task: Task message from the orchestrator
+            cancellation_token: Optional token to cancel the run
+
+        Returns:
+            TaskResult with every message produced, in completion order
+        """
+        messages: List[AgentMessage] = []
+
+        async def _collect(message: AgentMessage) -> None:
+            # Streaming chunks are only useful live, the full message follows them
+            if not isinstance(message, ModelClientStreamingChunkEvent):
+                messages.append(message)
+
+        stop_reason = await self._run_workflow(task, _collect, cancellation_token or CancellationToken())
+        return TaskResult(messages=messages, stop_reason=stop_reason)
+
+    async def run_stream(
+        self,
+        task: str,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[AgentMessage, TaskResult], None]:
+        """
+        Run the workflow, yielding messages as agents produce them.
+
+        Messages from concurrent Researcher workers are interleaved in arrival
+        order. The last item yielded is the TaskResult.
+
+        Args:
+            task: Task message from the orchestrator
+            cancellation_token: Optional token to cancel the run
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        messages: List[AgentMessage] = []
+
+        async def _enqueue(message: AgentMessage) -> None:
+            await queue.put(message)
+
+        workflow = asyncio.ensure_future(
+            self._run_workflow(task, _enqueue, cancellation_token or CancellationToken())
+        )
+        workflow.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                yield message
+                if not isinstance(message, ModelClientStreamingChunkEvent):
+                    messages.append(message)
+            # Re-raises any error from the workflow
+            stop_reason = await workflow
+        finally:
+            if not workflow.done():
+                workflow.cancel()
+
+        yield TaskResult(messages=messages, stop_reason=stop_reason)
+
+    async def reset(self) -> None:
+        """Reset all agents to their initial state."""
+        if self._is_running:
+            raise RuntimeError("The team is currently running. It must be stopped before it can be reset.")
+        token = CancellationToken()
+        for agent in self.participants:
+            await agent.on_reset(token)
+
+    async def _run_workflow(self, task: str, emit: Emit, cancellation_token: CancellationToken) -> str:
+        """
+        Execute the workflow, passing every produced message to emit().
+
+        Returns:
+            Stop reason
+        """
+        if self._is_running:
+            raise ValueError("The team is already running, it cannot run again until it is stopped.")
+        self._is_running = True
+        self._stop_message = None
+        self.drafting_stats = None
+        if self.termination_condition is not None:
+            await self.termination_condition.reset()
+
+        async def _emit(message: AgentMessage) -> None:
+            await emit(message)
+            await self._check_termination(message)
+
+        try:
+            task_message = TextMessage(content=task, source="user")
+            await _emit(task_message)
+
+            # 1. Plan
+            plan_request = TextMessage(
+                content=task + PLANNER_FANOUT_INSTRUCTIONS.format(max_sub_questions=self.max_sub_questions),
+                source="user",
+            )
+            plan_response = await self._ask(self.planner, [plan_request], _emit, cancellation_token)
+            if self._stop_message:
+                return self._stop_message.content
+
+            sub_questions = parse_sub_questions(
+                self._text(plan_response.chat_message), self.max_sub_questions
+            )
+            if not sub_questions:
+                self.logger.info("Planner produced no sub-questions, researching the query as a whole")
+                sub_questions = [task]
+            self.logger.info(
+                f"Dispatching {len(sub_questions)} sub-question(s) to {len(self.researchers)} researcher worker(s)"
+            )
+
+            if self.speculative_drafting and len(sub_questions) > 1:
+                # 2+3. Research concurrently while the Writer drafts from what has arrived
+                draft = await self._research_and_draft(task_message, sub_questions, _emit, cancellation_token)
+                if self._stop_message or draft is None:
+                    return self._stop_message.content if self._stop_message else "No draft produced"
+            else:
+                # 2. Research sub-questions concurrently
+                findings = await self._research_all(task, sub_questions, _emit, cancellation_token)
+                if self._stop_message:
+                    return self._stop_message.content
+
+                # 3. Write from merged findings
+                merged = TextMessage(content=self._merge_findings(sub_questions, findings), source="Researcher")
+                draft_response = await self._ask(self.writer, [task_message, merged], _emit, cancellation_token)
+                draft = draft_response.chat_message
+                if self._stop_message:
+                    return self._stop_message.content
+
+            # 4. Critique, revising until approval or the revision cap
+            if self.critic:
+                await self._review(task_message, draft, _emit, cancellation_token)
+
+            return self._stop_message.content if self._stop_message else "Parallel research workflow complete"
+        finally:
+            self._is_running = False
+            if self._stop_message and self.termination_condition is not None:
+                await self.termination_condition.reset()
+
+    async def _review(
+        self,
+        task_message: TextMessage,
+        draft: BaseChatMessage,
+        emit: Emit,
+        cancellation_token: CancellationToken,
+    ) -> None:
+        """
+        Have the Critic review the draft and the Writer revise it on
+        "NEEDS REVISION", as the round-robin team does.
+
+        Stops on approval, on a review without a verdict, when the
+        termination condition fires, or once max_revisions revisions were made.
+        """
+        revisions = 0
+        while True:
+            critique = await self._ask(self.critic, [task_message, draft], emit, cancellation_token)
+            if self._stop_message:
+                return
+            if parse_verdict(self._text(critique.chat_message)) != "revision" or revisions >= self.max_revisions:
+                return
+
+            # The Writer's context still holds the findings and its draft
+            revisions += 1
+            revision = await self._ask(self.writer, [critique.chat_message], emit, cancellation_token)
+            draft = revision.chat_message
+            if self._stop_message:
+                return
+
+    async def _check_termination(self, message: AgentMessage) -> None:
+        """Feed a message to the termination condition and remember when it fires."""
+        if self.termination_condition is None or self._stop_message is not None:
+            return
+        if isinstance(message, ModelClientStreamingChunkEvent):
+            return
+        stop_message = await self.termination_condition([message])
+        if stop_message is not None:
+            self.logger.info(f"Stopping parallel research: {stop_message.content}")
+            self._stop_message = stop_message
+
+    async def _research_all(
+        self,
+        task: str,
+        sub_questions: List[str],
+        emit: Emit,
+        cancellation_token: CancellationToken,
+    ) -> List[str]:
+        """
+        Research every sub-question, at most one per worker at a time.
+
+        Returns:
+            Findings text per sub-question (same order as sub_questions)
+        """
+        return await asyncio.gather(*self._start_research(task, sub_questions, emit, cancellation_token))
+
+    def _start_research(
+        self,
+        task: str,
+        sub_questions: List[str],
+        emit: Emit,
+        cancellation_token: CancellationToken,
+    ) -> List["asyncio.Task[str]"]:
+        """
+        Schedule research of every sub-question on the worker pool.
+
+        Returns:
+            One task per sub-question (same order as sub_questions), each
+            resolving to that sub-question's findings text
+        """
+        idle_workers: asyncio.Queue = asyncio.Queue()
+        for worker in self.researchers:
+            idle_workers.put_nowait(worker)
+
+        async def _research(index: int, sub_question: str) -> str:
+            worker = await idle_workers.get()
+            if self._stop_message:
+                idle_workers.put_nowait(worker)
+                return "No findings (stopped before research started)"
+            try:
+                # Workers are reused across sub-questions, start each from a clean context
+                await worker.on_reset(cancellation_token)
+                request = TextMessage(
+                    content=f"{task}\n\nResearch this sub-question ({index + 1}/{len(sub_questions)}): {sub_question}",
+                    source="Planner",
+                )
+                response = await self._ask(worker, [request], emit, cancellation_token)
+                return self._text(response.chat_message)
+            except Exception as e:
+                # One failed worker shouldn't sink the whole query
+                self.logger.error(f"Research failed for sub-question '{sub_question}': {e}")
+                return f"No findings (research failed: {e})"
+            finally:
+                idle_workers.put_nowait(worker)
+
+        return [asyncio.ensure_future(_research(i, q)) for i, q in enumerate(sub_questions)]
+
+    async def _research_and_draft(
+        self,
+        task_message: TextMessage,
+        sub_questions: List[str],
+        emit: Emit,
+        cancellation_token: CancellationToken,
+    ) -> Optional[BaseChatMessage]:
+        """
+        Research sub-questions while the Writer drafts from the findings so far.
+
+        One draft is in flight at a time. When it finishes and new findings
+        have arrived meanwhile, the Writer revises it with just the new
+        findings (merge). If research finishes while a draft built from less
+        than half of the findings is still running, that draft is cancelled
+        and redone with everything (discard). Drafts that don't cover all
+        findings are emitted with metadata speculative="true".
+
+        Returns:
+            The final draft (None if stopped before any draft finished)
+        """
+        research = self._start_research(task_message.content, sub_questions, emit, cancellation_token)
+        index_of = {task: index for index, task in enumerate(research)}
+        pending: Set[asyncio.Future] = set(research)
+        findings: Dict[int, str] = {}
+
+        draft: Optional[BaseChatMessage] = None
+        covered: Set[int] = set()
+        drafting: Optional[asyncio.Future] = None
+        drafting_covers: Set[int] = set()
+        stats = {"drafts": 0, "revisions": 0, "discarded": 0}
+        self.drafting_stats = stats
+
+        try:
+            while pending or drafting is not None:
+                waiting = pending | ({drafting} if drafting is not None else set())
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                for finished in done & pending:
+                    findings[index_of[finished]] = finished.result()
+                    pending.discard(finished)
+
+                if drafting is not None and drafting in done:
+                    draft, covered = drafting.result(), drafting_covers
+                    drafting = None
+                    if pending or covered != set(findings):
+                        # Superseded once the remaining findings are merged in
+                        draft.metadata["speculative"] = "true"
+                    await emit(draft)
+
+                if self._stop_message:
+                    break
+
+                if drafting is not None and not pending and len(drafting_covers) * 2 < len(findings):
+                    # Research is done and the running draft saw too little of it
+                    drafting.cancel()
+                    await asyncio.gather(drafting, return_exceptions=True)
+                    drafting = None
+                    stats["discarded"] += 1
+
+                new_findings = sorted(set(findings) - covered)
+                if drafting is None and new_findings:
+                    stats["revisions" if draft is not None else "drafts"] += 1
+                    drafting_covers = covered | set(new_findings)
+                    drafting = asyncio.ensure_future(
+                        self._draft(task_message, draft, sub_questions, findings, new_findings, emit, cancellation_token)
+                    )
+        finally:
+            for unfinished in pending | ({drafting} if drafting is not None else set()):
+                unfinished.cancel()
+
+        self.logger.info(
+            f"Speculative drafting: {stats['drafts']} draft(s), {stats['revisions']} revision(s), "
+            f"{stats['discarded']} discarded"
+        )
+        return draft
+
+    async def _draft(
+        self,
+        task_message: TextMessage,
+        previous_draft: Optional[BaseChatMessage],
+        sub_questions: List[str],
+        findings: Dict[int, str],
+        indices: List[int],
+        emit: Emit,
+        cancellation_token: CancellationToken,
+    ) -> BaseChatMessage:
+        """
+        Ask the Writer for a first draft, or a revision of previous_draft,
+        from the findings of the given sub-questions.
+
+        Returns:
+            The Writer's reply (not yet emitted)
+        """
+        # Every draft is a self-contained request, so cancelled drafts leave nothing behind
+        await self.writer.on_reset(cancellation_token)
+        merged = self._merge_findings([sub_questions[i] for i in indices], [findings[i] for i in indices])
+        if previous_draft is None:
+            messages = [task_message, TextMessage(content=merged, source="Researcher")]
+        else:
+            messages = [
+                task_message,
+                TextMessage(content=self._text(previous_draft), source=self.writer.name),
+                TextMessage(content=REVISION_INSTRUCTIONS + merged, source="Researcher"),
+            ]
+        response = await self._ask(self.writer, messages, emit, cancellation_token, emit_reply=False)
+        return response.chat_message
+
+    @staticmethod
+    def _merge_findings(sub_questions: Sequence[str], findings: Sequence[str]) -> str:
+        """Combine per-sub-question findings into one message for the Writer."""
+        sections = [
+            f"## Sub-question {i}: {question}\n{finding}"
+            for i, (question, finding) in enumerate(zip(sub_questions, findings), 1)
+        ]
+        return "Research findings gathered in parallel:\n\n" + "\n\n".join(sections)
+
+    @staticmethod
+    async def _ask(
+        agent: AssistantAgent,
+        messages: Sequence[BaseChatMessage],
+        emit: Emit,
+        cancellation_token: CancellationToken,
+        emit_reply: bool = True,
+    ) -> Response:
+        """
+        Send messages to an agent, emitting its events (tool calls, streamed
+        tokens) as they happen, followed by its reply unless emit_reply is False.
+
+        Returns:
+            The agent's final Response
+
+        Raises:
+            RuntimeError: The agent's stream ended without a Response
+        """
+        response = None
+        async for item in agent.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+            else:
+                await emit(item)
+        if response is None:
+            raise RuntimeError(f"Agent '{agent.name}' finished without producing a response")
+        if emit_reply:
+            await emit(response.chat_message)
+        return response
+
+    @staticmethod
+    def _text(message: BaseChatMessage) -> str:
+        """Get the text of a chat message."""
+        content = getattr(message, "content", "")
+        return content if isinstance(content, str) else message.to_text()
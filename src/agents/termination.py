@@ -0,0 +1,183 @@
+"""
+Review Termination Policy
+
+Decides when the research conversation is done based on the Critic's
+verdicts instead of waiting for a "TERMINATE" that the Critic prompt never
+asked for:
+
+- Stop as soon as the Critic says "APPROVED - RESEARCH COMPLETE"
+- Allow at most max_revisions "NEEDS REVISION" cycles, then stop with the
+  latest draft
+- Optionally (agents.critic.skip_for_simple_queries, off by default), stop
+  right after the Writer's draft for lookup-style queries such as
+  "What is Fitts' law?" so the Critic turn is skipped entirely
+
+Teams are pooled, so whether the Critic is skipped is set per query with
+configure().
+"""
+
+import re
+from typing import Optional, Sequence, Union
+
+from autogen_agentchat.base import TerminatedException, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+
+REVISION_SIGNAL = "NEEDS REVISION"
+APPROVAL_SIGNAL = "APPROVED - RESEARCH COMPLETE"
+
+# The approval verdict as the whole last line of the Critic's message, allowing
+# a "Verdict:" label, markdown emphasis/quotes and dash variants
+_APPROVAL_LINE_PATTERN = re.compile(
+    r"^(?:(?:final\s+)?verdict\s*:\s*)?approved\s*[-\u2013\u2014:]\s*research\s+complete[.!]?$",
+    re.IGNORECASE,
+)
+
+# "NEEDS REVISION" as a verdict at the start of a line (not "nothing needs revision")
+_REVISION_LINE_PATTERN = re.compile(
+    r"^(?:(?:final\s+)?verdict\s*:\s*)?needs\s+revision\b",
+    re.IGNORECASE,
+)
+
+# Lookup-style questions: a definition, person, date or place
+_LOOKUP_QUERY_PATTERN = re.compile(
+    r"^(?:what\s+(?:is|are|does)|who\s+(?:is|was|invented|coined|proposed)|when\s+(?:was|did)|"
+    r"where\s+(?:is|was|did)|define)\b",
+    re.IGNORECASE,
+)
+
+# Queries asking for comparisons, analysis, recent work or overviews always
+# get a Critic review
+_COMPLEX_QUERY_PATTERN = re.compile(
+    r"\b(compare|comparison|versus|vs\.?|trade-?offs?|pros and cons|differences?|"
+    r"evaluate|analy[sz]e|implications|relationship between|impact of|how|why|should|best|"
+    r"latest|recent|current|trends?|state[- ]of[- ]the[- ]art|research|studies|literature|"
+    r"overview|survey|review|findings|evidence)\b",
+    re.IGNORECASE,
+)
+
+
+def parse_verdict(text: str) -> Optional[str]:
+    """
+    Extract the Critic's verdict from its message.
+
+    Approval only counts as the exact verdict token on the last non-empty
+    line, so feedback like "NOT APPROVED" or "can be APPROVED once the
+    citations are fixed" is not mistaken for approval. Otherwise a line
+    starting with "NEEDS REVISION" is a revision verdict; the phrase inside
+    a sentence ("Nothing needs revision.") is not.
+
+    Args:
+        text: Critic message
+
+    Returns:
+        "revision", "approved", or None if the message has no verdict
+    """
+    lines = [line.strip("*_`#>\"' ") for line in text.strip().splitlines() if line.strip()]
+    if not lines:
+        return None
+    if _APPROVAL_LINE_PATTERN.match(lines[-1]):
+        return "approved"
+    if any(_REVISION_LINE_PATTERN.match(line.lstrip("-*_`#>\"' ")) for line in lines):
+        return "revision"
+    return None
+
+
+def is_low_complexity_query(query: str, max_words: int = 8) -> bool:
+    """
+    Heuristically decide whether a query is simple enough to skip the Critic.
+
+    Only short lookup-style questions ("What is Fitts' law?", "Who coined
+    the term affordance?") qualify. Anything asking for comparisons,
+    analysis, recent work or an overview of research gets a review.
+
+    Args:
+        query: User query
+        max_words: Maximum number of words in a low-complexity query
+
+    Returns:
+        True if the Critic review can be skipped
+    """
+    if len(query.split()) > max_words:
+        return False
+    if query.count("?") > 1:
+        return False
+    if not _LOOKUP_QUERY_PATTERN.match(query.strip()):
+        return False
+    return not _COMPLEX_QUERY_PATTERN.search(query)
+
+
+class ReviewTermination(TerminationCondition):
+    """
+    Stops the team on Critic approval, after too many revisions, or after the
+    Writer's draft when the Critic is skipped for the current query.
+    """
+
+    def __init__(self, max_revisions: int = 1, critic_name: str = "Critic", writer_name: str = "Writer"):
+        """
+        Initialize review termination.
+
+        Args:
+            max_revisions: Number of "NEEDS REVISION" verdicts allowed before stopping
+            critic_name: Name of the Critic agent
+            writer_name: Name of the Writer agent
+        """
+        self.max_revisions = max(0, max_revisions)
+        self.critic_name = critic_name
+        self.writer_name = writer_name
+        self.skip_critic = False
+        # Outcome of the last run (kept across reset(), which the team calls
+        # as soon as the condition fires)
+        self.outcome: Optional[str] = None
+        self.revisions = 0
+
+        self._terminated = False
+
+    def configure(self, skip_critic: bool = False):
+        """
+        Set the review policy for the next query and clear the previous outcome.
+
+        Args:
+            skip_critic: Stop after the Writer's draft without a Critic review
+        """
+        self.skip_critic = skip_critic
+        self.outcome = None
+        self.revisions = 0
+        self._terminated = False
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    async def __call__(self, messages: Sequence[Union[BaseAgentEvent, BaseChatMessage]]) -> Optional[StopMessage]:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+
+        for message in messages:
+            if not isinstance(message, BaseChatMessage):
+                continue
+            # Speculative drafts are superseded by a later revision
+            if message.metadata.get("speculative") == "true":
+                continue
+
+            if message.source == self.writer_name and self.skip_critic:
+                return self._stop("critic_skipped", "Draft complete, Critic review skipped for a simple query")
+
+            if message.source != self.critic_name:
+                continue
+            verdict = parse_verdict(message.to_text())
+            if verdict == "revision":
+                self.revisions += 1
+                if self.revisions > self.max_revisions:
+                    return self._stop("revision_cap", f"Stopped after {self.max_revisions} revision cycle(s)")
+            elif verdict == "approved":
+                return self._stop("approved", "Critic approved the response")
+        return None
+
+    def _stop(self, outcome: str, reason: str) -> StopMessage:
+        """Record the outcome and build the stop message."""
+        self.outcome = outcome
+        self._terminated = True
+        return StopMessage(content=reason, source="ReviewTermination")
+
+    async def reset(self) -> None:
+        self._terminated = False
@@ -13,38 +13,37 @@ Workflow:
 
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+import math
+import queue
+import weakref
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Iterator, Tuple
+from autogen_agentchat.base import TaskResult
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.messages import TextMessage
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    TextMessage,
+    ModelClientStreamingChunkEvent,
+    ToolCallExecutionEvent,
+    ToolCallRequestEvent,
+)
 
-from src.agents.autogen_agents import create_research_team
+from src.agents.autogen_agents import close_research_team, create_research_team
+from src.agents.termination import ReviewTermination, is_low_complexity_query
+from src.budget import BudgetTermination, summarize_usage
 from src.guardrails.safety_manager import SafetyManager
+from src.query_cache import QueryResultCache
+from src.runtime import TeamPool, get_background_loop
+from src.tools.http_pool import close_http_session, configure_http_pool
+from src.tools.local_index import configure_local_index
+from src.tools.rate_limiter import configure_rate_limiters
+from src.tools.search_cache import configure_search_cache
+from src.tools.source_registry import configure_tool_output, start_source_registry
+from src.tools.web_search import configure_web_search
+from src.tracing import configure_tracer, summarize_stages
 
-
-def _run_async_in_thread(coro):
-    """
-    Helper to run async code in a new event loop in a thread.
-    
-    This creates a completely isolated event loop to avoid binding conflicts
-    with AutoGen's internal async queues and tasks.
-    """
-    # Create a new event loop for this thread
-    new_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(new_loop)
-    try:
-        return new_loop.run_until_complete(coro)
-    finally:
-        # Clean up: cancel all pending tasks
-        try:
-            pending = asyncio.all_tasks(new_loop)
-            for task in pending:
-                task.cancel()
-            if pending:
-                new_loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-        except Exception:
-            pass
-        finally:
-            new_loop.close()
+# Termination outcomes whose answers are complete enough to cache
+CACHEABLE_OUTCOMES = ("approved", "completed")
 
 
 class AutoGenOrchestrator:
@@ -67,37 +66,115 @@ class AutoGenOrchestrator:
         self.logger = logging.getLogger("autogen_orchestrator")
         
         # Initialize safety manager
-        safety_config = config.get("safety", {})
+        # The checks also need the model and topic (used for the LLM calls and
+        # the verdict cache's policy fingerprint), which live outside "safety"
+        safety_config = {
+            "models": config.get("models", {}),
+            "system": config.get("system", {}),
+            **config.get("safety", {}),
+        }
         self.safety_manager = SafetyManager(safety_config) if safety_config.get("enabled", True) else None
         if self.safety_manager:
             self.logger.info("Safety manager initialized")
         
-        # Don't create team in __init__ - create it lazily in async context
-        # This prevents event loop binding issues when running in threads
-        self._team = None
+        # Cache of whole research results, keyed by query and config fingerprint
+        cache_config = config.get("cache", {}).get("query_results", {})
+        self.query_cache = QueryResultCache(config) if cache_config.get("enabled", False) else None
+        
+        # Concurrency limits and per-query timeouts
+        system_config = config.get("system", {})
+        self.timeout_seconds = system_config.get("timeout_seconds", 300)
+        self.max_concurrent_queries = max(1, system_config.get("max_concurrent_queries", 4))
+        self.max_pending_queries = system_config.get("max_pending_queries", 32)
+        self.queue_timeout_seconds = system_config.get("queue_timeout_seconds", self.timeout_seconds)
+        self._admission: Optional[asyncio.Semaphore] = None
+        self._pending_queries = 0
+        
+        # Per-query token budget (the round budget comes from max_rounds)
+        budget_config = config.get("budget", {})
+        self.max_tokens_per_query = budget_config.get("max_tokens_per_query")
+        self.pricing = budget_config.get("pricing")
+        
+        # Review loop policy: stop on Critic approval, cap revisions, skip the
+        # Critic for simple queries
+        critic_config = config.get("agents", {}).get("critic", {})
+        self.max_revisions = critic_config.get("max_revisions", 1)
+        self.skip_critic_for_simple_queries = critic_config.get("skip_for_simple_queries", False)
+        self.simple_query_max_words = critic_config.get("simple_query_max_words", 8)
+        self.termination_stats = {
+            "queries": 0,
+            "approved": 0,
+            "revision_cap": 0,
+            "critic_skipped": 0,
+            "budget_exhausted": 0,
+            "rounds_saved": 0,
+        }
+        
+        # Per-team termination conditions, reconfigured before every query
+        self._team_controls: "weakref.WeakKeyDictionary[Any, Tuple[BudgetTermination, ReviewTermination]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        
+        # Search tools share pooled HTTP clients sized by tools.http, per-provider
+        # rate limits (tools.rate_limits), a disk cache of search results
+        # (cache.search_results) and a local full-text index (tools.local_index)
+        configure_http_pool(config)
+        configure_rate_limiters(config)
+        configure_web_search(config)
+        self.local_index = configure_local_index(config)
+        configure_tool_output(config)
+        self.search_cache = configure_search_cache(config)
         
-        # Workflow trace for debugging and UI display
+        # All queries run on one long-lived loop thread. Teams are bound to the
+        # loop they first run on, so they are pooled there and reset between queries
+        # instead of being rebuilt on a fresh event loop every time.
+        self._runtime = get_background_loop()
+        self._runtime.add_shutdown_hook(close_http_session)
+        self._team_pool = TeamPool(
+            self._build_team,
+            max_size=system_config.get("team_pool_size", 2),
+            close=close_research_team,
+        )
+        prewarm = system_config.get("team_pool_prewarm", 1)
+        if prewarm:
+            self._runtime.submit(self._prewarm_team_pool(prewarm))
+        
+        # Span-level timing of every query, exported to tracing.export_path
+        self.tracer = configure_tracer(config)
+        
+        # Workflow trace for debugging and UI display (most recent queries)
         self.workflow_trace: List[Dict[str, Any]] = []
+        self.max_workflow_trace = config.get("tracing", {}).get("keep_recent_traces", 20)
     
+    def _build_team(self):
+        """Build a research team with its own budget and review termination."""
+        budget = BudgetTermination()
+        review = ReviewTermination(max_revisions=self.max_revisions)
+        team = create_research_team(self.config, budget=budget, review=review)
+        self._team_controls[team] = (budget, review)
+        return team
+
+    async def _prewarm_team_pool(self, count: int):
+        """Build teams on the runtime loop ahead of the first queries."""
+        try:
+            await self._team_pool.prewarm(count)
+        except Exception as e:
+            # Missing API keys etc. surface again (with context) on the first query
+            self.logger.warning(f"Could not prewarm research teams: {e}")
+
     async def _get_team_async(self):
         """
-        Get or create the research team in the current async context.
-        Creates the team lazily to avoid event loop binding issues.
-        
-        This ensures the team is always created in the same event loop
-        where it will be used, preventing "bound to different event loop" errors.
-        
+        Get a research team from the pool bound to the runtime loop.
+
+        Teams are built lazily on the runtime loop, so they are always used on
+        the same event loop where they were created, preventing
+        "bound to different event loop" errors.
+
         Returns:
             RoundRobinGroupChat team instance
         """
-        # Always recreate team in async context to ensure correct event loop binding
-        # This is necessary because AutoGen's internal queues are bound to the event loop
-        # where the team is created
-        self.logger.info("Creating research team in current event loop context...")
         try:
-            team = create_research_team(self.config)
-            self.logger.info("Research team created successfully")
-            return team
+            return await self._team_pool.acquire()
         except ValueError as e:
             error_msg = f"Failed to create research team: {e}"
             self.logger.error(error_msg)
@@ -107,10 +184,79 @@ class AutoGenOrchestrator:
             self.logger.error(error_msg, exc_info=True)
             raise RuntimeError(error_msg) from e
 
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """
+        Get team pool statistics (hits, misses, build and reset cost).
+
+        Returns:
+            Dictionary with pool metrics
+        """
+        return self._team_pool.get_metrics()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get query result cache statistics.
+
+        Returns:
+            Dictionary with cache metrics (empty if the cache is disabled)
+        """
+        return self.query_cache.get_stats() if self.query_cache else {}
+
+    def get_search_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get search result cache statistics.
+
+        Returns:
+            Dictionary with per-provider cache metrics (empty if the cache is disabled)
+        """
+        return self.search_cache.get_stats() if self.search_cache else {}
+
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """
+        Get p50/p95 timings per pipeline stage over recent queries.
+
+        Returns:
+            Dictionary mapping stage (planning, research, tool, llm, guardrail, ...)
+            to count, p50_ms and p95_ms
+        """
+        return self.tracer.get_stage_stats()
+
+    def get_termination_stats(self) -> Dict[str, Any]:
+        """
+        Get counts of how queries ended and how many rounds early stopping saved.
+
+        Returns:
+            Dictionary with per-outcome counts and total rounds saved
+        """
+        stats = dict(self.termination_stats)
+        queries = stats["queries"]
+        stats["avg_rounds_saved"] = stats["rounds_saved"] / queries if queries > 0 else 0
+        return stats
+
+    def close(self):
+        """
+        Close pooled teams and the runtime loop's HTTP session.
+
+        The shared runtime loop keeps running for other users; they get a new
+        HTTP session on their next search.
+        """
+        try:
+            self._runtime.run(self._shutdown(), timeout=10)
+        except Exception as e:
+            self.logger.warning(f"Error while closing orchestrator: {e}")
+
+    async def _shutdown(self):
+        """Release the orchestrator's loop-bound resources on the runtime loop."""
+        await self._team_pool.clear()
+        await close_http_session()
+
     def process_query(self, query: str, max_rounds: int = 10) -> Dict[str, Any]:
         """
         Process a research query through the multi-agent system.
 
+        Synchronous wrapper around process_query_async() for callers without
+        an event loop. Blocks until the query finishes on the runtime loop.
+
         Args:
             query: The research question to answer
             max_rounds: Maximum number of conversation rounds
@@ -123,11 +269,255 @@ class AutoGenOrchestrator:
             - metadata: Additional information about the process
             - safety_events: Safety events if any
         """
+        try:
+            return self._runtime.run(
+                self._handle_query(query, max_rounds),
+                timeout=self.queue_timeout_seconds + self.timeout_seconds + 60
+            )
+        except Exception as e:
+            # Only reached if the runtime itself fails (e.g. bridge timeout);
+            # pipeline errors are already turned into error results
+            return self._error_result(query, e, "orchestrator_error")
+
+    async def process_query_async(self, query: str, max_rounds: int = 10) -> Dict[str, Any]:
+        """
+        Process a research query without blocking the caller's event loop.
+
+        Can be awaited from any event loop; the work runs on the shared runtime
+        loop. At most system.max_concurrent_queries run at once, further queries
+        wait for a slot (up to system.queue_timeout_seconds) and are rejected
+        once system.max_pending_queries are already waiting.
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+
+        Returns:
+            Same result dictionary as process_query()
+        """
+        return await self._runtime.run_async(self._handle_query(query, max_rounds))
+
+    async def process_many(
+        self,
+        queries: List[str],
+        max_rounds: int = 10,
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several queries concurrently.
+
+        Args:
+            queries: Research questions to answer
+            max_rounds: Maximum number of conversation rounds per query
+            concurrency: Maximum queries in flight from this batch
+                (defaults to system.max_concurrent_queries)
+
+        Returns:
+            List of result dictionaries, in the same order as queries
+        """
+        # Never submit more than the orchestrator admits, so a large batch waits
+        # here instead of tripping the pending-query limit
+        limit = min(concurrency or self.max_concurrent_queries, self.max_concurrent_queries)
+        batch_slots = asyncio.Semaphore(max(1, limit))
+
+        async def _run_one(query: str) -> Dict[str, Any]:
+            async with batch_slots:
+                return await self.process_query_async(query, max_rounds)
+
+        return await asyncio.gather(*[_run_one(q) for q in queries])
+
+    async def stream_query(self, query: str, max_rounds: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a query, yielding progress events as they happen.
+
+        Can be consumed from any event loop. Event dictionaries have a "type":
+        - "status": pipeline stage changes ("stage", "message")
+        - "message": a complete agent message ("source", "content")
+        - "tool_call" / "tool_result": tool activity ("source", "tools" / "content")
+        - "token": a streamed model chunk ("source", "content"), only when
+          models.default.stream is enabled
+        - "result": the final result dictionary ("result"), always last
+
+        Streamed tokens are drafts; the "result" event carries the response after
+        output safety checks and is what should be shown as the final answer.
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+
+        Yields:
+            Event dictionaries
+        """
+        caller_loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def _emit(event: Dict[str, Any]):
+            try:
+                caller_loop.call_soon_threadsafe(events.put_nowait, event)
+            except RuntimeError:
+                # Consumer's loop already closed, nobody is listening anymore
+                pass
+
+        future = self._runtime.submit(self._stream_to(query, max_rounds, _emit))
+        try:
+            while True:
+                event = await events.get()
+                yield event
+                if event["type"] == "result":
+                    break
+        finally:
+            # Stop the pipeline if the consumer walks away early
+            future.cancel()
+
+    def iter_query(self, query: str, max_rounds: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Synchronous version of stream_query() for callers without an event loop
+        (e.g. Streamlit).
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+
+        Yields:
+            Event dictionaries (see stream_query())
+        """
+        events: queue.Queue = queue.Queue()
+        future = self._runtime.submit(self._stream_to(query, max_rounds, events.put))
+        wait_seconds = self.queue_timeout_seconds + self.timeout_seconds + 60
+        try:
+            while True:
+                try:
+                    event = events.get(timeout=wait_seconds)
+                except queue.Empty:
+                    yield {
+                        "type": "result",
+                        "result": self._error_result(
+                            query, TimeoutError(f"No progress for {wait_seconds} seconds"), "orchestrator_error"
+                        ),
+                    }
+                    return
+                yield event
+                if event["type"] == "result":
+                    return
+        finally:
+            future.cancel()
+
+    async def _stream_to(self, query: str, max_rounds: int, emit: Callable[[Dict[str, Any]], None]):
+        """Run the pipeline on the runtime loop, emitting events and finally the result."""
+        try:
+            result = await self._handle_query(query, max_rounds, emit)
+        except Exception as e:
+            result = self._error_result(query, e, "orchestrator_error")
+        emit({"type": "result", "result": result})
+
+    async def _handle_query(
+        self,
+        query: str,
+        max_rounds: int,
+        emit: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Full query pipeline (admission, safety checks, team run) on the runtime loop.
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+            emit: Optional callback receiving progress events (streaming mode)
+
+        Returns:
+            Result dictionary (errors are returned as results, not raised)
+        """
+        with self.tracer.trace("research_query", query=query[:200]) as root:
+            result = await self._admit_and_run(query, max_rounds, emit)
+            trace = self.tracer.current_trace()
+            if trace is not None:
+                metadata = result.setdefault("metadata", {})
+                metadata["trace_id"] = trace.trace_id
+                metadata["stage_timings"] = summarize_stages(trace.spans)
+                root.set_attribute("error", bool(metadata.get("error")))
+        
+        if trace is not None:
+            self._record_workflow_trace(query, root, trace.spans)
+        return result
+
+    def _record_workflow_trace(self, query: str, root: Any, spans: List[Any]):
+        """Keep a summary of the query's trace for debugging and UI display."""
+        self.workflow_trace.append({
+            "query": query,
+            "trace_id": root.trace.trace_id,
+            "duration_ms": round(root.duration_ms, 2),
+            "stages": summarize_stages(spans),
+            "spans": [span.to_dict() for span in spans],
+        })
+        if len(self.workflow_trace) > self.max_workflow_trace:
+            del self.workflow_trace[:-self.max_workflow_trace]
+
+    async def _admit_and_run(
+        self,
+        query: str,
+        max_rounds: int,
+        emit: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Wait for an admission slot, then run the pipeline."""
+        # Created lazily so they bind to the runtime loop
+        if self._admission is None:
+            self._admission = asyncio.Semaphore(self.max_concurrent_queries)
+
+        if self._admission.locked():
+            # Backpressure: refuse new work instead of queueing without bound
+            if self._pending_queries >= self.max_pending_queries:
+                self.logger.warning(
+                    f"Rejecting query, {self._pending_queries} queries already waiting"
+                )
+                return self._overloaded_result(query)
+
+            self._pending_queries += 1
+            try:
+                with self.tracer.span("admission", "queue"):
+                    await asyncio.wait_for(self._admission.acquire(), timeout=self.queue_timeout_seconds)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Query not admitted within {self.queue_timeout_seconds} seconds")
+                return self._overloaded_result(query)
+            finally:
+                self._pending_queries -= 1
+        else:
+            # A slot is free, take it without queueing
+            await self._admission.acquire()
+
+        try:
+            return await self._run_pipeline(query, max_rounds, emit)
+        finally:
+            self._admission.release()
+
+    async def _run_pipeline(
+        self,
+        query: str,
+        max_rounds: int,
+        emit: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run input safety, the research team and output safety for one query.
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+            emit: Optional callback receiving progress events (streaming mode)
+
+        Returns:
+            Result dictionary
+        """
         self.logger.info(f"Processing query: {query}")
         
-        # Check input safety
+        # Check input safety (the LLM checks run concurrently on worker threads).
+        # Only this query's events are reported, the manager's event log is
+        # shared by concurrent queries.
+        query_safety_events: List[Dict[str, Any]] = []
         if self.safety_manager:
-            input_safety = self.safety_manager.check_input_safety(query)
+            if emit:
+                emit({"type": "status", "stage": "input_safety", "message": "Checking query safety..."})
+            with self.tracer.span("guardrail.input", "guardrail"):
+                input_safety = await self.safety_manager.check_input_safety_async(query)
+            query_safety_events.extend(input_safety.get("safety_events", []))
             if not input_safety.get("safe", True):
                 violations = input_safety.get("violations", [])
                 self.logger.warning(f"Input safety check failed: {violations}")
@@ -146,39 +536,44 @@ class AutoGenOrchestrator:
                         "num_messages": 0,
                         "num_sources": 0
                     },
-                    "safety_events": [{
+                    "safety_events": query_safety_events or [{
                         "type": "input",
                         "safe": False,
                         "violations": violations
                     }]
                 }
         
-        try:
-            # Run the async query processing
-            # Always use asyncio.run() to create a fresh event loop
-            # This ensures the team is created in the same event loop where it runs
+        # Answer repeated questions from the cache (after input safety, so
+        # unsafe queries are still refused even if they were cached earlier)
+        if self.query_cache:
             try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If we're already in an async context (e.g., Streamlit), 
-                    # we need to run in a separate thread with a new event loop
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as pool:
-                        future = pool.submit(_run_async_in_thread, self._process_query_async(query, max_rounds))
-                        result = future.result(timeout=self.config.get("system", {}).get("timeout_seconds", 300) + 60)
-                else:
-                    # No running loop, but one exists - use asyncio.run() to create fresh
-                    result = asyncio.run(self._process_query_async(query, max_rounds))
-            except RuntimeError:
-                # No event loop exists, create a new one with asyncio.run()
-                result = asyncio.run(self._process_query_async(query, max_rounds))
+                with self.tracer.span("cache.lookup", "cache"):
+                    cached = await asyncio.to_thread(self.query_cache.get, query, max_rounds)
+            except Exception as e:
+                self.logger.warning(f"Query cache lookup failed: {e}")
+                cached = None
+            if cached:
+                self.logger.info("Returning cached result")
+                if query_safety_events:
+                    cached["safety_events"] = query_safety_events
+                    cached["metadata"]["safety_events"] = query_safety_events
+                if emit:
+                    emit({"type": "status", "stage": "cache", "message": "Found a cached answer"})
+                return cached
+        
+        try:
+            result = await self._process_query_async(query, max_rounds, emit)
             
             # Check output safety
             if self.safety_manager and "response" in result:
-                output_safety = self.safety_manager.check_output_safety(
-                    result.get("response", ""),
-                    result.get("metadata", {}).get("sources", [])
-                )
+                if emit:
+                    emit({"type": "status", "stage": "output_safety", "message": "Checking response safety..."})
+                with self.tracer.span("guardrail.output", "guardrail"):
+                    output_safety = await asyncio.to_thread(
+                        self.safety_manager.check_output_safety,
+                        result.get("response", ""),
+                        result.get("metadata", {}).get("sources", [])
+                    )
                 
                 if not output_safety.get("safe", True):
                     violations = output_safety.get("violations", [])
@@ -189,45 +584,86 @@ class AutoGenOrchestrator:
                     result["metadata"]["safety_blocked"] = True
                     result["metadata"]["safety_violations"] = violations
                 
-                # Add safety events to metadata
-                safety_events = self.safety_manager.get_safety_events()
+                # Add this query's safety events to metadata
+                safety_events = query_safety_events + output_safety.get("safety_events", [])
                 if safety_events:
-                    result["safety_events"] = safety_events[-5:]  # Last 5 events
-                    result["metadata"]["safety_events"] = safety_events[-5:]
+                    result["safety_events"] = safety_events
+                    result["metadata"]["safety_events"] = safety_events
+            
+            if self.query_cache and self._is_cacheable(result):
+                result["metadata"]["cache_hit"] = False
+                try:
+                    await asyncio.to_thread(self.query_cache.put, query, result, max_rounds)
+                except Exception as e:
+                    self.logger.warning(f"Could not cache result: {e}")
             
             self.logger.info("Query processing complete")
             return result
             
         except ValueError as e:
             # API connection or configuration errors
-            error_msg = str(e)
-            self.logger.error(f"Configuration/API error: {error_msg}", exc_info=True)
-            return {
-                "query": query,
-                "error": error_msg,
-                "response": f"API connection error: {error_msg}. Please check your API keys and configuration.",
-                "conversation_history": [],
-                "metadata": {"error": True, "error_type": "api_connection"}
-            }
+            self.logger.error(f"Configuration/API error: {e}", exc_info=True)
+            return self._error_result(query, e, "api_connection")
         except Exception as e:
             # Other errors
-            error_msg = str(e)
-            self.logger.error(f"Error processing query: {error_msg}", exc_info=True)
-            return {
-                "query": query,
-                "error": error_msg,
-                "response": f"An error occurred while processing your query: {error_msg}",
-                "conversation_history": [],
-                "metadata": {"error": True, "error_type": "orchestrator_error"}
-            }
+            self.logger.error(f"Error processing query: {e}", exc_info=True)
+            return self._error_result(query, e, "orchestrator_error")
+
+    @staticmethod
+    def _is_cacheable(result: Dict[str, Any]) -> bool:
+        """
+        Check whether a result is a complete answer worth caching.
+
+        Errors, safety-blocked answers, runs cut short by the budget and
+        drafts the Critic did not approve (revision cap, skipped review) are
+        not cached.
+        """
+        metadata = result.get("metadata", {})
+        if metadata.get("error") or metadata.get("safety_blocked") or metadata.get("budget_exhausted"):
+            return False
+        outcome = metadata.get("termination", {}).get("outcome")
+        return outcome in CACHEABLE_OUTCOMES
+
+    def _error_result(self, query: str, error: Exception, error_type: str) -> Dict[str, Any]:
+        """Build the result dictionary returned when processing fails."""
+        error_msg = str(error)
+        if error_type == "api_connection":
+            response = f"API connection error: {error_msg}. Please check your API keys and configuration."
+        else:
+            response = f"An error occurred while processing your query: {error_msg}"
+        return {
+            "query": query,
+            "error": error_msg,
+            "response": response,
+            "conversation_history": [],
+            "metadata": {"error": True, "error_type": error_type}
+        }
+
+    def _overloaded_result(self, query: str) -> Dict[str, Any]:
+        """Build the result dictionary returned when a query is not admitted."""
+        error_msg = "System is busy processing other queries, please try again shortly"
+        return {
+            "query": query,
+            "error": error_msg,
+            "response": f"An error occurred while processing your query: {error_msg}",
+            "conversation_history": [],
+            "metadata": {"error": True, "error_type": "overloaded"}
+        }
     
-    async def _process_query_async(self, query: str, max_rounds: int = 10) -> Dict[str, Any]:
+    async def _process_query_async(
+        self,
+        query: str,
+        max_rounds: int = 10,
+        emit: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Async implementation of query processing.
         
         Args:
             query: The research question to answer
-            max_rounds: Maximum number of conversation rounds (default 10 for faster processing)
+            max_rounds: Maximum number of conversation rounds, one round being a
+                turn from every agent (default 10 for faster processing)
+            emit: Optional callback receiving agent messages as they arrive
             
         Returns:
             Dictionary containing results
@@ -241,24 +677,48 @@ Please work together to answer this query comprehensively:
 3. Writer: Synthesize findings into a well-cited response
 4. Critic: Evaluate the quality and provide feedback"""
         
-        # Get or create team in this async context (lazy creation)
-        # This ensures the team is bound to the current event loop
-        # We create it fresh each time to avoid event loop binding issues
+        # Take a pre-built team from the pool (bound to the runtime loop)
+        pool_hits_before = self._team_pool.hits
         team = await self._get_team_async()
+        team_pool_hit = self._team_pool.hits > pool_hits_before
+        
+        # Limit this query's tokens and rounds; the team stops early once either is spent
+        budget, review = self._team_controls.get(team, (None, None))
+        if budget is not None:
+            budget.configure(max_tokens=self.max_tokens_per_query, max_rounds=max_rounds)
+        skip_critic = self.skip_critic_for_simple_queries and is_low_complexity_query(
+            query, self.simple_query_max_words
+        )
+        if review is not None:
+            review.configure(skip_critic=skip_critic)
+        
+        # Sources found by this query's tool calls get short IDs agents can cite
+        sources = start_source_registry()
         
         # Run the team with timeout
         try:
             # Add timeout to prevent infinite execution
-            timeout_seconds = self.config.get("system", {}).get("timeout_seconds", 300)
-            result = await asyncio.wait_for(
-                team.run(task=task_message),
-                timeout=timeout_seconds
-            )
+            timeout_seconds = self.timeout_seconds
+            if emit:
+                emit({"type": "status", "stage": "research", "message": "Agents are working on your query..."})
+            with self.tracer.span("team.run", "team", team_pool_hit=team_pool_hit):
+                result = await asyncio.wait_for(
+                    self._run_team(team, task_message, emit),
+                    timeout=timeout_seconds
+                )
+        except asyncio.CancelledError:
+            # Caller gave up (e.g. stopped consuming a stream); the team was
+            # interrupted mid-run and can't be safely reused
+            await self._team_pool.discard(team)
+            raise
         except asyncio.TimeoutError:
+            # A team interrupted mid-run can't be safely reset, so don't reuse it
+            await self._team_pool.discard(team)
             error_msg = f"Query processing timed out after {timeout_seconds} seconds"
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
         except Exception as e:
+            await self._team_pool.discard(team)
             error_msg = f"Error during team execution: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
             # Re-raise with more context
@@ -266,6 +726,20 @@ Please work together to answer this query comprehensively:
                 raise ValueError(f"API connection error: {e}") from e
             raise RuntimeError(error_msg) from e
         
+        # Draft counts from speculative drafting (parallel mode), read before
+        # the team can be handed to another query
+        drafting_stats = getattr(team, "drafting_stats", None)
+        
+        # Reset the team and hand it back for the next query
+        await self._team_pool.release(team)
+        
+        usage = summarize_usage(result.messages, self.pricing)
+        budget_exhausted = budget.exhausted if budget is not None else None
+        if budget_exhausted:
+            self.logger.warning(f"Query stopped early: {result.stop_reason}")
+        stop_reason = result.stop_reason
+        termination = self._summarize_termination(result, max_rounds, budget, review)
+        
         # Extract conversation history
         messages = []
         # result.messages might be a list or an async iterator
@@ -300,17 +774,130 @@ Please work together to answer this query comprehensively:
         # Extract final response
         final_response = ""
         if messages:
-            # Get the last message from Writer or Critic
-            for msg in reversed(messages):
-                if msg.get("source") in ["Writer", "Critic"]:
-                    final_response = msg.get("content", "")
+            # The Writer's latest draft is the answer (the Critic only reviews
+            # it); fall back to the Critic if the Writer never spoke
+            for source in ["Writer", "Critic"]:
+                for msg in reversed(messages):
+                    if msg.get("source") == source:
+                        final_response = msg.get("content", "")
+                        break
+                if final_response:
                     break
         
         # If no response found, use the last message
         if not final_response and messages:
             final_response = messages[-1].get("content", "")
         
-        return self._extract_results(query, messages, final_response)
+        result = self._extract_results(query, messages, final_response)
+        if len(sources):
+            # Turn cited source IDs into a reference list with titles and URLs
+            result["response"], cited = sources.resolve_citations(result["response"])
+            result["metadata"]["sources"] = sources.to_list()
+            result["metadata"]["cited_sources"] = [source["id"] for source in cited]
+            result["metadata"]["num_sources"] = len(sources)
+        result["metadata"]["team_pool_hit"] = team_pool_hit
+        result["metadata"]["usage"] = usage
+        result["metadata"]["stop_reason"] = stop_reason
+        result["metadata"]["budget_exhausted"] = budget_exhausted
+        result["metadata"]["termination"] = termination
+        if drafting_stats:
+            result["metadata"]["speculative_drafting"] = dict(drafting_stats)
+        return result
+
+    def _summarize_termination(
+        self,
+        result: TaskResult,
+        max_rounds: int,
+        budget: Optional[BudgetTermination],
+        review: Optional[ReviewTermination]
+    ) -> Dict[str, Any]:
+        """
+        Describe why the conversation ended and update the termination counters.
+
+        Returns:
+            Dictionary with outcome, revisions, rounds used and rounds saved
+        """
+        agents_per_round = budget.agents_per_round if budget is not None else 4
+        agent_turns = sum(
+            1 for message in result.messages
+            if isinstance(message, BaseChatMessage) and message.source != "user"
+        )
+        rounds_used = math.ceil(agent_turns / agents_per_round)
+        rounds_saved = max(0, max_rounds - rounds_used)
+
+        if review is not None and review.outcome:
+            outcome = review.outcome
+        elif budget is not None and budget.exhausted:
+            outcome = "budget_exhausted"
+        else:
+            outcome = "completed"
+
+        self.termination_stats["queries"] += 1
+        self.termination_stats["rounds_saved"] += rounds_saved
+        if outcome in self.termination_stats:
+            self.termination_stats[outcome] += 1
+
+        return {
+            "outcome": outcome,
+            "revisions": review.revisions if review is not None else 0,
+            "critic_skipped": outcome == "critic_skipped",
+            "rounds_used": rounds_used,
+            "rounds_saved": rounds_saved,
+        }
+
+    async def _run_team(
+        self,
+        team: Any,
+        task_message: str,
+        emit: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> TaskResult:
+        """
+        Run the team to completion, streaming its messages to emit() if given.
+
+        Returns:
+            The team's TaskResult
+        """
+        if emit is None:
+            return await team.run(task=task_message)
+
+        result = None
+        async for item in team.run_stream(task=task_message):
+            if isinstance(item, TaskResult):
+                result = item
+            else:
+                event = self._to_stream_event(item)
+                if event:
+                    emit(event)
+        return result
+
+    @staticmethod
+    def _to_stream_event(message: Any) -> Optional[Dict[str, Any]]:
+        """
+        Convert an AutoGen message or event into a stream event dictionary.
+
+        Returns:
+            Event dictionary, or None for messages not worth showing
+        """
+        source = getattr(message, "source", "")
+        if isinstance(message, ModelClientStreamingChunkEvent):
+            return {"type": "token", "source": source, "content": message.content}
+        if isinstance(message, ToolCallRequestEvent):
+            return {
+                "type": "tool_call",
+                "source": source,
+                "tools": [{"name": call.name, "arguments": call.arguments} for call in message.content],
+            }
+        if isinstance(message, ToolCallExecutionEvent):
+            return {
+                "type": "tool_result",
+                "source": source,
+                "content": [result.content for result in message.content],
+            }
+        if isinstance(message, BaseAgentEvent):
+            # Other agent events (thoughts, memory queries, ...) are internal
+            return None
+        content = message.content if hasattr(message, "content") else str(message)
+        return {"type": "message", "source": source, "content": content}
 
     def _extract_results(self, query: str, messages: List[Dict[str, Any]], final_response: str = "") -> Dict[str, Any]:
         """
@@ -0,0 +1,152 @@
+"""
+Query Budget
+Token, round and cost limits for research queries.
+
+AutoGen attaches the model client's usage data (prompt/completion tokens) to
+every message produced by an LLM call. BudgetTermination watches those
+messages while a team runs and stops the conversation once the per-query
+token or round budget is spent, so a runaway conversation ends early instead
+of running until the wall-clock timeout. summarize_usage() turns the finished
+conversation into a per-agent usage and cost report.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Union
+
+from autogen_agentchat.base import TerminatedException, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+
+
+class BudgetTermination(TerminationCondition):
+    """
+    Stops a team once the current query's token or round budget is spent.
+
+    Teams are pooled and reused across queries, so the limits are not fixed
+    at construction time: the orchestrator calls configure() before each run.
+    A round is one turn from every agent in the team.
+    """
+
+    def __init__(self, agents_per_round: int = 4):
+        """
+        Initialize budget termination (no limits until configure() is called).
+
+        Args:
+            agents_per_round: Number of agent turns that make up one round
+        """
+        self.agents_per_round = max(1, agents_per_round)
+        self.max_tokens: Optional[int] = None
+        self.max_rounds: Optional[int] = None
+        # Why the last run was stopped (kept across reset(), which the team
+        # calls as soon as the condition fires)
+        self.exhausted: Optional[str] = None
+
+        self._terminated = False
+        self._token_count = 0
+        self._agent_turns = 0
+
+    def configure(self, max_tokens: Optional[int] = None, max_rounds: Optional[int] = None):
+        """
+        Set the budget for the next query and clear the previous outcome.
+
+        Args:
+            max_tokens: Maximum prompt + completion tokens (None for no limit)
+            max_rounds: Maximum conversation rounds (None for no limit)
+        """
+        self.max_tokens = max_tokens
+        self.max_rounds = max_rounds
+        self.exhausted = None
+        self._terminated = False
+        self._token_count = 0
+        self._agent_turns = 0
+
+    @property
+    def max_agent_turns(self) -> Optional[int]:
+        """Round budget expressed as agent turns."""
+        if self.max_rounds is None:
+            return None
+        return self.max_rounds * self.agents_per_round
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    async def __call__(self, messages: Sequence[Union[BaseAgentEvent, BaseChatMessage]]) -> Optional[StopMessage]:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+
+        for message in messages:
+            if message.models_usage is not None:
+                self._token_count += message.models_usage.prompt_tokens + message.models_usage.completion_tokens
+            # Count agent replies, not the task message or inner events
+            if isinstance(message, BaseChatMessage) and message.source != "user":
+                self._agent_turns += 1
+
+        if self.max_tokens is not None and self._token_count >= self.max_tokens:
+            self.exhausted = "tokens"
+            self._terminated = True
+            return StopMessage(
+                content=f"Token budget exhausted: {self._token_count} of {self.max_tokens} tokens used",
+                source="BudgetTermination",
+            )
+        if self.max_agent_turns is not None and self._agent_turns >= self.max_agent_turns:
+            self.exhausted = "rounds"
+            self._terminated = True
+            return StopMessage(
+                content=f"Round budget exhausted: {self.max_rounds} round(s) completed",
+                source="BudgetTermination",
+            )
+        return None
+
+    async def reset(self) -> None:
+        self._terminated = False
+        self._token_count = 0
+        self._agent_turns = 0
+
+
+def summarize_usage(
+    messages: Sequence[Any],
+    pricing: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Total up token usage per agent from a finished conversation.
+
+    Args:
+        messages: Messages and events from the team's TaskResult
+        pricing: Optional USD prices per million tokens
+            ({"prompt": ..., "completion": ...})
+
+    Returns:
+        Dictionary with prompt/completion/total tokens, number of LLM calls,
+        a per-agent breakdown and the estimated cost
+    """
+    by_agent: Dict[str, Dict[str, int]] = {}
+    for message in messages:
+        usage = getattr(message, "models_usage", None)
+        if usage is None:
+            continue
+        agent = by_agent.setdefault(
+            message.source, {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "llm_calls": 0}
+        )
+        agent["prompt_tokens"] += usage.prompt_tokens
+        agent["completion_tokens"] += usage.completion_tokens
+        agent["total_tokens"] += usage.prompt_tokens + usage.completion_tokens
+        agent["llm_calls"] += 1
+
+    prompt_tokens = sum(agent["prompt_tokens"] for agent in by_agent.values())
+    completion_tokens = sum(agent["completion_tokens"] for agent in by_agent.values())
+
+    cost = None
+    if pricing:
+        cost = round(
+            (prompt_tokens * pricing.get("prompt", 0.0) + completion_tokens * pricing.get("completion", 0.0))
+            / 1_000_000,
+            6,
+        )
+
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "llm_calls": sum(agent["llm_calls"] for agent in by_agent.values()),
+        "by_agent": by_agent,
+        "estimated_cost_usd": cost,
+    }
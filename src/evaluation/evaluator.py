@@ -54,6 +54,7 @@ class SystemEvaluator:
         eval_config = config.get("evaluation", {})
         self.enabled = eval_config.get("enabled", True)
         self.max_test_queries = eval_config.get("num_test_queries", None)
+        self.max_concurrent_queries = max(1, eval_config.get("max_concurrent_queries", 1))
         
         # Initialize judge (passes config to load judge model settings and criteria)
         self.judge = LLMJudge(config)
@@ -93,19 +94,25 @@ class SystemEvaluator:
         test_queries = self._load_test_queries(test_queries_path)
         self.logger.info(f"Loaded {len(test_queries)} test queries")
 
-        # Evaluate each query
-        for i, test_case in enumerate(test_queries, 1):
-            self.logger.info(f"Evaluating query {i}/{len(test_queries)}")
+        # Evaluate queries concurrently (bounded by evaluation.max_concurrent_queries)
+        slots = asyncio.Semaphore(self.max_concurrent_queries)
 
-            try:
-                result = await self._evaluate_query(test_case)
-                self.results.append(result)
-            except Exception as e:
-                self.logger.error(f"Error evaluating query {i}: {e}")
-                self.results.append({
-                    "query": test_case.get("query", ""),
-                    "error": str(e)
-                })
+        async def _evaluate_one(i: int, test_case: Dict[str, Any]) -> Dict[str, Any]:
+            async with slots:
+                self.logger.info(f"Evaluating query {i}/{len(test_queries)}")
+                try:
+                    return await self._evaluate_query(test_case)
+                except Exception as e:
+                    self.logger.error(f"Error evaluating query {i}: {e}")
+                    return {
+                        "query": test_case.get("query", ""),
+                        "error": str(e)
+                    }
+
+        results = await asyncio.gather(*[
+            _evaluate_one(i, test_case) for i, test_case in enumerate(test_queries, 1)
+        ])
+        self.results.extend(results)
 
         # Aggregate results
         report = self._generate_report()
@@ -135,10 +142,9 @@ class SystemEvaluator:
         # Run through orchestrator if available
         if self.orchestrator:
             try:
-                # Call orchestrator's process_query method (synchronous wrapper)
+                # Call orchestrator's async API so queries can run concurrently
                 # Use reduced max_rounds (2) for efficient 6-query evaluation
-                # The orchestrator handles async internally
-                response_data = self.orchestrator.process_query(query, max_rounds=2)
+                response_data = await self.orchestrator.process_query_async(query, max_rounds=2)
                 
                 # Extract sources from conversation history if available
                 sources = []
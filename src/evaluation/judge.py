@@ -20,6 +20,7 @@ Example usage:
 
 from typing import Dict, Any, List, Optional
 import logging
+import asyncio
 import json
 import os
 from openai import OpenAI
@@ -342,8 +343,10 @@ Based on the scoring rubric above, evaluate the response for {criterion_name} on
             
             self.logger.debug(f"Calling {self.provider} API with model: {model_name}")
             
-            # OpenAI or vLLM
-            chat_completion = self.client.chat.completions.create(
+            # OpenAI or vLLM (blocking client, run it off the event loop so
+            # concurrent evaluations overlap)
+            chat_completion = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=model_name,
                 messages=[
                     {
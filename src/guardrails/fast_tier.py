@@ -0,0 +1,169 @@
+"""
+Fast Guardrail Tier
+Local screening of queries before the LLM-based safety checks.
+
+Most queries are plainly benign research questions, yet each one used to pay
+for LLM toxicity and relevance checks. The fast tier runs precompiled
+patterns over the query on the CPU and decides one of:
+
+- reject: an unambiguous injection or harm request, refused without an LLM call
+- accept: no risk triggers and clearly on topic, passed without an LLM call
+- escalate: anything else, which goes through the LLM checks as before
+
+Only confident decisions are made locally: a query is accepted only if it is
+short, contains no risk trigger and uses specific topic vocabulary. Generic
+research framing ("research", "study", "papers", "survey", "users") never
+counts toward the topic, because it is trivially wrapped around off-topic or
+hateful requests. Everything else is escalated. There is no learned local
+classifier; the accept path is deliberately narrow instead.
+
+The built-in vocabulary only describes the default topic (HCI research). For
+any other system topic, queries are accepted locally only if
+safety.fast_tier.topic_keywords lists that topic's vocabulary; otherwise the
+fast tier only rejects and escalates.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from src.guardrails.input_guardrail import INJECTION_PATTERNS
+
+# Unambiguous attempts to override the system, rejected locally
+REJECT_INJECTION_PATTERNS = [
+    r"\bignore\s+(?:all\s+)?(?:the\s+)?(?:previous|prior|above)\s+(?:instructions|prompts?|rules)\b",
+    r"\bdisregard\s+(?:all\s+)?(?:your|the|previous|prior)\s+(?:instructions|rules|guidelines)\b",
+    r"\b(?:reveal|print|show)\s+(?:me\s+)?(?:your|the)\s+system\s+prompt\b",
+    r"\byou\s+are\s+now\s+(?:DAN|in\s+developer\s+mode)\b",
+    r"\bjailbreak(?:ing)?\s+(?:mode|prompt)\b",
+]
+
+# Unambiguous requests for harmful instructions, rejected locally
+REJECT_HARM_PATTERNS = [
+    r"\bhow\s+(?:do\s+i|to|can\s+i)\s+(?:make|build|synthesi[sz]e)\s+(?:a\s+)?(?:bomb|explosives?|nerve\s+agent|meth)\b",
+    r"\bhow\s+(?:do\s+i|to|can\s+i)\s+(?:kill|poison|hurt)\s+(?:someone|a\s+person|people|my)\b",
+]
+
+# Words that need the LLM's judgment in context (e.g. "violence in video games" is a valid topic)
+ESCALATE_KEYWORDS = [
+    "attack", "bomb", "weapon", "kill", "suicide", "self-harm", "drugs", "hate", "racist",
+    "exploit", "hack", "password", "malware", "porn", "nsfw", "jailbreak", "prompt",
+    # Claims about groups of people
+    "inferior", "superior", "subhuman", "prove", "proving", "proves", "arguing", "women", "men",
+    "immigrants", "race", "races", "religion", "ethnic", "ethnicity", "gender",
+    # Surveillance of individuals
+    "stalk", "stalking", "spy", "spying", "track someone", "without her", "without him",
+    "without them", "my ex",
+]
+
+# Topic described by DEFAULT_TOPIC_KEYWORDS
+DEFAULT_TOPIC = "HCI Research"
+
+# Specific vocabulary of the default topic (HCI research). Generic research
+# words ("research", "study", "paper", "survey", "user", "design", ...) are
+# deliberately absent: they say nothing about the topic of a query.
+DEFAULT_TOPIC_KEYWORDS = [
+    "hci", "human-computer interaction", "usability", "ux", "user experience", "user interface",
+    "user interfaces", "accessibility", "user study", "user studies", "usability testing",
+    "heuristic evaluation", "participatory design", "interaction design", "user-centered design",
+    "prototyping", "information visualization", "cognitive load", "mental model", "affordance",
+    "affordances", "wearable", "wearables", "haptic", "haptics", "gesture recognition",
+    "voice assistant", "voice assistants", "conversational agent", "conversational agents",
+    "chatbot", "chatbots", "virtual reality", "augmented reality", "vr", "ar", "mixed reality",
+    "eye tracking", "explainable ai", "human-ai interaction", "crowdsourcing",
+    "ubiquitous computing", "screen reader", "screen readers", "think-aloud", "cscw",
+    "fitts' law", "tangible interfaces", "brain-computer interface", "human factors",
+]
+
+
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    """One alternation regex matching any keyword as a whole word (longest first)."""
+    escaped = sorted((re.escape(k.lower()) for k in keywords), key=len, reverse=True)
+    return re.compile(r"(?<![\w-])(?:" + "|".join(escaped) + r")(?![\w-])")
+
+
+class FastTier:
+    """
+    Precompiled local screening of input queries.
+    """
+
+    def __init__(
+        self,
+        topic: str = DEFAULT_TOPIC,
+        topic_keywords: Optional[List[str]] = None,
+        min_topic_hits: int = 2,
+        escalate_keywords: Optional[List[str]] = None,
+        max_words: int = 25,
+    ):
+        """
+        Initialize fast tier (all patterns are compiled once here).
+
+        Args:
+            topic: System topic
+            topic_keywords: Vocabulary of the system topic. None uses the built-in
+                HCI terms for the default topic and disables local accepts for
+                any other topic; an empty list always disables local accepts
+            min_topic_hits: Distinct topic terms a query needs to be accepted locally
+            escalate_keywords: Words that always send a query to the LLM checks
+            max_words: Longest query (in words) that may be accepted locally
+        """
+        self.min_topic_hits = min_topic_hits
+        self.max_words = max_words
+        self._reject_injection = re.compile("|".join(REJECT_INJECTION_PATTERNS), re.IGNORECASE)
+        self._reject_harm = re.compile("|".join(REJECT_HARM_PATTERNS), re.IGNORECASE)
+        self._escalate = _keyword_pattern(
+            (escalate_keywords or ESCALATE_KEYWORDS) + INJECTION_PATTERNS
+        )
+        if topic_keywords is None and topic == DEFAULT_TOPIC:
+            topic_keywords = DEFAULT_TOPIC_KEYWORDS
+        self._topic = _keyword_pattern(topic_keywords) if topic_keywords else None
+
+    def classify(self, query: str) -> Dict[str, Any]:
+        """
+        Screen a query locally.
+
+        Args:
+            query: User query
+
+        Returns:
+            Dictionary with "decision" ("accept", "reject" or "escalate"),
+            "violations" (for rejections) and "reason"
+        """
+        match = self._reject_injection.search(query)
+        if match:
+            return {
+                "decision": "reject",
+                "violations": [{
+                    "validator": "prompt_injection",
+                    "reason": f"Prompt injection detected: '{match.group(0)}'",
+                    "severity": "high"
+                }],
+                "reason": "injection pattern",
+            }
+
+        match = self._reject_harm.search(query)
+        if match:
+            return {
+                "decision": "reject",
+                "violations": [{
+                    "validator": "toxic_language",
+                    "reason": f"Request for harmful instructions: '{match.group(0)}'",
+                    "severity": "high"
+                }],
+                "reason": "harm pattern",
+            }
+
+        lowered = query.lower()
+        trigger = self._escalate.search(lowered)
+        if trigger:
+            return {"decision": "escalate", "violations": [], "reason": f"risk trigger '{trigger.group(0)}'"}
+
+        if len(lowered.split()) > self.max_words:
+            return {"decision": "escalate", "violations": [], "reason": "query too long to screen locally"}
+
+        if self._topic is None:
+            return {"decision": "escalate", "violations": [], "reason": "no topic vocabulary configured"}
+
+        topic_hits = set(self._topic.findall(lowered))
+        if len(topic_hits) >= self.min_topic_hits:
+            return {"decision": "accept", "violations": [], "reason": f"on topic ({', '.join(sorted(topic_hits))})"}
+        return {"decision": "escalate", "violations": [], "reason": "topic unclear"}
@@ -3,21 +3,36 @@ Input Guardrail
 Checks user inputs for safety violations.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import logging
 import asyncio
 
-from src.guardrails.llm_safety_helper import create_llm_client, check_relevance_llm
+from src.guardrails.llm_safety_helper import (
+    DEFAULT_CLASSIFIER_MODE,
+    create_llm_client,
+    check_content_safety_llm,
+    check_relevance_llm,
+    check_relevance_llm_async,
+    classify_safety_llm,
+    run_coroutine_sync,
+)
+from src.guardrails.patterns import PhraseMatcher
+from src.guardrails.verdict_cache import VerdictCache
 
+INJECTION_PATTERNS = [
+    "ignore previous instructions",
+    "disregard",
+    "forget everything",
+    "system:",
+    "sudo",
+    "override",
+    "new instructions",
+    "you are now",
+    "pretend to be",
+    "act as if",
+]
 
-def _run_async_in_thread(coro):
-    """Helper to run async code in a new event loop in a thread."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+_INJECTION_MATCHER = PhraseMatcher(INJECTION_PATTERNS)
 
 
 class InputGuardrail:
@@ -27,14 +42,16 @@ class InputGuardrail:
     Uses LLM-based checks combined with pattern matching for comprehensive validation.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], verdict_cache: Optional[VerdictCache] = None):
         """
         Initialize input guardrail.
 
         Args:
             config: Configuration dictionary
+            verdict_cache: Cache of LLM check verdicts (None to disable caching)
         """
         self.config = config
+        self.verdict_cache = verdict_cache
         self.logger = logging.getLogger("safety.input_guardrail")
         
         # Initialize LLM client
@@ -48,6 +65,12 @@ class InputGuardrail:
             # If config structure is different, try to get from root level
             self.topic = config.get("topic", "HCI Research")
 
+        # Shared deadline for the concurrent LLM checks of validate_async()
+        self.deadline_seconds = config.get("input_deadline_seconds", 10.0)
+
+        # One "consolidated" classifier call (default), or "separate" LLM calls per check
+        self.classifier_mode = config.get("classifier_mode", DEFAULT_CLASSIFIER_MODE)
+
     def validate(self, query: str) -> Dict[str, Any]:
         """
         Validate input query.
@@ -58,22 +81,22 @@ class InputGuardrail:
         Returns:
             Validation result with 'valid' boolean and 'violations' list
         """
-        violations = []
+        violations = self._check_length(query)
 
-        # Basic length checks
-        if len(query) < 5:
-            violations.append({
-                "validator": "length",
-                "reason": "Query too short (minimum 5 characters)",
-                "severity": "low"
-            })
-
-        if len(query) > 2000:
-            violations.append({
-                "validator": "length",
-                "reason": "Query too long (maximum 2000 characters)",
-                "severity": "medium"
-            })
+        if self.llm_client and self.classifier_mode == "consolidated":
+            # One classifier call covers injection, toxicity and relevance
+            result = run_coroutine_sync(
+                classify_safety_llm(
+                    self.llm_client, query, "input", self.config, self.topic,
+                    verdict_cache=self.verdict_cache
+                )
+            )
+            violations.extend(self._classifier_violations(result, self._find_injection_patterns(query)))
+            return {
+                "valid": len(violations) == 0,
+                "violations": violations,
+                "sanitized_input": query
+            }
 
         # Check for prompt injection
         injection_violations = self._check_prompt_injection(query)
@@ -101,6 +124,160 @@ class InputGuardrail:
             "sanitized_input": query  # Could be modified version
         }
 
+    async def validate_async(self, query: str) -> Dict[str, Any]:
+        """
+        Validate input query, running the LLM-backed checks concurrently.
+
+        Injection verification and the toxic language check share one content
+        safety call (they used to issue the same request twice), and it runs
+        alongside the relevance check under a shared deadline, so screening
+        takes as long as the slowest check instead of the sum. The first
+        high-severity violation ends validation and cancels the other checks.
+
+        Args:
+            query: User input to validate
+
+        Returns:
+            Validation result with 'valid' boolean and 'violations' list
+        """
+        violations = self._check_length(query)
+        found_patterns = self._find_injection_patterns(query)
+
+        if not self.llm_client:
+            violations.extend(self._pattern_injection_violations(found_patterns))
+            return {"valid": len(violations) == 0, "violations": violations, "sanitized_input": query}
+
+        if self.classifier_mode == "consolidated":
+            checks = {
+                asyncio.ensure_future(
+                    classify_safety_llm(
+                        self.llm_client, query, "input", self.config, self.topic,
+                        verdict_cache=self.verdict_cache
+                    )
+                ): "classifier",
+            }
+        else:
+            checks = {
+                asyncio.ensure_future(
+                    check_content_safety_llm(
+                        self.llm_client, query, "input", self.config, self.topic, self.verdict_cache
+                    )
+                ): "content_safety",
+                asyncio.ensure_future(
+                    check_relevance_llm_async(self.llm_client, query, self.topic, self.config, self.verdict_cache)
+                ): "relevance",
+            }
+        completed = set()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_seconds
+        pending = set(checks)
+
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = checks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        self.logger.warning(f"{name} check failed: {e}")
+                        continue
+                    completed.add(name)
+                    violations.extend(self._interpret_check(name, result, found_patterns))
+                if any(v.get("severity") == "high" for v in violations):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending and not any(v.get("severity") == "high" for v in violations):
+            skipped = sorted(checks[task] for task in pending)
+            self.logger.warning(f"Input checks timed out after {self.deadline_seconds}s: {', '.join(skipped)}")
+        if not completed & {"content_safety", "classifier"}:
+            # No LLM verdict, so a pattern match alone counts (as in validate())
+            if not any(v.get("validator") == "prompt_injection" for v in violations):
+                violations.extend(self._pattern_injection_violations(found_patterns))
+
+        return {
+            "valid": len(violations) == 0,
+            "violations": violations,
+            "sanitized_input": query
+        }
+
+    def _interpret_check(
+        self,
+        name: str,
+        result: Dict[str, Any],
+        found_patterns: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Turn the result of one concurrent LLM check into violations."""
+        if name == "classifier":
+            return self._classifier_violations(result, found_patterns)
+        if name == "relevance":
+            return self._relevance_violations(result)
+        return self._toxic_violations(result) + self._injection_violations(result, found_patterns)
+
+    def _classifier_violations(self, result: Dict[str, Any], found_patterns: List[str]) -> List[Dict[str, Any]]:
+        """
+        Violations from the consolidated classifier's per-category verdicts.
+
+        Verdicts map onto the same validators and thresholds as the separate
+        checks: injection is only reported when a known pattern matched, and
+        off-topic only when the classifier is confident.
+        """
+        if result.get("error"):
+            return self._pattern_injection_violations(found_patterns)
+
+        violations = []
+        verdicts = result.get("categories", {})
+        harmful = verdicts.get("harmful", {})
+        if harmful.get("flagged"):
+            violations.append({
+                "validator": "toxic_language",
+                "reason": harmful.get("reasoning") or "Contains toxic or harmful language",
+                "severity": harmful.get("severity", "high")
+            })
+
+        injection = verdicts.get("prompt_injection", {})
+        if found_patterns and injection.get("flagged"):
+            violations.append({
+                "validator": "prompt_injection",
+                "reason": injection.get("reasoning") or f"Detected prompt injection patterns: {', '.join(found_patterns)}",
+                "severity": "high"
+            })
+
+        off_topic = verdicts.get("off_topic", {})
+        if off_topic.get("flagged") and off_topic.get("confidence", 0.5) >= 0.7:
+            violations.append({
+                "validator": "relevance",
+                "reason": off_topic.get("reasoning") or f"Query may not be relevant to {self.topic}",
+                "severity": "low"
+            })
+        return violations
+
+    def _check_length(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Check query length limits.
+        """
+        violations = []
+        if len(query) < 5:
+            violations.append({
+                "validator": "length",
+                "reason": "Query too short (minimum 5 characters)",
+                "severity": "low"
+            })
+
+        if len(query) > 2000:
+            violations.append({
+                "validator": "length",
+                "reason": "Query too long (maximum 2000 characters)",
+                "severity": "medium"
+            })
+        return violations
+
     def _check_toxic_language(self, text: str) -> List[Dict[str, Any]]:
         """
         Check for toxic/harmful language using LLM.
@@ -112,128 +289,88 @@ class InputGuardrail:
         
         try:
             # Use LLM to check for toxic language
-            from src.guardrails.llm_safety_helper import check_content_safety_llm
-            
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(
-                        _run_async_in_thread,
-                        check_content_safety_llm(
-                            self.llm_client,
-                            text,
-                            "input",
-                            self.config,
-                            self.topic
-                        )
-                    )
-                    result = future.result()
-            else:
-                result = loop.run_until_complete(
-                    check_content_safety_llm(
-                        self.llm_client,
-                        text,
-                        "input",
-                        self.config,
-                        self.topic
-                    )
+            result = run_coroutine_sync(
+                check_content_safety_llm(
+                    self.llm_client,
+                    text,
+                    "input",
+                    self.config,
+                    self.topic,
+                    self.verdict_cache
                 )
-            
-            if not result.get("safe", True):
-                category = result.get("category", "harmful_content")
-                if category == "HARMFUL":
-                    violations.append({
-                        "validator": "toxic_language",
-                        "reason": result.get("reasoning", "Contains toxic or harmful language"),
-                        "severity": result.get("severity", "high")
-                    })
+            )
+            violations.extend(self._toxic_violations(result))
         except Exception as e:
             self.logger.error(f"Error in toxic language check: {e}")
         
         return violations
 
+    def _toxic_violations(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Toxic language violations from a content safety check result."""
+        if result.get("safe", True) or result.get("category", "harmful_content") != "HARMFUL":
+            return []
+        return [{
+            "validator": "toxic_language",
+            "reason": result.get("reasoning", "Contains toxic or harmful language"),
+            "severity": result.get("severity", "high")
+        }]
+
     def _check_prompt_injection(self, text: str) -> List[Dict[str, Any]]:
         """
         Check for prompt injection attempts using pattern matching and LLM verification.
         """
         violations = []
-        
-        # Check for common prompt injection patterns
-        injection_patterns = [
-            "ignore previous instructions",
-            "disregard",
-            "forget everything",
-            "system:",
-            "sudo",
-            "override",
-            "new instructions",
-            "you are now",
-            "pretend to be",
-            "act as if",
-        ]
-
-        found_patterns = []
-        for pattern in injection_patterns:
-            if pattern.lower() in text.lower():
-                found_patterns.append(pattern)
+        found_patterns = self._find_injection_patterns(text)
         
         # If patterns found, verify with LLM if available
         if found_patterns:
             if self.llm_client:
                 try:
-                    from src.guardrails.llm_safety_helper import check_content_safety_llm
-                    
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as pool:
-                            future = pool.submit(
-                                _run_async_in_thread,
-                                check_content_safety_llm(
-                                    self.llm_client,
-                                    text,
-                                    "input",
-                                    self.config,
-                                    self.topic
-                                )
-                            )
-                            result = future.result()
-                    else:
-                        result = loop.run_until_complete(
-                            check_content_safety_llm(
-                                self.llm_client,
-                                text,
-                                "input",
-                                self.config,
-                                self.topic
-                            )
+                    result = run_coroutine_sync(
+                        check_content_safety_llm(
+                            self.llm_client,
+                            text,
+                            "input",
+                            self.config,
+                            self.topic,
+                            self.verdict_cache
                         )
-                    
-                    if result.get("category") == "PROMPT_INJECTION":
-                        violations.append({
-                            "validator": "prompt_injection",
-                            "reason": result.get("reasoning", f"Detected prompt injection patterns: {', '.join(found_patterns)}"),
-                            "severity": "high"
-                        })
+                    )
+                    violations.extend(self._injection_violations(result, found_patterns))
                 except Exception as e:
                     self.logger.warning(f"LLM prompt injection check failed, using pattern match: {e}")
                     # Fallback to pattern-based detection
-                    violations.append({
-                        "validator": "prompt_injection",
-                        "reason": f"Potential prompt injection patterns detected: {', '.join(found_patterns)}",
-                        "severity": "high"
-                    })
+                    violations.extend(self._pattern_injection_violations(found_patterns))
             else:
                 # No LLM, use pattern-based detection
-                violations.append({
-                    "validator": "prompt_injection",
-                    "reason": f"Potential prompt injection patterns detected: {', '.join(found_patterns)}",
-                    "severity": "high"
-                })
+                violations.extend(self._pattern_injection_violations(found_patterns))
 
         return violations
 
+    def _find_injection_patterns(self, text: str) -> List[str]:
+        """Common prompt injection phrases contained in the text."""
+        return _INJECTION_MATCHER.find(text)
+
+    def _injection_violations(self, result: Dict[str, Any], found_patterns: List[str]) -> List[Dict[str, Any]]:
+        """Prompt injection violations from a content safety check result (only if patterns matched)."""
+        if not found_patterns or result.get("category") != "PROMPT_INJECTION":
+            return []
+        return [{
+            "validator": "prompt_injection",
+            "reason": result.get("reasoning", f"Detected prompt injection patterns: {', '.join(found_patterns)}"),
+            "severity": "high"
+        }]
+
+    def _pattern_injection_violations(self, found_patterns: List[str]) -> List[Dict[str, Any]]:
+        """Prompt injection violations from pattern matches alone."""
+        if not found_patterns:
+            return []
+        return [{
+            "validator": "prompt_injection",
+            "reason": f"Potential prompt injection patterns detected: {', '.join(found_patterns)}",
+            "severity": "high"
+        }]
+
     def _check_relevance(self, query: str) -> List[Dict[str, Any]]:
         """
         Check if query is relevant to the system's topic using LLM.
@@ -244,20 +381,23 @@ class InputGuardrail:
             return violations
         
         try:
-            from src.guardrails.llm_safety_helper import check_relevance_llm
-            
             # check_relevance_llm is synchronous, call it directly
-            result = check_relevance_llm(self.llm_client, query, self.topic, self.config)
-            
-            if not result.get("relevant", True):
-                confidence = result.get("confidence", 0.5)
-                if confidence < 0.3:  # Low confidence that it's relevant
-                    violations.append({
-                        "validator": "relevance",
-                        "reason": result.get("reasoning", f"Query may not be relevant to {self.topic}"),
-                        "severity": "low"
-                    })
+            result = check_relevance_llm(self.llm_client, query, self.topic, self.config, self.verdict_cache)
+            violations.extend(self._relevance_violations(result))
         except Exception as e:
             self.logger.error(f"Error in relevance check: {e}")
         
         return violations
+
+    def _relevance_violations(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Relevance violations from a relevance check result."""
+        if result.get("relevant", True):
+            return []
+        confidence = result.get("confidence", 0.5)
+        if confidence >= 0.3:  # Only flag low confidence that it's relevant
+            return []
+        return [{
+            "validator": "relevance",
+            "reason": result.get("reasoning", f"Query may not be relevant to {self.topic}"),
+            "severity": "low"
+        }]
@@ -4,21 +4,18 @@ Checks system outputs for safety violations.
 """
 
 from typing import Dict, Any, List, Optional
-import re
 import logging
 import asyncio
 
-from src.guardrails.llm_safety_helper import create_llm_client
-
-
-def _run_async_in_thread(coro):
-    """Helper to run async code in a new event loop in a thread."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+from src.guardrails.llm_safety_helper import (
+    DEFAULT_CLASSIFIER_MODE,
+    classify_safety_llm,
+    create_llm_client,
+    parse_json_response,
+    run_coroutine_sync,
+)
+from src.guardrails.patterns import PII_MATCHER
+from src.guardrails.verdict_cache import VerdictCache, lookup_verdict, store_verdict
 
 
 class OutputGuardrail:
@@ -28,14 +25,16 @@ class OutputGuardrail:
     Uses LLM-based checks combined with regex patterns for comprehensive validation.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], verdict_cache: Optional[VerdictCache] = None):
         """
         Initialize output guardrail.
 
         Args:
             config: Configuration dictionary
+            verdict_cache: Cache of LLM check verdicts (None to disable caching)
         """
         self.config = config
+        self.verdict_cache = verdict_cache
         self.logger = logging.getLogger("safety.output_guardrail")
         
         # Initialize LLM client
@@ -49,6 +48,12 @@ class OutputGuardrail:
             # If config structure is different, try to get from root level
             self.topic = config.get("topic", "HCI Research")
 
+        # One "consolidated" classifier call (default), or "separate" LLM calls per check
+        self.classifier_mode = config.get("classifier_mode", DEFAULT_CLASSIFIER_MODE)
+
+        # Combined PII regex (compiled once at import)
+        self.pii_matcher = PII_MATCHER
+
     def validate(self, response: str, sources: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Validate output response.
@@ -66,6 +71,20 @@ class OutputGuardrail:
         pii_violations = self._check_pii(response)
         violations.extend(pii_violations)
 
+        if self.llm_client and self.classifier_mode == "consolidated":
+            # One classifier call covers harmful content, factual consistency and bias
+            result = run_coroutine_sync(
+                classify_safety_llm(
+                    self.llm_client, response, "output", self.config, self.topic, sources, self.verdict_cache
+                )
+            )
+            violations.extend(self._classifier_violations(result, sources))
+            return {
+                "valid": len(violations) == 0,
+                "violations": violations,
+                "sanitized_output": self._sanitize(response, violations) if violations else response
+            }
+
         # Check for harmful content (LLM-based if available)
         if self.llm_client:
             try:
@@ -102,38 +121,59 @@ class OutputGuardrail:
         """
         violations = []
 
-        # Comprehensive regex patterns for common PII
-        patterns = {
-            "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            "phone_us": r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
-            "phone_international": r'\b\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b',
-            "ssn": r'\b\d{3}-\d{2}-\d{4}\b',
-            "credit_card": r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b',
-            "ip_address": r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
-        }
+        # One pass of the combined regex over the text, IP matches are
+        # validated (each octet 0-255) to filter out version numbers etc.
+        for pii_type, matches in self.pii_matcher.find(text).items():
+            violations.append({
+                "validator": "pii",
+                "pii_type": pii_type,
+                "reason": f"Contains {pii_type}",
+                "severity": "high",
+                "matches": matches[:5]  # Limit to first 5 matches
+            })
 
-        for pii_type, pattern in patterns.items():
-            matches = re.findall(pattern, text)
-            if matches:
-                # Filter out false positives (e.g., years, common numbers)
-                if pii_type == "ip_address":
-                    # Basic validation: each octet should be 0-255
-                    valid_matches = []
-                    for match in matches:
-                        parts = match.split('.')
-                        if all(0 <= int(p) <= 255 for p in parts):
-                            valid_matches.append(match)
-                    matches = valid_matches
-                
-                if matches:
-                    violations.append({
-                        "validator": "pii",
-                        "pii_type": pii_type,
-                        "reason": f"Contains {pii_type}",
-                        "severity": "high",
-                        "matches": matches[:5]  # Limit to first 5 matches
-                    })
+        return violations
 
+    def _classifier_violations(
+        self,
+        result: Dict[str, Any],
+        sources: Optional[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Violations from the consolidated classifier's per-category verdicts.
+
+        Uses the same validator names and severities as the separate checks.
+        """
+        violations = []
+        verdicts = result.get("categories", {})
+
+        harmful = verdicts.get("harmful_content", {})
+        if harmful.get("flagged"):
+            for v in harmful.get("details") or ["harmful content"]:
+                violations.append({
+                    "validator": "harmful_content",
+                    "reason": harmful.get("reasoning") or f"LLM detected: {v}",
+                    "severity": harmful.get("severity", "medium")
+                })
+
+        inconsistency = verdicts.get("factual_inconsistency", {})
+        if sources and inconsistency.get("flagged"):
+            for inc in inconsistency.get("details") or [inconsistency.get("reasoning", "Inconsistent with sources")]:
+                violations.append({
+                    "validator": "factual_consistency",
+                    "reason": inc,
+                    "severity": "high"
+                })
+
+        bias = verdicts.get("bias", {})
+        if bias.get("flagged"):
+            bias_types = bias.get("details", [])
+            violations.append({
+                "validator": "bias",
+                "reason": bias.get("reasoning") or f"Detected bias: {', '.join(bias_types)}",
+                "severity": bias.get("severity", "medium"),
+                "bias_types": bias_types
+            })
         return violations
 
     def _check_harmful_content(self, text: str) -> List[Dict[str, Any]]:
@@ -148,31 +188,16 @@ class OutputGuardrail:
         try:
             from src.guardrails.llm_safety_helper import check_content_safety_llm
             
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(
-                        _run_async_in_thread,
-                        check_content_safety_llm(
-                            self.llm_client,
-                            text,
-                            "output",
-                            self.config,
-                            self.topic
-                        )
-                    )
-                    result = future.result()
-            else:
-                result = loop.run_until_complete(
-                    check_content_safety_llm(
-                        self.llm_client,
-                        text,
-                        "output",
-                        self.config,
-                        self.topic
-                    )
+            result = run_coroutine_sync(
+                check_content_safety_llm(
+                    self.llm_client,
+                    text,
+                    "output",
+                    self.config,
+                    self.topic,
+                    self.verdict_cache
                 )
+            )
             
             if not result.get("safe", True):
                 llm_violations = result.get("violations", [])
@@ -244,17 +269,7 @@ Respond in JSON format:
             else:
                 return violations
             
-            # Parse JSON
-            result_text = result_text.strip()
-            if result_text.startswith("```json"):
-                result_text = result_text[7:]
-            elif result_text.startswith("```"):
-                result_text = result_text[3:]
-            if result_text.endswith("```"):
-                result_text = result_text[:-3]
-            result_text = result_text.strip()
-            
-            result = __import__("json").loads(result_text)
+            result = parse_json_response(result_text)
             
             if not result.get("consistent", True):
                 inconsistencies = result.get("inconsistencies", [])
@@ -279,11 +294,13 @@ Respond in JSON format:
             return violations
         
         try:
-            model_config = self.config.get("models", {}).get("default", {})
-            provider = model_config.get("provider", "openai")
-            model_name = model_config.get("name", "gpt-4o-mini")
+            cache_key, result = lookup_verdict(self.verdict_cache, "bias", text, self.config, self.topic)
+            if result is None:
+                model_config = self.config.get("models", {}).get("default", {})
+                provider = model_config.get("provider", "openai")
+                model_name = model_config.get("name", "gpt-4o-mini")
             
-            prompt = f"""Analyze the following text for biased language, stereotypes, or discriminatory content.
+                prompt = f"""Analyze the following text for biased language, stereotypes, or discriminatory content.
 
 Text:
 {text[:1500]}
@@ -296,35 +313,26 @@ Respond in JSON format:
     "severity": "low|medium|high"
 }}"""
             
-            from openai import OpenAI
-            api_key = __import__("os").getenv("OPENAI_API_KEY")
-            base_url = __import__("os").getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
-            if api_key:
-                client = OpenAI(api_key=api_key, base_url=base_url)
-                llm_response = client.chat.completions.create(
-                    model=model_name,
-                    messages=[
-                        {"role": "system", "content": "You are a bias detector. Respond in valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=512
-                )
-                result_text = llm_response.choices[0].message.content
-            else:
-                return violations
-            
-            # Parse JSON
-            result_text = result_text.strip()
-            if result_text.startswith("```json"):
-                result_text = result_text[7:]
-            elif result_text.startswith("```"):
-                result_text = result_text[3:]
-            if result_text.endswith("```"):
-                result_text = result_text[:-3]
-            result_text = result_text.strip()
+                from openai import OpenAI
+                api_key = __import__("os").getenv("OPENAI_API_KEY")
+                base_url = __import__("os").getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+                if api_key:
+                    client = OpenAI(api_key=api_key, base_url=base_url)
+                    llm_response = client.chat.completions.create(
+                        model=model_name,
+                        messages=[
+                            {"role": "system", "content": "You are a bias detector. Respond in valid JSON."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.3,
+                        max_tokens=512
+                    )
+                    result_text = llm_response.choices[0].message.content
+                else:
+                    return violations
             
-            result = __import__("json").loads(result_text)
+                result = parse_json_response(result_text)
+                store_verdict(self.verdict_cache, cache_key, result)
             
             if result.get("has_bias", False):
                 bias_types = result.get("bias_types", [])
@@ -343,19 +351,11 @@ Respond in JSON format:
         """
         Sanitize text by removing/redacting violations.
         """
-        sanitized = text
-
-        # Redact PII
-        for violation in violations:
-            if violation.get("validator") == "pii":
-                matches = violation.get("matches", [])
-                for match in matches:
-                    sanitized = sanitized.replace(match, "[REDACTED]")
-            
-            # For harmful content or bias, we could redact sections
-            # For now, we'll add a warning prefix
-            elif violation.get("validator") in ["harmful_content", "bias"]:
-                # Could implement more sophisticated redaction here
-                pass
+        # Redact every match of the flagged PII types in one pass
+        pii_types = {v.get("pii_type") for v in violations if v.get("validator") == "pii"}
+        sanitized = self.pii_matcher.redact(text, pii_types) if pii_types else text
+
+        # For harmful content or bias, we could redact sections
+        # Could implement more sophisticated redaction here
 
         return sanitized
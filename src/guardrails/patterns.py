@@ -0,0 +1,167 @@
+"""
+Guardrail Patterns
+Precompiled single-pass matchers for PII and prompt-injection triggers.
+
+The output guardrail used to run one re.findall per PII type over the whole
+response, then rescan it once per violation to redact, and the input
+guardrail lowercased the whole query again for every injection phrase. The
+matchers here are built once and scan each text in one pass.
+
+Simply joining the PII regexes into one alternation is slower than running
+them separately (every alternative is tried at every position and re loses
+its prefix optimizations). PIIMatcher therefore makes its single pass with a
+cheap candidate regex (runs of digits and separators, and "@" signs) and
+runs the combined PII regex only inside those short windows.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# PII regexes by type; order matters where patterns overlap (first alternative wins)
+PII_PATTERNS = {
+    "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    "ssn": r'\b\d{3}-\d{2}-\d{4}\b',
+    "credit_card": r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b',
+    "ip_address": r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
+    "phone_international": r'\b\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b',
+    "phone_us": r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
+}
+
+# Every numeric PII match is a run of at least 5 of these characters
+# (shortest: "+1234"), and every email contains "@"
+_CANDIDATES = re.compile(r"[\d+(][\d\-.\s()+]{4,}|@")
+
+# Longest email local part / domain looked at around an "@"
+_EMAIL_WINDOW = (64, 256)
+
+
+def _valid_ip(match: str) -> bool:
+    """Each octet of an IP address must be 0-255 (filters version numbers etc.)."""
+    return all(0 <= int(part) <= 255 for part in match.split("."))
+
+
+class PIIMatcher:
+    """
+    Single-pass PII detection and redaction over PII_PATTERNS.
+    """
+
+    def __init__(self):
+        """Compile the email regex and the combined regex of the numeric PII types."""
+        self.pii_types = list(PII_PATTERNS)
+        self._email = re.compile(PII_PATTERNS["email"])
+        self._numeric = re.compile("|".join(
+            f"(?P<{name}>{pattern})" for name, pattern in PII_PATTERNS.items() if name != "email"
+        ))
+        # Last scan, so redacting right after detection doesn't scan again
+        self._last_scan: Tuple[Optional[str], List[Tuple[int, int, str]]] = (None, [])
+
+    def _scan(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping PII matches as (start, end, type), in text order."""
+        last_text, last_matches = self._last_scan
+        if last_text is text or last_text == text:
+            return last_matches
+
+        found = []
+        length = len(text)
+        for candidate in _CANDIDATES.finditer(text):
+            if candidate.group(0) == "@":
+                at = candidate.start()
+                window = self._email.finditer(text, max(0, at - _EMAIL_WINDOW[0]), min(length, at + _EMAIL_WINDOW[1]))
+                for match in window:
+                    if match.start() > at:
+                        break
+                    if at < match.end():
+                        found.append((match.start(), match.end(), "email"))
+                        break
+            else:
+                # One extra character so a trailing \b sees what follows the run
+                for match in self._numeric.finditer(text, candidate.start(), min(length, candidate.end() + 1)):
+                    if match.lastgroup == "ip_address" and not _valid_ip(match.group(0)):
+                        continue
+                    found.append((match.start(), match.end(), match.lastgroup))
+
+        # Emails are found after the digits of their local part, drop overlaps
+        found.sort(key=lambda item: (item[0], self.pii_types.index(item[2])))
+        matches, last_end = [], 0
+        for start, end, pii_type in found:
+            if start >= last_end:
+                matches.append((start, end, pii_type))
+                last_end = end
+        self._last_scan = (text, matches)
+        return matches
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """
+        Find PII in one pass.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Dictionary mapping PII type to its matches, in PII_PATTERNS order
+        """
+        found: Dict[str, List[str]] = {}
+        for start, end, pii_type in self._scan(text):
+            found.setdefault(pii_type, []).append(text[start:end])
+        return {pii_type: found[pii_type] for pii_type in self.pii_types if pii_type in found}
+
+    def redact(self, text: str, pii_types: Optional[Iterable[str]] = None, replacement: str = "[REDACTED]") -> str:
+        """
+        Replace PII in one pass.
+
+        Args:
+            text: Text to redact
+            pii_types: PII types to redact (all types if None)
+            replacement: Replacement for each match
+
+        Returns:
+            Redacted text
+        """
+        types = set(pii_types) if pii_types is not None else set(self.pii_types)
+        parts, position = [], 0
+        for start, end, pii_type in self._scan(text):
+            if pii_type in types:
+                parts.append(text[position:start])
+                parts.append(replacement)
+                position = end
+        if not parts:
+            return text
+        parts.append(text[position:])
+        return "".join(parts)
+
+
+class PhraseMatcher:
+    """
+    Case-insensitive detection of literal trigger phrases.
+
+    For a short phrase list, CPython's substring search over the text
+    lowercased once is faster than a regex alternation (or a pure-Python
+    Aho-Corasick automaton), so each phrase is located with str.find.
+    """
+
+    def __init__(self, phrases: List[str]):
+        """
+        Prepare the lowercased phrases.
+
+        Args:
+            phrases: Literal trigger phrases
+        """
+        self.phrases = list(phrases)
+        self._lowered = [(phrase, phrase.lower()) for phrase in self.phrases]
+
+    def find(self, text: str) -> List[str]:
+        """
+        Find the phrases contained in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Matched phrases, in the order of the phrase list
+        """
+        lowered = text.lower()
+        return [phrase for phrase, needle in self._lowered if needle in lowered]
+
+
+# Built once, shared by every guardrail instance
+PII_MATCHER = PIIMatcher()
@@ -7,23 +7,14 @@ from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
 import json
-import asyncio
 
 from src.guardrails.input_guardrail import InputGuardrail
 from src.guardrails.output_guardrail import OutputGuardrail
+from src.guardrails.fast_tier import FastTier
+from src.guardrails.verdict_cache import create_verdict_cache
 from src.guardrails.llm_safety_helper import create_llm_client
 
 
-def _run_async_in_thread(coro):
-    """Helper to run async code in a new event loop in a thread."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 class SafetyManager:
     """
     Manages safety guardrails for the multi-agent system.
@@ -59,11 +50,14 @@ class SafetyManager:
 
         # Initialize LLM client for safety checks
         self.llm_client = create_llm_client(config)
+
+        # Cache of LLM check verdicts, shared by the input and output guardrails
+        self.verdict_cache = create_verdict_cache(config)
         
         # Initialize input and output guardrails
-        self.input_guardrail = InputGuardrail(config)
-        self.output_guardrail = OutputGuardrail(config)
-        
+        self.input_guardrail = InputGuardrail(config, self.verdict_cache)
+        self.output_guardrail = OutputGuardrail(config, self.verdict_cache)
+
         # Get system topic from config (handle both nested and flat config structures)
         system_config = config.get("system", {})
         if isinstance(system_config, dict):
@@ -72,6 +66,17 @@ class SafetyManager:
             # If config structure is different, try to get from root level
             self.topic = config.get("topic", "HCI Research")
 
+        # Local fast tier screening queries before the LLM checks
+        fast_tier_config = config.get("fast_tier", {})
+        self.fast_tier = FastTier(
+            topic=self.topic,
+            topic_keywords=fast_tier_config.get("topic_keywords"),
+            min_topic_hits=fast_tier_config.get("min_topic_hits", 2),
+            escalate_keywords=fast_tier_config.get("escalate_keywords"),
+            max_words=fast_tier_config.get("max_words", 25),
+        ) if fast_tier_config.get("enabled", True) else None
+        self.tier_counts = {"fast_accept": 0, "fast_reject": 0, "escalated": 0}
+
     def check_input_safety(self, query: str) -> Dict[str, Any]:
         """
         Check if input query is safe to process.
@@ -85,9 +90,58 @@ class SafetyManager:
         if not self.enabled:
             return {"safe": True}
 
-        # Use input guardrail for validation
-        validation_result = self.input_guardrail.validate(query)
-        
+        validation_result = self._check_fast_tier(query)
+        if validation_result is None:
+            # Use input guardrail for validation
+            validation_result = self.input_guardrail.validate(query)
+        return self._input_safety_result(query, validation_result)
+
+    async def check_input_safety_async(self, query: str) -> Dict[str, Any]:
+        """
+        Check if input query is safe to process, running the LLM checks concurrently.
+
+        Args:
+            query: User query to check
+
+        Returns:
+            Dictionary with 'safe' boolean and optional 'violations' list
+        """
+        if not self.enabled:
+            return {"safe": True}
+
+        validation_result = self._check_fast_tier(query)
+        if validation_result is None:
+            validation_result = await self.input_guardrail.validate_async(query)
+        return self._input_safety_result(query, validation_result)
+
+    def _check_fast_tier(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Screen a query with the local fast tier.
+
+        Returns:
+            Validation result if the fast tier decided, or None to escalate
+            to the LLM checks
+        """
+        if not self.fast_tier:
+            return None
+
+        verdict = self.fast_tier.classify(query)
+        if verdict["decision"] == "escalate":
+            self.tier_counts["escalated"] += 1
+            return None
+
+        self.tier_counts[f"fast_{verdict['decision']}"] += 1
+        self.logger.debug(f"Fast tier {verdict['decision']}: {verdict['reason']}")
+        violations = self.input_guardrail._check_length(query) + verdict["violations"]
+        return {
+            "valid": len(violations) == 0,
+            "violations": violations,
+            "sanitized_input": query,
+            "tier": "fast"
+        }
+
+    def _input_safety_result(self, query: str, validation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the input safety result from an input guardrail validation."""
         if not validation_result.get("valid", True):
             violations = validation_result.get("violations", [])
             is_safe = False
@@ -97,26 +151,17 @@ class SafetyManager:
             is_safe = len(violations) == 0
         
         # Log safety event
+        events = []
         if not is_safe and self.log_events:
-            self._log_safety_event("input", query, violations, is_safe)
+            events.append(self._log_safety_event("input", query, violations, is_safe))
 
         return {
             "safe": is_safe,
             "violations": violations,
-            "sanitized_query": validation_result.get("sanitized_input", query) if not is_safe else query
+            "sanitized_query": validation_result.get("sanitized_input", query) if not is_safe else query,
+            "safety_events": events
         }
     
-    async def _check_input_llm(self, query: str) -> Dict[str, Any]:
-        """Async helper for LLM input safety check."""
-        from src.guardrails.llm_safety_helper import check_content_safety_llm
-        return await check_content_safety_llm(
-            self.llm_client,
-            query,
-            "input",
-            self.config,
-            self.topic
-        )
-
     def check_output_safety(self, response: str, sources: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Check if output response is safe to return.
@@ -140,13 +185,15 @@ class SafetyManager:
         is_safe = len(violations) == 0
 
         # Log safety event
+        events = []
         if not is_safe and self.log_events:
-            self._log_safety_event("output", response, violations, is_safe)
+            events.append(self._log_safety_event("output", response, violations, is_safe))
 
         result = {
             "safe": is_safe,
             "violations": violations,
-            "response": response
+            "response": response,
+            "safety_events": events
         }
 
         # Apply sanitization if configured
@@ -162,17 +209,6 @@ class SafetyManager:
 
         return result
     
-    async def _check_output_llm(self, response: str) -> Dict[str, Any]:
-        """Async helper for LLM output safety check."""
-        from src.guardrails.llm_safety_helper import check_content_safety_llm
-        return await check_content_safety_llm(
-            self.llm_client,
-            response,
-            "output",
-            self.config,
-            self.topic
-        )
-
     def _sanitize_response(self, response: str, violations: List[Dict[str, Any]]) -> str:
         """
         Sanitize response by removing or redacting unsafe content.
@@ -187,7 +223,7 @@ class SafetyManager:
         content: str,
         violations: List[Dict[str, Any]],
         is_safe: bool
-    ):
+    ) -> Dict[str, Any]:
         """
         Log a safety event.
 
@@ -196,6 +232,9 @@ class SafetyManager:
             content: The content that was checked
             violations: List of violations found
             is_safe: Whether content passed safety checks
+
+        Returns:
+            The logged event
         """
         event = {
             "timestamp": datetime.now().isoformat(),
@@ -217,6 +256,8 @@ class SafetyManager:
             except Exception as e:
                 self.logger.error(f"Failed to write safety log: {e}")
 
+        return event
+
     def get_safety_events(self) -> List[Dict[str, Any]]:
         """Get all logged safety events."""
         return self.safety_events
@@ -233,12 +274,22 @@ class SafetyManager:
         output_events = sum(1 for e in self.safety_events if e["type"] == "output")
         violations = sum(1 for e in self.safety_events if not e["safe"])
 
+        screened = sum(self.tier_counts.values())
+        tiers = {
+            **self.tier_counts,
+            "fast_accept_rate": self.tier_counts["fast_accept"] / screened if screened > 0 else 0,
+            "fast_reject_rate": self.tier_counts["fast_reject"] / screened if screened > 0 else 0,
+            "escalation_rate": self.tier_counts["escalated"] / screened if screened > 0 else 0,
+        }
+
         return {
             "total_events": total,
             "input_checks": input_events,
             "output_checks": output_events,
             "violations": violations,
-            "violation_rate": violations / total if total > 0 else 0
+            "violation_rate": violations / total if total > 0 else 0,
+            "tiers": tiers,
+            "verdict_cache": self.verdict_cache.get_stats() if self.verdict_cache else None
         }
 
     def clear_events(self):
@@ -0,0 +1,210 @@
+"""
+Guardrail Verdict Cache
+In-memory cache of LLM safety verdicts.
+
+Retries, evaluation reruns and popular questions send the same text through
+the same relevance, toxicity, harm and bias checks again and again. Verdicts
+are cached under a hash of the check name, the checked content and a
+fingerprint of the safety policy (topic, prohibited categories, model,
+policy version), so changing the safety configuration never serves a verdict
+made under the old policy. Entries expire after a TTL and are evicted least
+recently used first.
+
+Only real verdicts are cached; fallbacks returned when a check failed are
+not, so a transient API error doesn't stick.
+
+Each SafetyManager owns its cache and hands it to its guardrails, so managers
+built with different policies never share verdicts.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def policy_fingerprint(config: Dict[str, Any], topic: str) -> str:
+    """
+    Hash the parts of the safety configuration that influence a verdict.
+
+    Args:
+        config: Safety configuration dictionary (with the models section merged in)
+        topic: System topic the checks are made for
+
+    Returns:
+        Short hex digest
+    """
+    relevant = {
+        "topic": topic,
+        "prohibited_categories": config.get("prohibited_categories", []),
+        "model": config.get("models", {}).get("default", {}).get("name", "gpt-4o-mini"),
+        "policy_version": config.get("policy_version", 1),
+    }
+    encoded = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class VerdictCache:
+    """
+    Thread-safe LRU cache of safety verdicts with a TTL.
+
+    Guardrail checks run both on the event loop and on worker threads, so
+    every access takes the lock.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, max_entries: int = 2000):
+        """
+        Initialize verdict cache.
+
+        Args:
+            ttl_seconds: Seconds a verdict stays valid
+            max_entries: Number of verdicts kept before LRU eviction
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Cache statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(check: str, content: str, fingerprint: str) -> str:
+        """
+        Build the cache key for a verdict.
+
+        Args:
+            check: Check name (e.g. "content_safety:input", "relevance", "bias")
+            content: Checked text (plus anything else the verdict depends on)
+            fingerprint: Safety policy fingerprint (see policy_fingerprint())
+
+        Returns:
+            Hex digest identifying the verdict
+        """
+        encoded = "\0".join([check, fingerprint, content.strip()])
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a verdict.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Copy of the cached verdict, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now - self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: str, verdict: Dict[str, Any]):
+        """
+        Store a verdict.
+
+        Args:
+            key: Key from make_key()
+            verdict: Parsed verdict of the check
+        """
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(verdict))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all cached verdicts."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and current size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0,
+            "evictions": self.evictions,
+        }
+
+
+def create_verdict_cache(config: Dict[str, Any]) -> Optional[VerdictCache]:
+    """
+    Create a verdict cache from safety.verdict_cache in config.yaml.
+
+    Args:
+        config: Safety configuration dictionary
+
+    Returns:
+        The cache, or None if it is disabled
+    """
+    cache_config = config.get("verdict_cache", {})
+    if not cache_config.get("enabled", False):
+        return None
+
+    return VerdictCache(
+        ttl_seconds=cache_config.get("ttl_seconds", 86400),
+        max_entries=cache_config.get("max_entries", 2000),
+    )
+
+
+def lookup_verdict(
+    cache: Optional[VerdictCache],
+    check: str,
+    content: str,
+    config: Dict[str, Any],
+    topic: str
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Look up a verdict.
+
+    Args:
+        cache: Verdict cache (None if caching is disabled)
+        check: Check name
+        content: Checked text (plus anything else the verdict depends on)
+        config: Safety configuration dictionary
+        topic: System topic
+
+    Returns:
+        Tuple of (key for store_verdict(), cached verdict or None); the key
+        is None if caching is disabled
+    """
+    if cache is None:
+        return None, None
+    key = cache.make_key(check, content, policy_fingerprint(config, topic))
+    return key, cache.get(key)
+
+
+def store_verdict(cache: Optional[VerdictCache], key: Optional[str], verdict: Dict[str, Any]):
+    """
+    Store a verdict under a key from lookup_verdict() (no-op if caching is disabled).
+
+    Args:
+        cache: Verdict cache passed to lookup_verdict()
+        key: Key from lookup_verdict()
+        verdict: Parsed verdict of the check
+    """
+    if cache is not None and key is not None:
+        cache.put(key, verdict)
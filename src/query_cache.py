@@ -0,0 +1,366 @@
+"""
+Query Result Cache
+Caches whole research results so repeated questions skip the agent conversation.
+
+Entries are keyed by the normalized query text, the round limit of the run
+and a fingerprint of the configuration that shapes the answer (models, agent
+prompts, tool settings, budget, safety policy), so changing the setup never
+serves stale answers and cached answers always passed the current output
+safety policy. Results are kept in SQLite
+so they survive restarts, expire after a TTL and are evicted least recently
+used first. Optionally, near-duplicate questions are matched by embedding
+similarity.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Metadata describing the run that produced a result rather than the answer;
+# on a cache hit it is moved under metadata["cached_run"]
+RUN_SPECIFIC_METADATA = (
+    "usage", "termination", "stop_reason", "team_pool_hit", "speculative_drafting",
+    "trace_id", "stage_timings",
+)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize query text so trivially different phrasings share a cache key.
+
+    Args:
+        query: Raw user query
+
+    Returns:
+        Lowercased query with collapsed whitespace and no surrounding punctuation
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.strip(" \"'`?!.")
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """
+    Hash the parts of the configuration that influence a research result.
+
+    Args:
+        config: Full configuration dictionary
+
+    Returns:
+        Short hex digest
+    """
+    relevant = {
+        "models": config.get("models", {}),
+        "agents": config.get("agents", {}),
+        "tools": config.get("tools", {}),
+        "budget": config.get("budget", {}),
+        # Cache hits skip the output safety check, so answers are only
+        # reused under the safety policy that checked them
+        "safety": config.get("safety", {}),
+        "topic": config.get("system", {}).get("topic"),
+        "orchestration_mode": config.get("system", {}).get("orchestration_mode", "round_robin"),
+    }
+    encoded = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def create_embedding_function(model: str) -> Optional[Callable[[str], List[float]]]:
+    """
+    Create an embedding function backed by the OpenAI embeddings API.
+
+    Args:
+        model: Embedding model name
+
+    Returns:
+        Function mapping text to a vector, or None if unavailable
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    try:
+        from openai import OpenAI
+    except ImportError:
+        return None
+
+    base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    client = OpenAI(api_key=api_key, base_url=base_url)
+
+    def _embed(text: str) -> List[float]:
+        response = client.embeddings.create(model=model, input=text)
+        return list(response.data[0].embedding)
+
+    return _embed
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class QueryResultCache:
+    """
+    Disk-backed cache of research results with TTL and LRU eviction.
+
+    Methods are blocking (SQLite and, for semantic lookups, an embeddings
+    API call), so async callers should run them in a worker thread.
+    """
+
+    def __init__(self, config: Dict[str, Any], embed_fn: Optional[Callable[[str], List[float]]] = None):
+        """
+        Initialize query result cache.
+
+        Args:
+            config: Full configuration dictionary (reads cache.query_results)
+            embed_fn: Optional embedding function for near-duplicate lookup
+                (defaults to the OpenAI embeddings API when semantic lookup is enabled)
+        """
+        cache_config = config.get("cache", {}).get("query_results", {})
+        semantic_config = cache_config.get("semantic", {})
+
+        self.logger = logging.getLogger("query_cache")
+        self.ttl_seconds = cache_config.get("ttl_seconds", 86400)
+        self.max_entries = cache_config.get("max_entries", 500)
+        self.fingerprint = config_fingerprint(config)
+
+        self.similarity_threshold = semantic_config.get("similarity_threshold", 0.95)
+        self.embed_fn = embed_fn
+        if self.embed_fn is None and semantic_config.get("enabled", False):
+            self.embed_fn = create_embedding_function(
+                semantic_config.get("embedding_model", "text-embedding-3-small")
+            )
+            if self.embed_fn is None:
+                self.logger.warning("Semantic cache lookup disabled: no embeddings client available")
+
+        # Embeddings computed during lookups, reused when the result is stored.
+        # Lookups whose result is never stored (errors, safety blocks) would
+        # leave theirs behind, so only the most recent ones are kept.
+        self._pending_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.max_pending_embeddings = 128
+
+        path = cache_config.get("path", "cache/query_results.sqlite")
+        if path and path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS query_results (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                normalized_query TEXT NOT NULL,
+                result TEXT NOT NULL,
+                embedding TEXT,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_query_results_access ON query_results (last_access)"
+        )
+        self._conn.commit()
+
+        # Cache statistics
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _run_fingerprint(self, max_rounds: Optional[int]) -> str:
+        """Configuration fingerprint plus the round limit of the run."""
+        return f"{self.fingerprint}:rounds={max_rounds}"
+
+    def _key(self, normalized: str, max_rounds: Optional[int] = None) -> str:
+        """Cache key for a normalized query under the current configuration and round limit."""
+        return hashlib.sha256(f"{self._run_fingerprint(max_rounds)}:{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, query: str, max_rounds: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result for a query.
+
+        Args:
+            query: Raw user query
+            max_rounds: Round limit of the run (runs with different limits don't share entries)
+
+        Returns:
+            Copy of the cached result (metadata marks the cache hit) or None
+        """
+        normalized = normalize_query(query)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("DELETE FROM query_results WHERE created_at < ?", (now - self.ttl_seconds,))
+            row = self._conn.execute(
+                "SELECT key, result FROM query_results WHERE key = ?", (self._key(normalized, max_rounds),)
+            ).fetchone()
+            if row:
+                self._touch(row[0], now)
+                self.hits += 1
+                return self._mark_hit(row[1], 1.0, query)
+
+        if self.embed_fn:
+            match = self._semantic_lookup(query, normalized, now, max_rounds)
+            if match:
+                return match
+
+        self.misses += 1
+        return None
+
+    def _semantic_lookup(
+        self,
+        query: str,
+        normalized: str,
+        now: float,
+        max_rounds: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """Find the most similar cached query above the similarity threshold."""
+        try:
+            embedding = self.embed_fn(normalized)
+        except Exception as e:
+            self.logger.warning(f"Embedding failed, skipping semantic lookup: {e}")
+            return None
+
+        with self._lock:
+            self._pending_embeddings[normalized] = embedding
+            self._pending_embeddings.move_to_end(normalized)
+            while len(self._pending_embeddings) > self.max_pending_embeddings:
+                self._pending_embeddings.popitem(last=False)
+
+            rows = self._conn.execute(
+                "SELECT key, result, embedding FROM query_results "
+                "WHERE fingerprint = ? AND embedding IS NOT NULL",
+                (self._run_fingerprint(max_rounds),),
+            ).fetchall()
+
+            best_key, best_result, best_score = None, None, 0.0
+            for key, result, stored in rows:
+                score = _cosine_similarity(embedding, json.loads(stored))
+                if score > best_score:
+                    best_key, best_result, best_score = key, result, score
+
+            if best_key and best_score >= self.similarity_threshold:
+                self._touch(best_key, now)
+                self.hits += 1
+                self.semantic_hits += 1
+                return self._mark_hit(best_result, best_score, query)
+        return None
+
+    def put(self, query: str, result: Dict[str, Any], max_rounds: Optional[int] = None):
+        """
+        Store a result for a query.
+
+        Args:
+            query: Raw user query
+            result: Result dictionary (must be JSON serializable)
+            max_rounds: Round limit of the run that produced the result
+        """
+        normalized = normalize_query(query)
+        with self._lock:
+            embedding = self._pending_embeddings.pop(normalized, None)
+        if embedding is None and self.embed_fn:
+            try:
+                embedding = self.embed_fn(normalized)
+            except Exception as e:
+                self.logger.warning(f"Embedding failed, storing without one: {e}")
+
+        try:
+            encoded = json.dumps(result, default=str)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Result not cacheable: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(normalized, max_rounds),
+                    self._run_fingerprint(max_rounds),
+                    normalized,
+                    encoded,
+                    json.dumps(embedding) if embedding else None,
+                    now,
+                    now,
+                ),
+            )
+            self.stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def _touch(self, key: str, now: float):
+        """Mark an entry as recently used."""
+        self._conn.execute("UPDATE query_results SET last_access = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries."""
+        count = self._conn.execute("SELECT COUNT(*) FROM query_results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM query_results WHERE key IN "
+                "(SELECT key FROM query_results ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    @staticmethod
+    def _mark_hit(encoded: str, similarity: float, query: str) -> Dict[str, Any]:
+        """
+        Decode a cached result and record the hit in its metadata.
+
+        Safety events of the original run are dropped, and its usage,
+        termination and timings are moved under metadata["cached_run"] so
+        they aren't mistaken for the cost of this request.
+        """
+        result = json.loads(encoded)
+        cached_query = result.get("query")
+        result["query"] = query
+        result.pop("safety_events", None)
+        metadata = result.setdefault("metadata", {})
+        metadata.pop("safety_events", None)
+        metadata["cached_run"] = {key: metadata.pop(key) for key in RUN_SPECIFIC_METADATA if key in metadata}
+        metadata["cache_hit"] = True
+        metadata["cache_similarity"] = round(similarity, 4)
+        if cached_query and cached_query != query:
+            metadata["cached_query"] = cached_query
+        return copy.deepcopy(result)
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock:
+            self._conn.execute("DELETE FROM query_results")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and current size
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM query_results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
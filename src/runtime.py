@@ -0,0 +1,330 @@
+"""
+Orchestrator Runtime
+Long-lived event loop and reusable team pool for the research orchestrator.
+
+AutoGen teams bind their internal queues to the event loop they first run on,
+so every query used to build a brand-new team on a brand-new event loop.
+This module keeps one dedicated loop thread alive for the whole process and
+a pool of pre-built, reset-able teams bound to that loop, so a query only pays
+for a team reset instead of loop startup plus team construction.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+class BackgroundLoop:
+    """
+    A dedicated asyncio event loop running forever in a daemon thread.
+
+    Synchronous callers submit coroutines with run(); coroutines running on
+    another event loop can await run_async() instead. Everything submitted
+    here shares the same loop, so loop-bound objects (AutoGen teams, HTTP
+    sessions) can be created once and reused across calls. Shutdown hooks
+    release such objects on the loop before it stops.
+    """
+
+    def __init__(self, name: str = "orchestrator-loop"):
+        """
+        Initialize background loop (the thread is started lazily).
+
+        Args:
+            name: Name of the loop thread (shown in thread dumps)
+        """
+        self.name = name
+        self.logger = logging.getLogger("runtime.loop")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running event loop (starts the thread on first access)."""
+        self.start()
+        return self._loop
+
+    def start(self):
+        """Start the loop thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            ready = threading.Event()
+            loop = asyncio.new_event_loop()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self.logger.info(f"Background event loop '{self.name}' started")
+
+    def in_loop_thread(self) -> bool:
+        """Check whether the caller is running on the loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[Any]):
+        """
+        Schedule a coroutine on the loop without waiting for it.
+
+        Returns:
+            concurrent.futures.Future for the coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Optional number of seconds to wait for the result
+
+        Returns:
+            The coroutine's result
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(
+                "BackgroundLoop.run() cannot be called from the loop thread; await the coroutine instead"
+            )
+        return self.submit(coro).result(timeout=timeout)
+
+    async def run_async(self, coro: Awaitable[Any]) -> Any:
+        """
+        Await a coroutine on the loop from any event loop.
+
+        If the caller is already on this loop the coroutine is simply awaited.
+        """
+        if self.in_loop_thread():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[None]]):
+        """
+        Register a coroutine function run on the loop when it is stopped.
+
+        Args:
+            hook: Coroutine function releasing loop-bound resources (registered once)
+        """
+        with self._lock:
+            if hook not in self._shutdown_hooks:
+                self._shutdown_hooks.append(hook)
+
+    async def run_shutdown_hooks(self):
+        """Run every shutdown hook, logging failures instead of raising."""
+        for hook in list(self._shutdown_hooks):
+            try:
+                await hook()
+            except Exception as e:
+                self.logger.warning(f"Shutdown hook {getattr(hook, '__name__', hook)} failed: {e}")
+
+    def stop(self):
+        """Run the shutdown hooks, stop the loop and wait for the thread to exit."""
+        with self._lock:
+            if self._loop is None or self._thread is None:
+                return
+            if self._thread.is_alive() and not self.in_loop_thread():
+                try:
+                    asyncio.run_coroutine_threadsafe(self.run_shutdown_hooks(), self._loop).result(timeout=5)
+                except Exception as e:
+                    self.logger.warning(f"Shutdown hooks did not finish: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+            self.logger.info(f"Background event loop '{self.name}' stopped")
+
+
+_shared_loop: Optional[BackgroundLoop] = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """
+    Get the process-wide background loop shared by the orchestrator and tools.
+
+    Returns:
+        Started BackgroundLoop instance
+    """
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = BackgroundLoop()
+            # Release loop-bound resources (HTTP sessions etc.) at interpreter exit
+            atexit.register(_shared_loop.stop)
+        _shared_loop.start()
+        return _shared_loop
+
+
+class TeamPool:
+    """
+    Pool of pre-built, reset-able research teams.
+
+    All methods must be awaited on the loop the teams are bound to.
+    Teams are handed out per query with acquire() and given back with
+    release(), which resets them so the next query starts from a clean state.
+    Teams that failed or timed out mid-run are discarded instead of reused,
+    and every team leaving the pool is closed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 2,
+        close: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize team pool.
+
+        Args:
+            factory: Callable that builds a new team
+            max_size: Maximum number of idle teams kept for reuse
+            close: Coroutine function releasing a dropped team's resources
+                (e.g. its model clients)
+        """
+        self.factory = factory
+        self.max_size = max(0, max_size)
+        self.close = close
+        self.logger = logging.getLogger("runtime.team_pool")
+
+        self._idle: Deque[Any] = deque()
+        self._in_use = 0
+
+        # Pool metrics
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.resets = 0
+        self.reset_failures = 0
+        self.discarded = 0
+        self.build_seconds = 0.0
+        self.reset_seconds = 0.0
+
+    def _build(self) -> Any:
+        """Build a new team and record construction time."""
+        start = time.perf_counter()
+        team = self.factory()
+        self.build_seconds += time.perf_counter() - start
+        self.builds += 1
+        return team
+
+    async def _drop(self, team: Any):
+        """Count a team as discarded and close it."""
+        self.discarded += 1
+        if self.close is None:
+            return
+        try:
+            await self.close(team)
+        except Exception as e:
+            self.logger.warning(f"Failed to close discarded team: {e}")
+
+    async def prewarm(self, count: int) -> int:
+        """
+        Build teams ahead of time so the first queries are pool hits.
+
+        Args:
+            count: Number of idle teams to have ready (capped at max_size)
+
+        Returns:
+            Number of teams built
+        """
+        built = 0
+        while len(self._idle) < min(count, self.max_size):
+            self._idle.append(self._build())
+            built += 1
+        if built:
+            self.logger.info(f"Prewarmed {built} research team(s)")
+        return built
+
+    async def acquire(self) -> Any:
+        """
+        Get a team for a query, building one if the pool is empty.
+
+        Returns:
+            Team instance ready to run
+        """
+        if self._idle:
+            team = self._idle.pop()
+            self.hits += 1
+        else:
+            team = self._build()
+            self.misses += 1
+        self._in_use += 1
+        return team
+
+    async def release(self, team: Any):
+        """
+        Reset a team after a successful run and return it to the pool.
+
+        Args:
+            team: Team previously returned by acquire()
+        """
+        self._in_use = max(0, self._in_use - 1)
+        if len(self._idle) >= self.max_size:
+            await self._drop(team)
+            return
+
+        start = time.perf_counter()
+        try:
+            await team.reset()
+        except Exception as e:
+            self.reset_failures += 1
+            self.logger.warning(f"Failed to reset team, discarding it: {e}")
+            await self._drop(team)
+            return
+        finally:
+            self.reset_seconds += time.perf_counter() - start
+
+        self.resets += 1
+        self._idle.append(team)
+
+    async def discard(self, team: Any):
+        """
+        Drop a team whose state can no longer be trusted (error or timeout).
+
+        Args:
+            team: Team previously returned by acquire()
+        """
+        self._in_use = max(0, self._in_use - 1)
+        await self._drop(team)
+
+    async def clear(self):
+        """Drop and close all idle teams."""
+        while self._idle:
+            await self._drop(self._idle.pop())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and build/reset timings
+        """
+        acquisitions = self.hits + self.misses
+        return {
+            "max_size": self.max_size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / acquisitions if acquisitions > 0 else 0,
+            "builds": self.builds,
+            "resets": self.resets,
+            "reset_failures": self.reset_failures,
+            "discarded": self.discarded,
+            "avg_build_ms": (self.build_seconds / self.builds * 1000) if self.builds else 0.0,
+            "avg_reset_ms": (self.reset_seconds / self.resets * 1000) if self.resets else 0.0,
+            "total_reset_ms": self.reset_seconds * 1000,
+        }
@@ -0,0 +1,97 @@
+"""
+Shared HTTP Client Pool
+Process-wide, connection-pooled HTTP clients for the search providers.
+
+Creating an HTTP client per search means a fresh DNS lookup, TCP connect and
+TLS handshake on every tool call. This module keeps one aiohttp ClientSession
+per event loop (sessions are bound to the loop they were created on) with
+keep-alive, DNS caching and per-host limits, shared by all providers.
+
+Settings come from the tools.http section of config.yaml via
+configure_http_pool().
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict
+
+DEFAULT_HTTP_SETTINGS = {
+    "max_connections": 100,  # Total open connections per event loop
+    "max_connections_per_host": 10,
+    "dns_cache_seconds": 300,
+    "keepalive_seconds": 30,
+    "timeout_seconds": 30,
+}
+
+_settings: Dict[str, Any] = dict(DEFAULT_HTTP_SETTINGS)
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_stats = {"sessions_created": 0, "session_reuses": 0}
+
+
+def configure_http_pool(config: Dict[str, Any]):
+    """
+    Apply pool settings from config.yaml (tools.http).
+
+    Only affects sessions created afterwards.
+
+    Args:
+        config: Full configuration dictionary
+    """
+    http_config = config.get("tools", {}).get("http", {})
+    with _lock:
+        _settings.update({key: value for key, value in http_config.items() if key in DEFAULT_HTTP_SETTINGS})
+
+
+async def get_http_session():
+    """
+    Get the shared aiohttp session for the running event loop.
+
+    Returns:
+        aiohttp.ClientSession (do not close it, it is reused by every caller)
+    """
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = _sessions.get(loop)
+        if session is not None and not session.closed:
+            _stats["session_reuses"] += 1
+            return session
+
+        connector = aiohttp.TCPConnector(
+            limit=_settings["max_connections"],
+            limit_per_host=_settings["max_connections_per_host"],
+            ttl_dns_cache=_settings["dns_cache_seconds"],
+            keepalive_timeout=_settings["keepalive_seconds"],
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=_settings["timeout_seconds"]),
+        )
+        _sessions[loop] = session
+        _stats["sessions_created"] += 1
+        return session
+
+
+async def close_http_session():
+    """Close the shared session of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """
+    Get shared session statistics.
+
+    Returns:
+        Dictionary with session creation and reuse counts
+    """
+    with _lock:
+        stats = dict(_stats)
+        stats["open_sessions"] = sum(1 for session in _sessions.values() if not session.closed)
+    return stats
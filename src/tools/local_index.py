@@ -0,0 +1,310 @@
+"""
+Local Search Index
+Full-text index of every paper and web page the search tools have retrieved.
+
+Every research session used to start from zero even though earlier sessions
+had already retrieved thousands of abstracts and snippets. The search tools
+now add their results to a local SQLite FTS5 index as a side effect and
+query it first: when enough indexed documents cover the query terms, they
+are returned immediately (ranked by BM25) and the network is skipped.
+
+Coverage is judged per document as the share of query terms it contains, so
+a handful of loosely related hits doesn't stop a real search.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from",
+    "how", "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "what",
+    "when", "where", "which", "who", "why", "with", "about", "into", "vs", "versus",
+}
+
+
+def _query_terms(query: str) -> List[str]:
+    """Significant lowercase terms of a query, in order, without duplicates."""
+    terms = [term for term in re.findall(r"\w+", query.lower()) if len(term) > 1 and term not in _STOPWORDS]
+    return list(dict.fromkeys(terms))
+
+
+def _stem(term: str) -> str:
+    """Crude suffix stripping so "models"/"modeling" count as covering "model"."""
+    for suffix in ("ing", "ies", "es", "ed", "s"):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+            return term[:-len(suffix)]
+    return term
+
+
+class LocalSearchIndex:
+    """
+    SQLite FTS5 index of retrieved papers and web results.
+
+    Like the search cache, calls are blocking sqlite I/O that the search
+    tools run through asyncio.to_thread().
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = "cache/local_index.sqlite",
+        min_hits: int = 3,
+        min_term_coverage: float = 0.75,
+        max_web_age_seconds: Optional[int] = 7 * 86400,
+        max_documents: int = 50000,
+    ):
+        """
+        Initialize local search index.
+
+        Args:
+            path: SQLite database file (None or ":memory:" for an in-memory index)
+            min_hits: Local hits needed to skip the network (capped at the requested result count)
+            min_term_coverage: Share of query terms a document must contain to count as a hit
+            max_web_age_seconds: Web results older than this are not served (None to keep forever)
+            max_documents: Documents kept before the oldest are dropped
+        """
+        self.logger = logging.getLogger("tools.local_index")
+        self.min_hits = max(1, min_hits)
+        self.min_term_coverage = min_term_coverage
+        self.max_web_age_seconds = max_web_age_seconds
+        self.max_documents = max_documents
+
+        if path and path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                data TEXT NOT NULL,
+                year INTEGER,
+                citation_count INTEGER,
+                added_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+            "doc_id UNINDEXED, title, body, tokenize='porter unicode61')"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_added ON documents (added_at)")
+        self._conn.commit()
+
+        # Statistics
+        self.local_hits = 0
+        self.fallbacks = 0
+        self.documents_added = 0
+
+    def add_papers(self, papers: List[Dict[str, Any]]):
+        """
+        Index papers returned by the paper search tool.
+
+        Args:
+            papers: Papers in PaperSearchTool's standard format
+        """
+        documents = []
+        for paper in papers:
+            if not paper.get("paper_id") or not paper.get("title"):
+                continue
+            authors = " ".join(a.get("name") or "" for a in paper.get("authors", []))
+            body = " ".join(filter(None, [paper.get("abstract"), authors, paper.get("venue")]))
+            documents.append((
+                f"paper:{paper['paper_id']}", "paper", paper, paper["title"], body,
+                paper.get("year"), paper.get("citation_count") or 0,
+            ))
+        self._add(documents)
+
+    def add_web_results(self, results: List[Dict[str, Any]]):
+        """
+        Index results returned by the web search tool.
+
+        Args:
+            results: Results in WebSearchTool's standard format
+        """
+        from src.tools.web_search import normalize_url
+
+        documents = []
+        for result in results:
+            if not result.get("url"):
+                continue
+            # Provider attribution belongs to the original search, not the index
+            result = {key: value for key, value in result.items() if key != "providers"}
+            documents.append((
+                f"web:{normalize_url(result['url'])}", "web", result, result.get("title", ""),
+                result.get("snippet", ""), None, None,
+            ))
+        self._add(documents)
+
+    def _add(self, documents: List[Tuple[str, str, Dict[str, Any], str, str, Optional[int], Optional[int]]]):
+        """Insert or replace documents in the table and the full-text index."""
+        if not documents:
+            return
+        now = time.time()
+        with self._lock:
+            for doc_id, kind, data, title, body, year, citation_count in documents:
+                self._conn.execute("DELETE FROM documents_fts WHERE doc_id = ?", (doc_id,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc_id, kind, json.dumps(data, default=str), year, citation_count, now),
+                )
+                self._conn.execute(
+                    "INSERT INTO documents_fts (doc_id, title, body) VALUES (?, ?, ?)",
+                    (doc_id, title, body),
+                )
+            self.documents_added += len(documents)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop the oldest documents beyond max_documents."""
+        count = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        excess = count - self.max_documents
+        if excess > 0:
+            oldest = [
+                row[0] for row in self._conn.execute(
+                    "SELECT doc_id FROM documents ORDER BY added_at ASC LIMIT ?", (excess,)
+                )
+            ]
+            self._conn.executemany("DELETE FROM documents WHERE doc_id = ?", [(d,) for d in oldest])
+            self._conn.executemany("DELETE FROM documents_fts WHERE doc_id = ?", [(d,) for d in oldest])
+
+    def search_papers(
+        self,
+        query: str,
+        limit: int,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        min_citations: int = 0
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a paper search from the index if coverage is sufficient.
+
+        Args:
+            query: Search query
+            limit: Maximum number of papers
+            year_from: Minimum publication year
+            year_to: Maximum publication year
+            min_citations: Minimum citation count
+
+        Returns:
+            Papers ranked by BM25, or None if the network should be searched
+        """
+        filters, params = ["d.kind = 'paper'"], []
+        if year_from:
+            filters.append("d.year >= ?")
+            params.append(year_from)
+        if year_to:
+            filters.append("d.year <= ?")
+            params.append(year_to)
+        if min_citations:
+            filters.append("d.citation_count >= ?")
+            params.append(min_citations)
+        return self._search(query, limit, filters, params)
+
+    def search_web(self, query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a web search from the index if coverage is sufficient.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+
+        Returns:
+            Web results ranked by BM25, or None if the network should be searched
+        """
+        filters, params = ["d.kind = 'web'"], []
+        if self.max_web_age_seconds is not None:
+            filters.append("d.added_at >= ?")
+            params.append(time.time() - self.max_web_age_seconds)
+        return self._search(query, limit, filters, params)
+
+    def _search(self, query: str, limit: int, filters: List[str], params: List[Any]) -> Optional[List[Dict[str, Any]]]:
+        """Run a BM25 query and keep documents covering enough query terms."""
+        terms = _query_terms(query)
+        if not terms or limit <= 0:
+            return None
+        match = " OR ".join(f'"{term}"' for term in terms)
+        needed = min(self.min_hits, limit)
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.data, f.title, f.body FROM documents_fts f "
+                "JOIN documents d ON d.doc_id = f.doc_id "
+                f"WHERE documents_fts MATCH ? AND {' AND '.join(filters)} "
+                "ORDER BY bm25(documents_fts, 5.0, 1.0) LIMIT ?",
+                [match, *params, limit * 4],
+            ).fetchall()
+
+        stems = {_stem(term) for term in terms}
+        hits = []
+        for data, title, body in rows:
+            words = {_stem(word) for word in re.findall(r"\w+", f"{title} {body}".lower())}
+            if len(stems & words) / len(stems) >= self.min_term_coverage:
+                hits.append(json.loads(data))
+                if len(hits) == limit:
+                    break
+
+        if len(hits) < needed:
+            self.fallbacks += 1
+            return None
+        self.local_hits += 1
+        return hits
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with document counts and how often the network was skipped
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind").fetchall())
+        lookups = self.local_hits + self.fallbacks
+        return {
+            "papers": counts.get("paper", 0),
+            "web_pages": counts.get("web", 0),
+            "local_hits": self.local_hits,
+            "fallbacks": self.fallbacks,
+            "local_hit_rate": self.local_hits / lookups if lookups > 0 else 0,
+        }
+
+
+_local_index: Optional[LocalSearchIndex] = None
+
+
+def configure_local_index(config: Dict[str, Any]) -> Optional[LocalSearchIndex]:
+    """
+    Configure the process-wide local index from tools.local_index in config.yaml.
+
+    Args:
+        config: Full configuration dictionary
+
+    Returns:
+        The configured index, or None if it is disabled
+    """
+    global _local_index
+    index_config = config.get("tools", {}).get("local_index", {})
+    if not index_config.get("enabled", False):
+        _local_index = None
+        return None
+
+    _local_index = LocalSearchIndex(
+        path=index_config.get("path", "cache/local_index.sqlite"),
+        min_hits=index_config.get("min_hits", 3),
+        min_term_coverage=index_config.get("min_term_coverage", 0.75),
+        max_web_age_seconds=index_config.get("max_web_age_seconds", 7 * 86400),
+        max_documents=index_config.get("max_documents", 50000),
+    )
+    return _local_index
+
+
+def get_local_index() -> Optional[LocalSearchIndex]:
+    """Get the process-wide local index (None until configure_local_index() enables it)."""
+    return _local_index
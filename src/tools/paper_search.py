@@ -4,13 +4,33 @@ Integrates with Semantic Scholar API for academic paper search.
 
 This tool provides academic paper search functionality using the
 Semantic Scholar API, which offers free access to a large corpus
-of academic papers.
+of academic papers. The Graph API is called directly on the shared
+aiohttp session so searches never block the event loop.
 """
 
 from typing import List, Dict, Any, Optional
+import asyncio
 import os
 import logging
-import asyncio
+
+from src.runtime import get_background_loop
+from src.tools.http_pool import get_http_session
+from src.tools.local_index import get_local_index
+from src.tools.rate_limiter import check_response, get_rate_limiter
+from src.tools.search_cache import SearchResultCache, get_search_cache
+from src.tools.singleflight import search_flight
+from src.tools.source_registry import clip, get_source_registry, get_tool_output_settings
+
+PROVIDER = "semantic_scholar"
+SEMANTIC_SCHOLAR_API_URL = "https://api.semanticscholar.org/graph/v1"
+
+# Maximum IDs per /paper/batch request
+BATCH_SIZE = 500
+
+DEFAULT_PAPER_FIELDS = [
+    "paperId", "title", "authors", "year", "abstract",
+    "citationCount", "url", "venue", "openAccessPdf"
+]
 
 
 class PaperSearchTool:
@@ -73,36 +93,64 @@ class PaperSearchTool:
         """
         self.logger.info(f"Searching papers: {query}")
 
+        # Define fields to retrieve
+        fields = kwargs.get("fields", DEFAULT_PAPER_FIELDS)
+
+        cache = get_search_cache()
+        params = {
+            "max_results": self.max_results,
+            "year_from": year_from,
+            "year_to": year_to,
+            "min_citations": min_citations,
+            "fields": sorted(fields),
+        }
+        index = get_local_index()
+        if index and not (cache and cache.offline):
+            local = await asyncio.to_thread(
+                index.search_papers, query, self.max_results, year_from, year_to, min_citations
+            )
+            if local is not None:
+                self.logger.info(f"Local index hit ({len(local)} papers)")
+                return local
+        if cache:
+            cached = await asyncio.to_thread(cache.get, PROVIDER, query, params)
+            if cached is not None:
+                self.logger.info(f"Search cache hit ({len(cached)} papers)")
+                return cached
+            if cache.offline:
+                self.logger.info("Offline mode: search not cached, returning empty results")
+                return []
+
+        # Identical searches already in flight (e.g. from concurrent queries) are joined
+        return await search_flight.do(
+            SearchResultCache.make_key(PROVIDER, query, params),
+            lambda: self._fetch(query, params, fields, year_from, year_to, min_citations),
+        )
+
+    async def _fetch(
+        self,
+        query: str,
+        params: Dict[str, Any],
+        fields: List[str],
+        year_from: Optional[int],
+        year_to: Optional[int],
+        min_citations: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Call the search endpoint, then filter and cache the papers.
+        """
         try:
-            from semanticscholar import SemanticScholar
-            
-            # Initialize Semantic Scholar client
-            sch = SemanticScholar(api_key=self.api_key)
-            
-            # Define fields to retrieve
-            fields = kwargs.get("fields", [
-                "paperId", "title", "authors", "year", "abstract",
-                "citationCount", "url", "venue", "openAccessPdf"
-            ])
-            
-            # Perform search with strict limit
-            # Note: search_paper returns an iterator, so we need to limit it
-            results = sch.search_paper(
-                query, 
-                limit=min(self.max_results, 50),  # Cap at 50 to avoid excessive API calls
-                fields=fields
+            # Single page request, capped at 50 to avoid excessive API calls
+            response = await self._request_json(
+                "/paper/search",
+                {
+                    "query": query,
+                    "limit": min(self.max_results, 50),
+                    "fields": ",".join(fields),
+                },
             )
-            
-            # Convert iterator to list and limit immediately
-            # This prevents the library from fetching more than needed
-            results_list = []
-            count = 0
-            for paper in results:
-                if count >= self.max_results:
-                    break
-                results_list.append(paper)
-                count += 1
-            
+            results_list = response.get("data", [])[:self.max_results]
+
             # Parse and filter results
             papers = self._parse_results(results_list, year_from, year_to, min_citations)
             
@@ -110,10 +158,16 @@ class PaperSearchTool:
             papers = papers[:self.max_results]
             
             self.logger.info(f"Found {len(papers)} papers (limited to {self.max_results})")
+            cache = get_search_cache()
+            if cache and papers:
+                await asyncio.to_thread(cache.put, PROVIDER, query, params, papers)
+            index = get_local_index()
+            if index and papers:
+                await asyncio.to_thread(index.add_papers, papers)
             return papers
             
         except ImportError:
-            self.logger.error("semanticscholar library not installed. Run: pip install semanticscholar")
+            self.logger.error("aiohttp not installed. Run: pip install aiohttp")
             return []
         except Exception as e:
             self.logger.error(f"Error searching papers: {e}")
@@ -130,22 +184,8 @@ class PaperSearchTool:
             Detailed paper information
         """
         try:
-            from semanticscholar import SemanticScholar
-            
-            sch = SemanticScholar(api_key=self.api_key)
-            paper = sch.get_paper(paper_id)
-            
-            return {
-                "paper_id": paper.paperId,
-                "title": paper.title,
-                "authors": [{"name": a.name} for a in paper.authors] if paper.authors else [],
-                "year": paper.year,
-                "abstract": paper.abstract,
-                "citation_count": paper.citationCount,
-                "url": paper.url,
-                "venue": paper.venue,
-                "pdf_url": paper.openAccessPdf.get("url") if paper.openAccessPdf else None,
-            }
+            paper = await self._request_json(f"/paper/{paper_id}", {"fields": ",".join(DEFAULT_PAPER_FIELDS)})
+            return self._paper_to_dict(paper)
         except Exception as e:
             self.logger.error(f"Error getting paper details: {e}")
             return {}
@@ -162,17 +202,17 @@ class PaperSearchTool:
             List of citing papers
         """
         try:
-            from semanticscholar import SemanticScholar
-            
-            sch = SemanticScholar(api_key=self.api_key)
-            paper = sch.get_paper(paper_id)
-            citations = paper.citations[:limit] if paper.citations else []
+            response = await self._request_json(
+                f"/paper/{paper_id}/citations",
+                {"fields": "paperId,title,year", "limit": limit},
+            )
+            citations = [item.get("citingPaper") or {} for item in response.get("data", [])][:limit]
             
             return [
                 {
-                    "paper_id": c.paperId,
-                    "title": c.title,
-                    "year": c.year,
+                    "paper_id": c.get("paperId"),
+                    "title": c.get("title"),
+                    "year": c.get("year"),
                 }
                 for c in citations
             ]
@@ -192,17 +232,17 @@ class PaperSearchTool:
             List of referenced papers
         """
         try:
-            from semanticscholar import SemanticScholar
-            
-            sch = SemanticScholar(api_key=self.api_key)
-            paper = sch.get_paper(paper_id)
-            references = paper.references[:limit] if paper.references else []
+            response = await self._request_json(
+                f"/paper/{paper_id}/references",
+                {"fields": "paperId,title,year", "limit": limit},
+            )
+            references = [item.get("citedPaper") or {} for item in response.get("data", [])][:limit]
             
             return [
                 {
-                    "paper_id": r.paperId,
-                    "title": r.title,
-                    "year": r.year,
+                    "paper_id": r.get("paperId"),
+                    "title": r.get("title"),
+                    "year": r.get("year"),
                 }
                 for r in references
             ]
@@ -210,6 +250,160 @@ class PaperSearchTool:
             self.logger.error(f"Error getting references: {e}")
             return []
 
+    async def get_papers_batch(
+        self,
+        paper_ids: List[str],
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get details for many papers with Semantic Scholar's batch endpoint.
+
+        Resolves up to BATCH_SIZE IDs per request (larger lists are split
+        into chunks that are sent concurrently) instead of one request per paper.
+
+        Args:
+            paper_ids: Semantic Scholar paper IDs (or any ID format the API accepts)
+            fields: Fields to retrieve (defaults to DEFAULT_PAPER_FIELDS)
+
+        Returns:
+            Papers in the order of paper_ids, skipping IDs the API doesn't know
+        """
+        # Drop duplicates, keep order
+        paper_ids = list(dict.fromkeys(pid for pid in paper_ids if pid))
+        if not paper_ids:
+            return []
+
+        params = {"fields": ",".join(fields or DEFAULT_PAPER_FIELDS)}
+        chunks = [paper_ids[i:i + BATCH_SIZE] for i in range(0, len(paper_ids), BATCH_SIZE)]
+        responses = await asyncio.gather(
+            *(self._request_json("/paper/batch", params, payload={"ids": chunk}) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+        papers = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"Error getting paper batch of {len(chunk)}: {response}")
+                continue
+            # The batch endpoint returns one entry per ID, null for unknown IDs
+            papers.extend(self._paper_to_dict(paper) for paper in response if paper)
+        return papers
+
+    async def expand_citation_graph(
+        self,
+        seed_ids: List[str],
+        hops: int = 1,
+        direction: str = "both",
+        limit_per_paper: int = 10,
+        max_papers: int = 50,
+        max_concurrency: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Expand the citation graph around seed papers.
+
+        Each hop fetches the citations and/or references of every paper in
+        the frontier concurrently (at most max_concurrency requests at a time),
+        then metadata for every discovered paper is fetched in batches.
+
+        Args:
+            seed_ids: Paper IDs to start from
+            hops: Number of hops to expand
+            direction: "citations", "references" or "both"
+            limit_per_paper: Maximum citations/references fetched per paper and direction
+            max_papers: Maximum number of papers discovered (seeds excluded)
+            max_concurrency: Maximum concurrent API requests
+
+        Returns:
+            Dictionary with:
+            - papers: metadata of seeds and discovered papers
+            - edges: list of {"source", "target"} where source cites target
+            - hops: number of hops actually expanded
+        """
+        if direction not in ("citations", "references", "both"):
+            raise ValueError(f"Unknown direction: {direction}")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _limited(fetch, paper_id: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await fetch(paper_id, limit=limit_per_paper)
+
+        async def _no_papers() -> List[Dict[str, Any]]:
+            return []
+
+        async def _neighbors(paper_id: str):
+            citations, references = await asyncio.gather(
+                _limited(self.get_citations, paper_id) if direction != "references" else _no_papers(),
+                _limited(self.get_references, paper_id) if direction != "citations" else _no_papers(),
+            )
+            return paper_id, citations, references
+
+        seeds = list(dict.fromkeys(seed_ids))
+        seen = list(seeds)
+        seen_set = set(seen)
+        edges = set()
+        frontier = list(seen)
+        hops_done = 0
+
+        while frontier and hops_done < hops and len(seen) - len(seeds) < max_papers:
+            hops_done += 1
+            next_frontier = []
+            for paper_id, citations, references in await asyncio.gather(*(_neighbors(p) for p in frontier)):
+                linked = [(c["paper_id"], c["paper_id"], paper_id) for c in citations]
+                linked += [(r["paper_id"], paper_id, r["paper_id"]) for r in references]
+                for neighbor, source, target in linked:
+                    if not neighbor:
+                        continue
+                    edges.add((source, target))
+                    if neighbor in seen_set or len(seen) - len(seeds) >= max_papers:
+                        continue
+                    seen.append(neighbor)
+                    seen_set.add(neighbor)
+                    next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        papers = await self.get_papers_batch(seen)
+        return {
+            "papers": papers,
+            "edges": [{"source": source, "target": target} for source, target in sorted(edges)],
+            "hops": hops_done,
+        }
+
+    async def _request_json(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        payload: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Call a Semantic Scholar Graph API endpoint on the shared HTTP session.
+
+        Requests are paced and retried by the shared Semantic Scholar limiter.
+
+        Args:
+            path: Endpoint path relative to the Graph API root
+            params: Query parameters
+            payload: JSON body (sends a POST instead of a GET)
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            ProviderError: If the API returns an error status (after retries)
+            CircuitOpenError: If the API has been failing repeatedly
+        """
+        headers = {"x-api-key": self.api_key} if self.api_key else {}
+        method = "POST" if payload is not None else "GET"
+        url = f"{SEMANTIC_SCHOLAR_API_URL}{path}"
+
+        async def _request():
+            session = await get_http_session()
+            async with session.request(method, url, params=params, json=payload, headers=headers) as response:
+                check_response(PROVIDER, response)
+                return await response.json()
+
+        return await get_rate_limiter(PROVIDER).call(_request)
+
     def _parse_results(
         self,
         results: Any,
@@ -221,7 +415,7 @@ class PaperSearchTool:
         Parse and filter search results from Semantic Scholar.
         
         Args:
-            results: List of paper objects from Semantic Scholar API (already limited)
+            results: List of paper JSON objects from the Semantic Scholar API (already limited)
             year_from: Minimum year filter
             year_to: Maximum year filter
             min_citations: Minimum citation count filter
@@ -231,25 +425,11 @@ class PaperSearchTool:
         """
         papers = []
         
-        # results should already be a list (not an iterator) after our fix
         for paper in results:
             # Skip papers without basic metadata
-            if not paper or not hasattr(paper, 'title'):
+            if not paper or not paper.get("title"):
                 continue
-                
-            paper_dict = {
-                "paper_id": paper.paperId if hasattr(paper, 'paperId') else None,
-                "title": paper.title if hasattr(paper, 'title') else "Unknown",
-                "authors": [{"name": a.name} for a in paper.authors] if hasattr(paper, 'authors') and paper.authors else [],
-                "year": paper.year if hasattr(paper, 'year') else None,
-                "abstract": paper.abstract if hasattr(paper, 'abstract') else "",
-                "citation_count": paper.citationCount if hasattr(paper, 'citationCount') else 0,
-                "url": paper.url if hasattr(paper, 'url') else "",
-                "venue": paper.venue if hasattr(paper, 'venue') else "",
-                "pdf_url": paper.openAccessPdf.get("url") if hasattr(paper, 'openAccessPdf') and paper.openAccessPdf else None,
-            }
-            
-            papers.append(paper_dict)
+            papers.append(self._paper_to_dict(paper))
         
         # Apply filters
         papers = self._filter_by_year(papers, year_from, year_to)
@@ -257,6 +437,21 @@ class PaperSearchTool:
         
         return papers
 
+    def _paper_to_dict(self, paper: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Semantic Scholar paper JSON object into the standard format."""
+        open_access_pdf = paper.get("openAccessPdf") or {}
+        return {
+            "paper_id": paper.get("paperId"),
+            "title": paper.get("title") or "Unknown",
+            "authors": [{"name": a.get("name")} for a in paper.get("authors") or []],
+            "year": paper.get("year"),
+            "abstract": paper.get("abstract") or "",
+            "citation_count": paper.get("citationCount") or 0,
+            "url": paper.get("url") or "",
+            "venue": paper.get("venue") or "",
+            "pdf_url": open_access_pdf.get("url"),
+        }
+
     def _filter_by_year(
         self,
         papers: List[Dict[str, Any]],
@@ -280,38 +475,30 @@ class PaperSearchTool:
         return [p for p in papers if p.get("citation_count", 0) >= min_citations]
 
 
-# Synchronous wrapper for use with AutoGen tools
-def paper_search(query: str, max_results: int = 10, year_from: Optional[int] = None) -> str:
+async def paper_search_async(query: str, max_results: int = 10, year_from: Optional[int] = None) -> str:
     """
-    Synchronous wrapper for paper search (for AutoGen tool integration).
-    
+    Async paper search (registered as the agents' paper_search tool).
+
+    Runs directly on the caller's event loop, so a tool call needs no extra
+    thread or event loop.
+
     Args:
         query: Search query
         max_results: Maximum results to return
         year_from: Only return papers from this year onwards
-        
+
     Returns:
         Formatted string with paper results
     """
     tool = PaperSearchTool(max_results=max_results)
-    # Handle both sync and async contexts
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If we're in an async context, create a new event loop in a thread
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(_run_async_in_thread, tool.search(query, year_from=year_from))
-                results = future.result()
-        else:
-            results = loop.run_until_complete(tool.search(query, year_from=year_from))
-    except RuntimeError:
-        # No event loop exists, create a new one
-        results = asyncio.run(tool.search(query, year_from=year_from))
+    results = await tool.search(query, year_from=year_from)
     
     if not results:
         return "No academic papers found."
     
+    if get_tool_output_settings()["format"] == "compact":
+        return _format_compact(query, results)
+    
     # Format results as readable text
     output = f"Found {len(results)} academic papers for '{query}':\n\n"
     
@@ -337,12 +524,46 @@ def paper_search(query: str, max_results: int = 10, year_from: Optional[int] = N
     return output
 
 
-def _run_async_in_thread(coro):
-    """Helper to run async code in a new event loop in a thread."""
-    import asyncio
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+def _format_compact(query: str, results: List[Dict[str, Any]]) -> str:
+    """
+    One terse line per paper, tagged with its source ID.
+
+    Inside a query the URL is left out (it is kept in the source registry
+    and added to the final reference list); without a registry the URL is
+    kept so the output stays usable on its own.
+    """
+    registry = get_source_registry()
+    snippet_chars = get_tool_output_settings()["snippet_chars"]
+    lines = [f"papers '{query}': {len(results)} results"]
+    for i, paper in enumerate(results, 1):
+        source_id = registry.register("paper", paper) if registry is not None else f"P{i}"
+        authors = paper.get("authors") or []
+        byline = authors[0]["name"] + (" et al." if len(authors) > 1 else "") if authors else "n.a."
+        details = [byline, str(paper.get("year") or "n.d."), f"{paper.get('citation_count', 0)} cites"]
+        if paper.get("venue"):
+            details.append(clip(paper["venue"], 40))
+        if registry is None and paper.get("url"):
+            details.append(paper["url"])
+        line = f"[{source_id}] {clip(paper.get('title'), 100)} ({'; '.join(details)})"
+        if paper.get("abstract"):
+            line += f": {clip(paper['abstract'], snippet_chars)}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def paper_search(query: str, max_results: int = 10, year_from: Optional[int] = None) -> str:
+    """
+    Synchronous wrapper for paper search, for callers without an event loop.
+
+    The search runs on the shared background loop, reusing its HTTP session.
+    Async code should await paper_search_async() instead.
+    
+    Args:
+        query: Search query
+        max_results: Maximum results to return
+        year_from: Only return papers from this year onwards
+        
+    Returns:
+        Formatted string with paper results
+    """
+    return get_background_loop().run(paper_search_async(query, max_results=max_results, year_from=year_from))
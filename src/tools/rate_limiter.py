@@ -0,0 +1,406 @@
+"""
+Provider Rate Limiting
+Token buckets, retries and circuit breakers for the external search APIs.
+
+Semantic Scholar's anonymous limits and the Tavily/Brave quotas used to show
+up as silently empty results: the first 429 was caught and [] returned.
+Every provider now has one ProviderLimiter, shared by all tool instances,
+that:
+
+- Paces requests with a token bucket whose rate adapts to the provider:
+  halved on every 429, then recovered step by step on success
+- Retries 429s, 5xx responses and connection errors with jittered
+  exponential backoff, honoring Retry-After (which also pauses the bucket
+  for every other caller)
+- Opens a circuit breaker after repeated failures, so calls fail fast
+  instead of piling up while the provider is down
+
+Limits come from the tools.rate_limits section of config.yaml.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+DEFAULT_RATE_LIMITS = {
+    "tavily": {"requests_per_second": 5.0, "burst": 5},
+    "brave": {"requests_per_second": 1.0, "burst": 1},
+    "semantic_scholar": {"requests_per_second": 1.0, "burst": 3},
+}
+
+
+class ProviderError(Exception):
+    """A provider request failed with an HTTP error status."""
+
+    def __init__(self, provider: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"{provider} API error: {status}")
+        self.provider = provider
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Whether retrying can succeed (rate limited or server error)."""
+        return self.status == 429 or self.status >= 500
+
+
+class CircuitOpenError(Exception):
+    """The provider's circuit breaker is open, the request was not sent."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delay in seconds or an HTTP date).
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def check_response(provider: str, response: Any):
+    """
+    Raise ProviderError for a non-200 aiohttp response.
+
+    Args:
+        provider: Provider name
+        response: aiohttp.ClientResponse
+    """
+    if response.status != 200:
+        raise ProviderError(provider, response.status, parse_retry_after(response.headers.get("Retry-After")))
+
+
+class TokenBucket:
+    """
+    Token bucket with an adjustable refill rate.
+
+    Works across event loops and threads (state is guarded by a lock, waiting
+    uses asyncio.sleep on the caller's loop).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize token bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens accumulated since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated provider failures.
+
+    Closed: requests flow. Open: requests are rejected until reset_seconds
+    have passed. Half-open: one trial request decides whether to close again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.times_opened = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """Give up a half-open trial without a verdict (e.g. the request was cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at the threshold or on a failed trial."""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class ProviderLimiter:
+    """Rate limiting, retries and circuit breaking for one provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_second: float = 1.0,
+        burst: int = 1,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+    ):
+        """
+        Initialize provider limiter.
+
+        Args:
+            provider: Provider name
+            requests_per_second: Sustained request rate (the ceiling of the adaptive rate)
+            burst: Requests that may be sent back to back
+            max_retries: Retries after the first attempt
+            base_delay: First backoff delay in seconds
+            max_delay: Longest backoff or Retry-After the limiter will wait
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open
+        """
+        self.provider = provider
+        self.max_rate = requests_per_second
+        self.min_rate = requests_per_second / 16
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.logger = logging.getLogger(f"tools.rate_limiter.{provider}")
+
+        self._stats = {"requests": 0, "retries": 0, "throttled": 0, "failures": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run one provider request with pacing, retries and circuit breaking.
+
+        Args:
+            fn: Zero-argument coroutine function sending the request; it should
+                raise ProviderError for HTTP errors (see check_response())
+
+        Returns:
+            Result of fn()
+
+        Raises:
+            CircuitOpenError: The circuit is open
+            ProviderError: Non-retryable error, or retries exhausted
+        """
+        import aiohttp
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                self._count("rejected")
+                raise CircuitOpenError(f"{self.provider} circuit open after repeated failures")
+
+            # Every outcome must reach the breaker, or a half-open trial would
+            # stay in flight and reject all later calls
+            resolved = False
+            try:
+                await self.bucket.acquire()
+                self._count("requests")
+                result = await fn()
+            except ProviderError as e:
+                resolved = True
+                if not e.retryable:
+                    # Client errors (bad key, bad request, not found) are not the
+                    # provider's fault, and show that it is up
+                    self.breaker.record_success()
+                    raise
+                delay = self._on_failure(e.status == 429, attempt, e.retry_after)
+                if delay is None:
+                    raise
+                self.logger.warning(f"{e}, retrying in {delay:.1f}s")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                resolved = True
+                delay = self._on_failure(False, attempt, None)
+                if delay is None:
+                    raise
+                self.logger.warning(f"{self.provider} request failed ({type(e).__name__}: {e}), retrying in {delay:.1f}s")
+            except Exception:
+                resolved = True
+                self.breaker.record_failure()
+                self._count("failures")
+                raise
+            else:
+                resolved = True
+                self._on_success()
+                return result
+            finally:
+                if not resolved:
+                    # Cancelled (e.g. a hedged search that already has its
+                    # results): no verdict on the provider, but free the trial
+                    self.breaker.release_trial()
+
+            self._count("retries")
+            await asyncio.sleep(delay)
+
+    def _on_failure(self, throttled: bool, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """
+        Record a retryable failure and pick the delay before the next attempt.
+
+        Returns:
+            Seconds to wait, or None to give up
+        """
+        self.breaker.record_failure()
+        self._count("failures")
+        if throttled:
+            self._count("throttled")
+            # Multiplicative decrease of the request rate
+            with self._lock:
+                self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            self.bucket.pause(retry_after)
+
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            return retry_after
+        # Full jitter: spreads retries from concurrent callers apart
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _on_success(self):
+        """Record a success and recover the request rate step by step."""
+        self.breaker.record_success()
+        with self._lock:
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.max_rate / 10)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics.
+
+        Returns:
+            Dictionary with request/retry/failure counts, current rate and circuit state
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["current_rate"] = round(self.bucket.rate, 3)
+        stats["max_rate"] = self.max_rate
+        stats["circuit_state"] = self.breaker.state
+        stats["circuit_opened"] = self.breaker.times_opened
+        return stats
+
+
+_limiter_config: Dict[str, Dict[str, Any]] = {}
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_rate_limiters(config: Dict[str, Any]):
+    """
+    Configure provider limits from tools.rate_limits in config.yaml.
+
+    Existing limiters are replaced on their next use.
+
+    Args:
+        config: Full configuration dictionary
+    """
+    global _limiter_config
+    with _limiters_lock:
+        _limiter_config = config.get("tools", {}).get("rate_limits", {})
+        _limiters.clear()
+
+
+def get_rate_limiter(provider: str) -> ProviderLimiter:
+    """
+    Get the process-wide limiter for a provider.
+
+    Args:
+        provider: Provider name ("tavily", "brave", "semantic_scholar", ...)
+
+    Returns:
+        ProviderLimiter shared by every tool instance
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            # Built-in defaults, then the config's default section, then the provider's own
+            settings = {
+                **DEFAULT_RATE_LIMITS.get(provider, {}),
+                **_limiter_config.get("default", {}),
+                **_limiter_config.get(provider, {}),
+            }
+            limiter = ProviderLimiter(provider, **settings)
+            _limiters[provider] = limiter
+        return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get statistics of every provider limiter in use.
+
+    Returns:
+        Dictionary mapping provider to its limiter statistics
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.get_stats() for provider, limiter in limiters.items()}
@@ -0,0 +1,282 @@
+"""
+Search Result Cache
+Disk-backed cache of web and paper search results.
+
+The Researcher often repeats the same searches within a query, across
+queries and across evaluation runs. Results are cached in SQLite under a key
+made of the provider, the normalized query text and the search parameters
+(max_results, year_from, domains, ...). Each provider has its own TTL (web
+results go stale faster than paper metadata), and the least recently used
+entries are evicted beyond max_entries. Access times of hits are kept in
+memory and written with the next store, so lookups never write to disk.
+
+In offline mode the cache never calls the search APIs: hits are served even
+if expired and misses return no results, so evaluation runs are
+reproducible.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.query_cache import normalize_query
+
+DEFAULT_TTL_SECONDS = {
+    "tavily": 6 * 3600,
+    "brave": 6 * 3600,
+    "semantic_scholar": 7 * 86400,
+}
+
+
+class SearchResultCache:
+    """
+    SQLite cache of parsed search results with per-provider TTLs and LRU eviction.
+
+    Calls are blocking sqlite I/O; the search tools run them through
+    asyncio.to_thread() to keep them off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = "cache/search_results.sqlite",
+        ttl_seconds: Optional[Dict[str, int]] = None,
+        default_ttl_seconds: int = 86400,
+        max_entries: int = 5000,
+        offline: bool = False,
+    ):
+        """
+        Initialize search result cache.
+
+        Args:
+            path: SQLite database file (None or ":memory:" for an in-memory cache)
+            ttl_seconds: TTL per provider, merged over DEFAULT_TTL_SECONDS
+            default_ttl_seconds: TTL for providers without their own setting
+            max_entries: Number of entries kept before LRU eviction
+            offline: Serve only from the cache (ignores TTLs, never calls the APIs)
+        """
+        self.logger = logging.getLogger("tools.search_cache")
+        self.ttl_seconds = {**DEFAULT_TTL_SECONDS, **(ttl_seconds or {})}
+        self.default_ttl_seconds = default_ttl_seconds
+        self.max_entries = max_entries
+        self.offline = offline
+
+        if path and path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_results (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                normalized_query TEXT NOT NULL,
+                params TEXT NOT NULL,
+                results TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_results_access ON search_results (last_access)"
+        )
+        self._conn.commit()
+
+        # Access times of hits not yet written (flushed by put())
+        self._pending_access: Dict[str, float] = {}
+
+        # Cache statistics per provider
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "stores": 0, "expired": 0}
+        )
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(provider: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a search.
+
+        Args:
+            provider: Search provider name
+            query: Raw search query
+            params: Search parameters that change the results
+
+        Returns:
+            Hex digest identifying the search
+        """
+        encoded = json.dumps(
+            {"provider": provider, "query": normalize_query(query), "params": params or {}},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, provider: str) -> int:
+        """TTL in seconds for a provider's results."""
+        return self.ttl_seconds.get(provider, self.default_ttl_seconds)
+
+    def get(self, provider: str, query: str, params: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results for a search.
+
+        Args:
+            provider: Search provider name
+            query: Raw search query
+            params: Search parameters that change the results
+
+        Returns:
+            Cached results, or None on a miss
+        """
+        key = self.make_key(provider, query, params)
+        now = time.time()
+        stats = self._stats[provider]
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, created_at FROM search_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row and not self.offline and row[1] < now - self.ttl_for(provider):
+                self._conn.execute("DELETE FROM search_results WHERE key = ?", (key,))
+                self._conn.commit()
+                stats["expired"] += 1
+                row = None
+            if row is None:
+                stats["misses"] += 1
+                return None
+
+            self._pending_access[key] = now
+            stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(
+        self,
+        provider: str,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+    ):
+        """
+        Store results for a search.
+
+        Args:
+            provider: Search provider name
+            query: Raw search query
+            params: Search parameters that change the results
+            results: Parsed search results (must be JSON serializable)
+        """
+        try:
+            encoded = json.dumps(results, default=str)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Search results not cacheable: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.make_key(provider, query, params),
+                    provider,
+                    normalize_query(query),
+                    json.dumps(params or {}, sort_keys=True, default=str),
+                    encoded,
+                    now,
+                    now,
+                ),
+            )
+            self._stats[provider]["stores"] += 1
+            self._flush_access_times()
+            self._evict()
+            self._conn.commit()
+
+    def _flush_access_times(self):
+        """Write the access times of hits since the last store (caller commits)."""
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE search_results SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries."""
+        count = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM search_results WHERE key IN "
+                "(SELECT key FROM search_results ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def clear(self):
+        """Remove all cached search results."""
+        with self._lock:
+            self._conn.execute("DELETE FROM search_results")
+            self._conn.commit()
+            self._pending_access.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with overall and per-provider hit/miss counts and current size
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+            by_provider = {provider: dict(stats) for provider, stats in self._stats.items()}
+        hits = sum(stats["hits"] for stats in by_provider.values())
+        misses = sum(stats["misses"] for stats in by_provider.values())
+        lookups = hits + misses
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "offline": self.offline,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups > 0 else 0,
+            "evictions": self.evictions,
+            "by_provider": by_provider,
+        }
+
+
+_search_cache: Optional[SearchResultCache] = None
+
+
+def configure_search_cache(config: Dict[str, Any]) -> Optional[SearchResultCache]:
+    """
+    Configure the process-wide search cache from cache.search_results in config.yaml.
+
+    Args:
+        config: Full configuration dictionary
+
+    Returns:
+        The configured cache, or None if it is disabled
+    """
+    global _search_cache
+    cache_config = config.get("cache", {}).get("search_results", {})
+    if not cache_config.get("enabled", False):
+        _search_cache = None
+        return None
+
+    _search_cache = SearchResultCache(
+        path=cache_config.get("path", "cache/search_results.sqlite"),
+        ttl_seconds=cache_config.get("ttl_seconds"),
+        default_ttl_seconds=cache_config.get("default_ttl_seconds", 86400),
+        max_entries=cache_config.get("max_entries", 5000),
+        offline=cache_config.get("offline", False),
+    )
+    return _search_cache
+
+
+def get_search_cache() -> Optional[SearchResultCache]:
+    """Get the process-wide search cache (None until configure_search_cache() enables it)."""
+    return _search_cache
@@ -0,0 +1,93 @@
+"""
+Request Coalescing
+Single-flight deduplication of concurrent identical tool calls.
+
+When several queries run at once (evaluation, multiple UI users) they often
+issue the same search at the same moment. SingleFlight lets the first caller
+perform the request while every concurrent caller with the same key awaits
+the same task, so the provider sees one request instead of many.
+"""
+
+import asyncio
+import copy
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight task.
+
+    Only calls that overlap in time are merged; once the task finishes, the
+    next call with the same key runs again (caching is handled elsewhere).
+    In-flight tasks are tracked per event loop, since a task can only be
+    awaited from the loop it runs on.
+    """
+
+    def __init__(self):
+        """Initialize single-flight group."""
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless an identical call is already in flight, then share its result.
+
+        The call runs as its own task, so a caller that is cancelled doesn't
+        cancel the request for the others waiting on it.
+
+        Args:
+            key: Identifies identical calls
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            Result of the call (callers that joined an in-flight call get a copy)
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._calls.setdefault(loop, {})
+            task = calls.get(key)
+            if task is not None:
+                self.coalesced += 1
+                shared = True
+            else:
+                task = loop.create_task(fn())
+                calls[key] = task
+                task.add_done_callback(lambda done, key=key: self._forget(calls, key, done))
+                self.executed += 1
+                shared = False
+
+        result = await asyncio.shield(task)
+        # Joined callers get their own copy so nobody mutates another caller's result
+        return copy.deepcopy(result) if shared else result
+
+    def _forget(self, calls: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task):
+        """Remove a finished task so the next call with its key runs again."""
+        with self._lock:
+            if calls.get(key) is task:
+                del calls[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with executed and coalesced call counts
+        """
+        total = self.executed + self.coalesced
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_rate": self.coalesced / total if total > 0 else 0,
+        }
+
+
+# Shared by the web and paper search tools (keys include the provider)
+search_flight = SingleFlight()
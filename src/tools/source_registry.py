@@ -0,0 +1,149 @@
+"""
+Source Registry
+Short IDs for search results and compact tool output.
+
+Search tool output is fed verbatim into every later model turn, so verbose
+result blocks (labels, full URLs, long abstracts) cost tokens over and over.
+In compact mode each result becomes one terse line tagged with a short
+source ID ([W1] for web pages, [P1] for papers) and the full details stay in
+a per-query SourceRegistry. Agents cite sources by ID, and the orchestrator
+turns the cited IDs back into a reference list with full titles and URLs.
+
+The registry of the running query lives in a context variable, so tool
+calls made by any agent of that query share it.
+"""
+
+import re
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+_CITATION_PATTERN = re.compile(r"\[([PW]\d+)\]")
+
+_output_settings: Dict[str, Any] = {"format": "compact", "snippet_chars": 160}
+
+
+def configure_tool_output(config: Dict[str, Any]):
+    """
+    Set the tool output format from tools.output in config.yaml.
+
+    Args:
+        config: Full configuration dictionary
+    """
+    output_config = config.get("tools", {}).get("output", {})
+    _output_settings.update({key: value for key, value in output_config.items() if key in _output_settings})
+
+
+def get_tool_output_settings() -> Dict[str, Any]:
+    """Current tool output settings ("format" is "compact" or "verbose")."""
+    return dict(_output_settings)
+
+
+class SourceRegistry:
+    """Sources retrieved during one query, keyed by short IDs."""
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._ids_by_key: Dict[str, str] = {}
+        self._counts = {"P": 0, "W": 0}
+
+    def register(self, kind: str, item: Dict[str, Any]) -> str:
+        """
+        Register a search result and get its source ID.
+
+        The same paper or page always gets the same ID within a query.
+
+        Args:
+            kind: "paper" or "web"
+            item: Paper or web result in the tools' standard format
+
+        Returns:
+            Source ID such as "P3" or "W1"
+        """
+        from src.tools.web_search import normalize_url
+
+        prefix = "P" if kind == "paper" else "W"
+        if kind == "paper" and item.get("paper_id"):
+            key = f"paper:{item['paper_id']}"
+        elif item.get("url"):
+            key = f"url:{normalize_url(item['url'])}"
+        else:
+            key = f"title:{item.get('title', '').lower()}"
+
+        source_id = self._ids_by_key.get(key)
+        if source_id is None:
+            self._counts[prefix] += 1
+            source_id = f"{prefix}{self._counts[prefix]}"
+            self._ids_by_key[key] = source_id
+            self._sources[source_id] = {"id": source_id, "kind": kind, **item}
+        return source_id
+
+    def get(self, source_id: str) -> Optional[Dict[str, Any]]:
+        """Get a registered source by ID."""
+        return self._sources.get(source_id)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """All registered sources in registration order."""
+        return list(self._sources.values())
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def resolve_citations(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Append a reference list for the source IDs cited in a response.
+
+        Args:
+            text: Response citing sources as [P1], [W2], ...
+
+        Returns:
+            Tuple of (text with a "Sources" section appended, cited sources)
+        """
+        cited = []
+        for source_id in dict.fromkeys(_CITATION_PATTERN.findall(text)):
+            source = self._sources.get(source_id)
+            if source:
+                cited.append(source)
+        if not cited:
+            return text, []
+
+        lines = []
+        for source in cited:
+            details = [source.get("title") or "Untitled"]
+            if source["kind"] == "paper":
+                authors = source.get("authors") or []
+                byline = [authors[0].get("name", "") + (" et al." if len(authors) > 1 else "")] if authors else []
+                if source.get("year"):
+                    byline.append(str(source["year"]))
+                if byline:
+                    details.append(", ".join(byline))
+            if source.get("url"):
+                details.append(source["url"])
+            lines.append(f"[{source['id']}] " + "; ".join(details))
+        return f"{text.rstrip()}\n\n## Sources\n" + "\n".join(lines), cited
+
+
+_current_registry: ContextVar[Optional[SourceRegistry]] = ContextVar("source_registry", default=None)
+
+
+def start_source_registry() -> SourceRegistry:
+    """
+    Start a fresh registry for the current query (context).
+
+    Returns:
+        The new registry
+    """
+    registry = SourceRegistry()
+    _current_registry.set(registry)
+    return registry
+
+
+def get_source_registry() -> Optional[SourceRegistry]:
+    """Registry of the running query, or None outside of a query."""
+    return _current_registry.get()
+
+
+def clip(text: Optional[str], max_chars: int) -> str:
+    """Collapse whitespace and cut text to max_chars."""
+    text = " ".join((text or "").split())
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "..."
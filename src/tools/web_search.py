@@ -3,13 +3,115 @@ Web Search Tool
 Integrates with web search APIs (Tavily, Brave, etc.)
 
 This tool provides web search functionality for the research agents.
-It supports both Tavily and Brave Search APIs.
+It supports both Tavily and Brave Search APIs, and a hedged mode that
+queries several providers at once and fuses their results.
 """
 
 from typing import List, Dict, Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import asyncio
 import os
 import logging
-import asyncio
+
+from src.runtime import get_background_loop
+from src.tools.http_pool import get_http_session
+from src.tools.local_index import get_local_index
+from src.tools.rate_limiter import check_response, get_rate_limiter
+from src.tools.search_cache import SearchResultCache, get_search_cache
+from src.tools.singleflight import search_flight
+from src.tools.source_registry import clip, get_source_registry, get_tool_output_settings
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
+
+PROVIDER_API_KEYS = {
+    "tavily": "TAVILY_API_KEY",
+    "brave": "BRAVE_API_KEY",
+}
+
+# Reciprocal rank fusion constant (the usual value from Cormack et al.)
+RRF_K = 60
+
+# Defaults for web_search_async(), set from tools.web_search by configure_web_search()
+_web_search_settings: Dict[str, Any] = {
+    "provider": "tavily",
+    "hedging": {"providers": ["tavily", "brave"], "quorum": 2, "deadline_seconds": 2.0},
+}
+
+
+def configure_web_search(config: Dict[str, Any]):
+    """
+    Set the default provider and hedging settings from tools.web_search.
+
+    Args:
+        config: Full configuration dictionary
+    """
+    web_config = config.get("tools", {}).get("web_search", {})
+    _web_search_settings["provider"] = web_config.get("provider", "tavily")
+    _web_search_settings["hedging"] = {**_web_search_settings["hedging"], **web_config.get("hedging", {})}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so the same page found by different providers matches.
+
+    Lowercases scheme and host, drops "www.", fragments, tracking parameters
+    and trailing slashes.
+
+    Args:
+        url: Result URL
+
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in ("ref", "fbclid", "gclid")
+    ])
+    path = parts.path.rstrip("/")
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme.lower(), host, path, query, ""))
+
+
+def fuse_results(ranked_lists: Dict[str, List[Dict[str, Any]]], max_results: int) -> List[Dict[str, Any]]:
+    """
+    Merge result lists from several providers with reciprocal rank fusion.
+
+    Results are deduplicated by normalized URL. A page ranked highly by
+    several providers beats one ranked highly by a single provider.
+
+    Args:
+        ranked_lists: Results per provider, best first
+        max_results: Number of fused results to return
+
+    Returns:
+        Fused results in the standard format, with score scaled to 0-1 and
+        a "providers" list naming who returned each result
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    for provider, results in ranked_lists.items():
+        for rank, result in enumerate(results, 1):
+            key = normalize_url(result.get("url", "")) or result.get("title", "")
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+            if key not in fused:
+                fused[key] = {**result, "providers": [provider]}
+                continue
+            merged = fused[key]
+            if provider not in merged["providers"]:
+                merged["providers"].append(provider)
+            # Fill in what the first provider didn't have
+            for field in ("snippet", "published_date"):
+                if not merged.get(field) and result.get(field):
+                    merged[field] = result[field]
+
+    # Best possible score: ranked first by every provider
+    best = len(ranked_lists) / (RRF_K + 1) if ranked_lists else 1.0
+    ordered = sorted(fused, key=lambda key: scores[key], reverse=True)[:max_results]
+    return [{**fused[key], "score": round(scores[key] / best, 4)} for key in ordered]
 
 
 class WebSearchTool:
@@ -19,29 +121,52 @@ class WebSearchTool:
     Supports:
     - Tavily API (has free tier)
     - Brave Search API
+    - Hedged: both at once, results fused by reciprocal rank
     
     The tool formats results in a consistent structure regardless of provider.
     """
 
-    def __init__(self, provider: str = "tavily", max_results: int = 5):
+    def __init__(
+        self,
+        provider: str = "tavily",
+        max_results: int = 5,
+        hedged_providers: Optional[List[str]] = None,
+        quorum: int = 2,
+        deadline_seconds: float = 2.0
+    ):
         """
         Initialize web search tool.
 
         Args:
-            provider: Search provider ("tavily" or "brave")
+            provider: Search provider ("tavily", "brave" or "hedged")
             max_results: Maximum number of results to return
+            hedged_providers: Providers queried in hedged mode (default: all
+                providers with an API key)
+            quorum: Hedged mode returns once this many providers have answered
+            deadline_seconds: Hedged mode returns what it has after this long
         """
         self.provider = provider
         self.max_results = max_results
         self.logger = logging.getLogger("tools.web_search")
 
+        if provider == "hedged":
+            providers = hedged_providers or list(PROVIDER_API_KEYS)
+            unknown = [p for p in providers if p not in PROVIDER_API_KEYS]
+            if unknown:
+                raise ValueError(f"Unknown provider: {unknown[0]}")
+            # Providers without a key would only ever return empty results
+            self.hedged_providers = [p for p in providers if os.getenv(PROVIDER_API_KEYS[p])]
+            self.quorum = max(1, quorum)
+            self.deadline_seconds = deadline_seconds
+            self.api_key = None
+            if not self.hedged_providers:
+                self.logger.warning("No API keys found for hedged search. Search will return empty results.")
+            return
+
         # Get API key from environment
-        if provider == "tavily":
-            self.api_key = os.getenv("TAVILY_API_KEY")
-        elif provider == "brave":
-            self.api_key = os.getenv("BRAVE_API_KEY")
-        else:
+        if provider not in PROVIDER_API_KEYS:
             raise ValueError(f"Unknown provider: {provider}")
+        self.api_key = os.getenv(PROVIDER_API_KEYS[provider])
 
         if not self.api_key:
             self.logger.warning(f"No API key found for {provider}. Search will return empty results.")
@@ -70,46 +195,147 @@ class WebSearchTool:
         """
         self.logger.info(f"Searching web with {self.provider}: {query}")
 
+        # Previously retrieved pages that cover the query are served without a network call
+        # (not in offline mode, where results must come from the replayed cache only)
+        cache = get_search_cache()
+        index = get_local_index()
+        if index and not (cache and cache.offline):
+            local = await asyncio.to_thread(index.search_web, query, self.max_results)
+            if local is not None:
+                self.logger.info(f"Local index hit ({len(local)} results)")
+                return local
+
+        if self.provider == "hedged":
+            return await self._search_hedged(query, **kwargs)
+
+        params = {
+            "max_results": self.max_results,
+            "search_depth": kwargs.get("search_depth", "basic"),
+            "include_domains": sorted(kwargs.get("include_domains", [])),
+            "exclude_domains": sorted(kwargs.get("exclude_domains", [])),
+        }
+        if cache:
+            cached = await asyncio.to_thread(cache.get, self.provider, query, params)
+            if cached is not None:
+                self.logger.info(f"Search cache hit ({len(cached)} results)")
+                return cached
+            if cache.offline:
+                self.logger.info("Offline mode: search not cached, returning empty results")
+                return []
+
         if not self.api_key:
             self.logger.warning("No API key available, returning empty results")
             return []
 
+        # Identical searches already in flight (e.g. from concurrent queries) are joined
+        return await search_flight.do(
+            SearchResultCache.make_key(self.provider, query, params),
+            lambda: self._fetch(query, params, **kwargs),
+        )
+
+    async def _search_hedged(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Query several providers at once and fuse their results.
+
+        Returns as soon as `quorum` providers have returned results, or at the
+        deadline with whatever has arrived (if nothing has, it waits for the
+        first provider to answer). Providers still running are cancelled; their
+        requests finish in the background and warm the search cache.
+        """
+        if not self.hedged_providers:
+            return []
+
+        loop = asyncio.get_running_loop()
+        tasks = {
+            asyncio.ensure_future(WebSearchTool(provider, self.max_results).search(query, **kwargs)): provider
+            for provider in self.hedged_providers
+        }
+        quorum = min(self.quorum, len(tasks))
+        deadline = loop.time() + self.deadline_seconds
+        answered: Dict[str, List[Dict[str, Any]]] = {}
+        pending = set(tasks)
+
+        try:
+            while pending and len(answered) < quorum:
+                timeout = deadline - loop.time()
+                if timeout <= 0 and answered:
+                    break
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=timeout if timeout > 0 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    results = task.result() if not task.exception() else []
+                    if results:
+                        answered[tasks[task]] = results
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending:
+            slow = ", ".join(tasks[task] for task in pending)
+            self.logger.info(f"Hedged search returned without: {slow}")
+        # Keep the configured provider order so ties favor the preferred provider
+        ranked = {p: answered[p] for p in self.hedged_providers if p in answered}
+        return fuse_results(ranked, self.max_results)
+
+    async def _fetch(self, query: str, params: Dict[str, Any], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Call the provider's API and cache the results.
+        """
         try:
             if self.provider == "tavily":
-                return await self._search_tavily(query, **kwargs)
+                results = await self._search_tavily(query, **kwargs)
             elif self.provider == "brave":
-                return await self._search_brave(query, **kwargs)
+                results = await self._search_brave(query, **kwargs)
         except Exception as e:
             self.logger.error(f"Error during web search: {e}")
             return []
 
+        # Empty results are usually API errors, don't cache them
+        cache = get_search_cache()
+        if cache and results:
+            await asyncio.to_thread(cache.put, self.provider, query, params, results)
+        index = get_local_index()
+        if index and results:
+            await asyncio.to_thread(index.add_web_results, results)
+        return results
+
     async def _search_tavily(self, query: str, **kwargs) -> List[Dict[str, Any]]:
         """
         Search using Tavily API.
+
+        Calls the REST endpoint directly on the shared aiohttp session, so the
+        event loop is never blocked by the synchronous SDK.
         """
         try:
-            from tavily import TavilyClient
-            
-            client = TavilyClient(api_key=self.api_key)
-            
+            import aiohttp
+
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
             # Tavily search parameters
-            search_depth = kwargs.get("search_depth", "basic")
-            include_domains = kwargs.get("include_domains", [])
-            exclude_domains = kwargs.get("exclude_domains", [])
-            
-            # Perform search
-            response = client.search(
-                query=query,
-                max_results=self.max_results,
-                search_depth=search_depth,
-                include_domains=include_domains,
-                exclude_domains=exclude_domains,
-            )
-            
-            return self._parse_tavily_results(response)
-            
+            payload = {
+                "query": query,
+                "max_results": self.max_results,
+                "search_depth": kwargs.get("search_depth", "basic"),
+                "include_domains": kwargs.get("include_domains", []),
+                "exclude_domains": kwargs.get("exclude_domains", []),
+            }
+
+            async def _request():
+                session = await get_http_session()
+                async with session.post(TAVILY_SEARCH_URL, json=payload, headers=headers) as response:
+                    check_response("tavily", response)
+                    return await response.json()
+
+            data = await get_rate_limiter("tavily").call(_request)
+            return self._parse_tavily_results(data)
+
         except ImportError:
-            self.logger.error("tavily-python not installed. Run: pip install tavily-python")
+            self.logger.error("aiohttp not installed. Run: pip install aiohttp")
             return []
         except Exception as e:
             self.logger.error(f"Tavily search error: {e}")
@@ -124,7 +350,6 @@ class WebSearchTool:
         try:
             import aiohttp
             
-            url = "https://api.search.brave.com/res/v1/web/search"
             headers = {
                 "Accept": "application/json",
                 "Accept-Encoding": "gzip",
@@ -135,15 +360,15 @@ class WebSearchTool:
                 "count": self.max_results,
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_brave_results(data)
-                    else:
-                        self.logger.error(f"Brave API error: {response.status}")
-                        return []
-                        
+            async def _request():
+                session = await get_http_session()
+                async with session.get(BRAVE_SEARCH_URL, headers=headers, params=params) as response:
+                    check_response("brave", response)
+                    return await response.json()
+
+            data = await get_rate_limiter("brave").call(_request)
+            return self._parse_brave_results(data)
+
         except ImportError:
             self.logger.error("aiohttp not installed. Run: pip install aiohttp")
             return []
@@ -211,38 +436,37 @@ class WebSearchTool:
         return [r for r in results if r.get("score", 0) >= min_score]
 
 
-# Synchronous wrapper for use with AutoGen tools
-def web_search(query: str, provider: str = "tavily", max_results: int = 5) -> str:
+async def web_search_async(query: str, provider: Optional[str] = None, max_results: int = 5) -> str:
     """
-    Synchronous wrapper for web search (for AutoGen tool integration).
-    
+    Async web search (registered as the agents' web_search tool).
+
+    Runs directly on the caller's event loop, so a tool call needs no extra
+    thread or event loop.
+
     Args:
         query: Search query
-        provider: "tavily" or "brave"
+        provider: "tavily", "brave" or "hedged" (defaults to tools.web_search.provider)
         max_results: Maximum results to return
-        
+
     Returns:
         Formatted string with search results
     """
-    tool = WebSearchTool(provider=provider, max_results=max_results)
-    # Handle both sync and async contexts
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If we're in an async context, create a new event loop in a thread
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(_run_async_in_thread, tool.search(query))
-                results = future.result()
-        else:
-            results = loop.run_until_complete(tool.search(query))
-    except RuntimeError:
-        # No event loop exists, create a new one
-        results = asyncio.run(tool.search(query))
+    hedging = _web_search_settings["hedging"]
+    tool = WebSearchTool(
+        provider=provider or _web_search_settings["provider"],
+        max_results=max_results,
+        hedged_providers=hedging.get("providers"),
+        quorum=hedging.get("quorum", 2),
+        deadline_seconds=hedging.get("deadline_seconds", 2.0),
+    )
+    results = await tool.search(query)
     
     if not results:
         return "No search results found."
     
+    if get_tool_output_settings()["format"] == "compact":
+        return _format_compact(query, results)
+    
     # Format results as readable text
     output = f"Found {len(results)} web search results for '{query}':\n\n"
     
@@ -257,12 +481,41 @@ def web_search(query: str, provider: str = "tavily", max_results: int = 5) -> st
     return output
 
 
-def _run_async_in_thread(coro):
-    """Helper to run async code in a new event loop in a thread."""
-    import asyncio
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+def _format_compact(query: str, results: List[Dict[str, Any]]) -> str:
+    """
+    One terse line per result, tagged with its source ID.
+
+    Inside a query the URL is left out (it is kept in the source registry
+    and added to the final reference list); without a registry the URL is
+    kept so the output stays usable on its own.
+    """
+    registry = get_source_registry()
+    snippet_chars = get_tool_output_settings()["snippet_chars"]
+    lines = [f"web '{query}': {len(results)} results"]
+    for i, result in enumerate(results, 1):
+        source_id = registry.register("web", result) if registry is not None else f"W{i}"
+        site = urlsplit(result.get("url", "")).netloc.lower()
+        site = site[4:] if site.startswith("www.") else site
+        if registry is None:
+            site = result.get("url", "")
+        date = f", {result['published_date']}" if result.get("published_date") else ""
+        lines.append(f"[{source_id}] {clip(result.get('title'), 100)} ({site}{date}): {clip(result.get('snippet'), snippet_chars)}")
+    return "\n".join(lines)
+
+
+def web_search(query: str, provider: Optional[str] = None, max_results: int = 5) -> str:
+    """
+    Synchronous wrapper for web search, for callers without an event loop.
+
+    The search runs on the shared background loop, reusing its HTTP session.
+    Async code should await web_search_async() instead.
+    
+    Args:
+        query: Search query
+        provider: "tavily", "brave" or "hedged" (defaults to tools.web_search.provider)
+        max_results: Maximum results to return
+        
+    Returns:
+        Formatted string with search results
+    """
+    return get_background_loop().run(web_search_async(query, provider=provider, max_results=max_results))
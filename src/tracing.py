@@ -0,0 +1,390 @@
+"""
+Pipeline Tracing
+Span-level timing for research queries.
+
+Every query gets a trace made of nested spans: admission, guardrail checks,
+agent turns and, inside each turn, the LLM requests and tool calls. Each
+span carries a "stage" attribute (planning, research, writing, critique,
+tool, llm, guardrail, ...) so timings can be summarized per stage.
+
+Finished traces are appended to a local JSON Lines file in the OpenTelemetry
+OTLP/JSON format (one ExportTraceServiceRequest per line), which the
+OpenTelemetry Collector's file receiver and most trace viewers can import.
+Traces finish on the runtime event loop, so the file write is handed to a
+single export thread (which also keeps lines in completion order).
+"""
+
+import concurrent.futures
+import json
+import logging
+import math
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    def __init__(
+        self,
+        trace: "Trace",
+        name: str,
+        stage: str,
+        parent_id: Optional[str] = None,
+        start_ns: Optional[int] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.trace = trace
+        self.name = name
+        self.stage = stage
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration in milliseconds (up to now if the span is still open)."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def end(self, end_ns: Optional[int] = None, error: Optional[str] = None):
+        """Finish the span and record it in its trace."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        if error:
+            self.error = error
+        self.trace.spans.append(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary view (for logs and result metadata)."""
+        return {
+            "name": self.name,
+            "stage": self.stage,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "duration_ms": round(self.duration_ms, 2),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON representation of the span."""
+        attributes = {"pipeline.stage": self.stage, **self.attributes}
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """All spans recorded for one query."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List[Span] = []
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode one attribute as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_stages(spans: List[Span]) -> Dict[str, Dict[str, float]]:
+    """
+    Summarize span durations per stage.
+
+    Args:
+        spans: Finished spans
+
+    Returns:
+        Dictionary mapping stage to count, total, p50 and p95 in milliseconds
+    """
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for span in spans:
+        durations[span.stage].append(span.duration_ms)
+    return {
+        stage: {
+            "count": len(values),
+            "total_ms": round(sum(values), 2),
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+        }
+        for stage, values in durations.items()
+    }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Creates traces and spans and exports finished traces.
+
+    The current trace and span live in context variables, so they follow the
+    query across awaits, asyncio tasks and asyncio.to_thread() calls.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        export_path: Optional[str] = "logs/traces/traces.jsonl",
+        service_name: str = "multi-agent-research",
+        history_size: int = 1000,
+    ):
+        """
+        Initialize tracer.
+
+        Args:
+            enabled: If False, spans are not recorded
+            export_path: JSON Lines file finished traces are appended to (None to disable)
+            service_name: service.name resource attribute of exported traces
+            history_size: Number of recent span durations kept per stage for get_stage_stats()
+        """
+        self.enabled = enabled
+        self.export_path = export_path
+        self.service_name = service_name
+        self.logger = logging.getLogger("tracing")
+
+        self._history: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=history_size))
+        self._lock = threading.Lock()
+        # Created on the first export
+        self._exporter: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Start a new trace with a root span for the block.
+
+        Yields:
+            The root span (None when tracing is disabled)
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        trace = Trace(name)
+        root = Span(trace, name, "query", attributes=attributes)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(root)
+        error = None
+        try:
+            yield root
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            root.end(error=error)
+            self._finish(trace)
+
+    @contextmanager
+    def span(self, name: str, stage: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Time a block as a child of the current span.
+
+        Does nothing outside of a trace.
+
+        Yields:
+            The span (None when there is no active trace)
+        """
+        span = self.start_span(name, stage, **attributes)
+        if span is None:
+            yield None
+            return
+
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end(error=error)
+
+    def start_span(
+        self,
+        name: str,
+        stage: str,
+        parent: Optional[Span] = None,
+        start_ns: Optional[int] = None,
+        **attributes: Any
+    ) -> Optional[Span]:
+        """
+        Open a span without making it current (end it with span.end()).
+
+        Useful in async generators, where context variables can't be set safely
+        across yields.
+
+        Args:
+            name: Span name
+            stage: Pipeline stage the span is counted under
+            parent: Parent span (defaults to the current span)
+            start_ns: Start time (defaults to now)
+
+        Returns:
+            The span, or None when there is no active trace
+        """
+        parent = parent or _current_span.get()
+        if not self.enabled or parent is None:
+            return None
+        return Span(parent.trace, name, stage, parent.span_id, start_ns, attributes)
+
+    def current_trace(self) -> Optional[Trace]:
+        """The trace of the calling context, if any."""
+        return _current_trace.get()
+
+    def current_span(self) -> Optional[Span]:
+        """The innermost open span of the calling context, if any."""
+        return _current_span.get()
+
+    def _finish(self, trace: Trace):
+        """Record stage timings and queue a finished trace for export."""
+        with self._lock:
+            for span in trace.spans:
+                self._history[span.stage].append(span.duration_ms)
+            if not self.export_path:
+                return
+            if self._exporter is None:
+                self._exporter = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="trace-export"
+                )
+            exporter = self._exporter
+        exporter.submit(self._export_quietly, trace)
+
+    def _export_quietly(self, trace: Trace):
+        """Export a trace on the export thread, logging instead of raising."""
+        try:
+            self.export(trace)
+        except Exception as e:
+            self.logger.warning(f"Failed to export trace {trace.trace_id}: {e}")
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Wait until the traces queued so far are written.
+
+        Args:
+            timeout: Optional number of seconds to wait
+        """
+        with self._lock:
+            exporter = self._exporter
+        if exporter is not None:
+            exporter.submit(lambda: None).result(timeout=timeout)
+
+    def export(self, trace: Trace):
+        """
+        Append a trace to the export file as one OTLP/JSON line.
+
+        Args:
+            trace: Finished trace
+        """
+        request = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        _otlp_attribute("service.name", self.service_name),
+                        _otlp_attribute("process.pid", os.getpid()),
+                    ]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "src.tracing"},
+                    "spans": [span.to_otlp() for span in trace.spans],
+                }],
+            }]
+        }
+        path = Path(self.export_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(request, default=str)
+        with self._lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def get_stage_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get p50/p95 timings per stage over recent traces.
+
+        Returns:
+            Dictionary mapping stage to count, p50 and p95 in milliseconds
+        """
+        with self._lock:
+            history = {stage: list(values) for stage, values in self._history.items()}
+        return {
+            stage: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+            }
+            for stage, values in history.items()
+        }
+
+
+_tracer = Tracer(enabled=False, export_path=None)
+
+
+def configure_tracer(config: Dict[str, Any]) -> Tracer:
+    """
+    Configure the process-wide tracer from the tracing section of config.yaml.
+
+    Args:
+        config: Full configuration dictionary
+
+    Returns:
+        The configured tracer
+    """
+    global _tracer
+    tracing_config = config.get("tracing", {})
+    _tracer = Tracer(
+        enabled=tracing_config.get("enabled", True),
+        export_path=tracing_config.get("export_path", "logs/traces/traces.jsonl"),
+        service_name=tracing_config.get("service_name", config.get("system", {}).get("name", "multi-agent-research")),
+    )
+    return _tracer
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer (disabled until configure_tracer() is called)."""
+    return _tracer
@@ -88,6 +88,14 @@ class CLI:
         """
         self._print_welcome()
 
+        try:
+            await self._loop()
+        finally:
+            # Close pooled teams and HTTP sessions on the runtime loop
+            self.orchestrator.close()
+
+    async def _loop(self):
+        """Read and answer queries until the user quits."""
         while self.running:
             try:
                 # Get user input
@@ -116,8 +124,11 @@ class CLI:
                 print("=" * 70)
                 
                 try:
-                    # Process through orchestrator (synchronous call, not async)
-                    result = self.orchestrator.process_query(query)
+                    # Process through orchestrator without blocking this event loop
+                    if self._should_stream():
+                        result = await self._stream_query(query)
+                    else:
+                        result = await self.orchestrator.process_query_async(query)
                     self.query_count += 1
                     
                     # Display result
@@ -135,6 +146,53 @@ class CLI:
                 print(f"\nError: {e}")
                 logging.exception("Error in CLI loop")
 
+    async def _stream_query(self, query: str) -> Dict[str, Any]:
+        """
+        Process a query while printing agent progress as it arrives.
+
+        Args:
+            query: Research query
+
+        Returns:
+            Final result dictionary from the orchestrator
+        """
+        result: Dict[str, Any] = {}
+        streaming_source = None  # Agent whose tokens are currently being printed
+
+        async for event in self.orchestrator.stream_query(query):
+            event_type = event.get("type")
+            source = event.get("source", "")
+
+            if event_type == "result":
+                result = event["result"]
+            elif event_type == "status":
+                print(f"\n⏳ {event.get('message', '')}")
+            elif event_type == "token":
+                if streaming_source != source:
+                    print(f"\n\n💬 {source}: ", end="")
+                    streaming_source = source
+                print(event.get("content", ""), end="", flush=True)
+            elif event_type == "tool_call":
+                names = ", ".join(tool.get("name", "?") for tool in event.get("tools", []))
+                print(f"\n🔧 {source} calling {names}")
+                streaming_source = None
+            elif event_type == "message":
+                if streaming_source == source:
+                    # Text was already printed token by token
+                    print()
+                elif source and source != "user":
+                    content = str(event.get("content", ""))
+                    preview = content[:300] + "..." if len(content) > 300 else content
+                    print(f"\n💬 {source}: {preview}")
+                streaming_source = None
+
+        print()
+        return result
+
+    def _should_stream(self) -> bool:
+        """Check if agent progress should be streamed while a query runs."""
+        return self.config.get("ui", {}).get("stream", True)
+
     def _print_welcome(self):
         """Print welcome message."""
         print("=" * 70)
@@ -178,6 +236,10 @@ class CLI:
             print(f"  Total safety events: {safety_stats.get('total_events', 0)}")
             print(f"  Violations: {safety_stats.get('violations', 0)}")
             print(f"  Violation rate: {safety_stats.get('violation_rate', 0.0):.2%}")
+            tiers = safety_stats.get("tiers", {})
+            print(f"  Fast tier: {tiers.get('fast_accept_rate', 0.0):.2%} accepted, "
+                  f"{tiers.get('fast_reject_rate', 0.0):.2%} rejected, "
+                  f"{tiers.get('escalation_rate', 0.0):.2%} escalated to LLM checks")
 
     def _display_result(self, result: Dict[str, Any]):
         """Display query result with formatting."""
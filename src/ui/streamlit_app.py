@@ -17,7 +17,7 @@ import yaml
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from dotenv import load_dotenv
 
 from src.autogen_orchestrator import AutoGenOrchestrator
@@ -56,12 +56,19 @@ def initialize_session_state():
         st.session_state.show_safety_log = False
 
 
-def process_query(query: str, max_rounds: int = 10) -> Dict[str, Any]:
+def process_query(
+    query: str,
+    max_rounds: int = 10,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
     """
     Process a query through the orchestrator.
     
     Args:
         query: Research query to process
+        max_rounds: Maximum number of conversation rounds
+        on_event: Optional callback receiving progress events while the
+            query runs (see AutoGenOrchestrator.stream_query)
         
     Returns:
         Result dictionary with response, citations, and metadata
@@ -78,9 +85,18 @@ def process_query(query: str, max_rounds: int = 10) -> Dict[str, Any]:
         }
     
     try:
-        # Process query through AutoGen orchestrator (synchronous)
+        # Process query through AutoGen orchestrator
         # Use reduced max_rounds for faster processing
-        result = orchestrator.process_query(query, max_rounds=max_rounds)
+        if on_event is None:
+            result = orchestrator.process_query(query, max_rounds=max_rounds)
+        else:
+            # Stream progress events, the final event carries the result
+            result = {}
+            for event in orchestrator.iter_query(query, max_rounds=max_rounds):
+                if event.get("type") == "result":
+                    result = event["result"]
+                else:
+                    on_event(event)
         
         # Check for errors
         if "error" in result:
@@ -120,6 +136,65 @@ def process_query(query: str, max_rounds: int = 10) -> Dict[str, Any]:
         }
 
 
+class LiveProgress:
+    """
+    Renders streamed orchestrator events into Streamlit placeholders.
+
+    Shows the current pipeline stage, a running log of agent activity and
+    the message currently being generated, token by token.
+    """
+
+    def __init__(self, status_placeholder, log_placeholder, draft_placeholder):
+        """
+        Initialize live progress display.
+
+        Args:
+            status_placeholder: st.empty() for the current stage
+            log_placeholder: st.empty() for the agent activity log
+            draft_placeholder: st.empty() for the message being streamed
+        """
+        self.status_placeholder = status_placeholder
+        self.log_placeholder = log_placeholder
+        self.draft_placeholder = draft_placeholder
+        self.log_lines = []
+        self.draft_source = None
+        self.draft_text = ""
+
+    def __call__(self, event: Dict[str, Any]):
+        """Handle one progress event."""
+        event_type = event.get("type")
+        source = event.get("source", "")
+
+        if event_type == "status":
+            self.status_placeholder.info(f"🔄 {event.get('message', '')}")
+        elif event_type == "token":
+            if self.draft_source != source:
+                self.draft_source = source
+                self.draft_text = ""
+            self.draft_text += event.get("content", "")
+            self.draft_placeholder.markdown(f"**✍️ {source} (live):**\n\n{self.draft_text}")
+        elif event_type == "tool_call":
+            names = ", ".join(tool.get("name", "?") for tool in event.get("tools", []))
+            self._log(f"🔧 **{source}** calling `{names}`")
+        elif event_type == "message" and source and source != "user":
+            content = str(event.get("content", ""))
+            preview = content[:200] + "..." if len(content) > 200 else content
+            self._log(f"💬 **{source}:** {preview}")
+            self.draft_source = None
+            self.draft_placeholder.empty()
+
+    def _log(self, line: str):
+        """Append a line to the activity log."""
+        self.log_lines.append(line)
+        self.log_placeholder.markdown("\n\n".join(self.log_lines[-12:]))
+
+    def clear(self):
+        """Remove all live progress output."""
+        self.status_placeholder.empty()
+        self.log_placeholder.empty()
+        self.draft_placeholder.empty()
+
+
 def extract_citations(result: Dict[str, Any]) -> list:
     """Extract citations from research result with better formatting."""
     citations = []
@@ -867,13 +942,13 @@ def main():
                 with progress_container:
                     status_text = st.empty()
                     status_text.info("🔄 Initializing agents...")
+                    live_progress = LiveProgress(status_text, st.empty(), st.empty())
                     
                 with st.spinner("Processing your query (this may take 1-3 minutes)..."):
                     try:
-                        # Process query (synchronous) with reduced rounds for faster response
-                        status_text.info("🔍 Gathering research sources...")
-                        result = process_query(query, max_rounds=5)  # Limit to 5 rounds for faster processing
-                        status_text.empty()
+                        # Stream agent progress while the query runs, with reduced rounds for faster response
+                        result = process_query(query, max_rounds=5, on_event=live_progress)  # Limit to 5 rounds for faster processing
+                        live_progress.clear()
                     except Exception as e:
                         status_text.error(f"❌ Error: {str(e)}")
                         result = {
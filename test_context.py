@@ -0,0 +1,100 @@
+"""
+Offline checks for the compacting model context.
+
+Runs without API keys, either directly (python test_context.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from autogen_core import FunctionCall
+from autogen_core.models import (
+    AssistantMessage,
+    FunctionExecutionResult,
+    FunctionExecutionResultMessage,
+    UserMessage,
+)
+
+from src.agents.context import CompactingChatCompletionContext, create_model_context
+
+
+def _context(messages, **kwargs) -> CompactingChatCompletionContext:
+    context = CompactingChatCompletionContext(**kwargs)
+    for message in messages:
+        asyncio.run(context.add_message(message))
+    return context
+
+
+def _tool_pair(call_id: str, output: str):
+    call = AssistantMessage(
+        content=[FunctionCall(id=call_id, name="web_search", arguments="{}")], source="Researcher"
+    )
+    result = FunctionExecutionResultMessage(
+        content=[FunctionExecutionResult(content=output, name="web_search", call_id=call_id, is_error=False)]
+    )
+    return [call, result]
+
+
+def test_short_conversation_is_unchanged():
+    messages = [UserMessage(content=f"message {i}", source="user") for i in range(4)]
+    context = _context(messages, keep_recent_messages=8)
+    assert asyncio.run(context.get_messages()) == messages
+
+
+def test_query_kept_and_old_messages_summarized():
+    messages = [UserMessage(content="the research query", source="user")]
+    messages += [AssistantMessage(content=f"turn {i}", source="Planner") for i in range(10)]
+    context = _context(messages, keep_recent_messages=3)
+    compacted = asyncio.run(context.get_messages())
+    assert compacted[0] is messages[0]
+    assert compacted[1].source == "context_summary"
+    assert "[7 earlier message(s) condensed]" in compacted[1].content
+    assert "- Planner: turn 0" in compacted[1].content
+    assert compacted[2:] == messages[-3:]
+    # The full history is still stored
+    assert context._messages == messages
+
+
+def test_latest_tool_call_kept_with_its_result():
+    messages = [UserMessage(content="query", source="user")]
+    messages += [AssistantMessage(content=f"turn {i}", source="Writer") for i in range(4)]
+    messages += _tool_pair("call-1", "search results")
+    compacted = asyncio.run(_context(messages, keep_recent_messages=1).get_messages())
+    # The window is widened back to the call instead of orphaning the result
+    assert compacted[-2:] == messages[-2:]
+
+
+def test_older_tool_outputs_truncated_latest_kept_whole():
+    messages = [UserMessage(content="query", source="user")]
+    messages += _tool_pair("call-1", "x" * 500)
+    messages += _tool_pair("call-2", "y" * 500)
+    messages.append(AssistantMessage(content="summary of findings", source="Researcher"))
+    compacted = asyncio.run(_context(messages, keep_recent_messages=8, max_tool_output_chars=50).get_messages())
+    old_output, latest_output = compacted[2].content[0].content, compacted[4].content[0].content
+    assert old_output.startswith("x" * 50) and "[truncated 450 characters]" in old_output
+    assert latest_output == "y" * 500
+
+
+def test_create_model_context_from_config():
+    assert create_model_context({"agents": {"context": {"compact": False}}}) is None
+    context = create_model_context({"agents": {"context": {"keep_recent_messages": 4}}})
+    assert context.keep_recent_messages == 4
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
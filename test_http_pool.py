@@ -0,0 +1,72 @@
+"""
+Offline checks for the shared HTTP session pool and its shutdown.
+
+No requests are sent, so no network or API keys are needed.
+Runs either directly (python test_http_pool.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.runtime import BackgroundLoop
+from src.tools.http_pool import close_http_session, get_http_pool_stats, get_http_session
+
+
+def test_session_shared_per_loop_and_closed():
+    async def run():
+        first = await get_http_session()
+        assert await get_http_session() is first
+        await close_http_session()
+        assert first.closed
+        # The next caller gets a fresh session
+        second = await get_http_session()
+        assert second is not first and not second.closed
+        await close_http_session()
+    asyncio.run(run())
+
+
+def test_loop_stop_runs_shutdown_hooks():
+    loop = BackgroundLoop(name="test-loop")
+    loop.add_shutdown_hook(close_http_session)
+    loop.add_shutdown_hook(close_http_session)
+    session = loop.run(get_http_session())
+    open_before = get_http_pool_stats()["open_sessions"]
+    loop.stop()
+    assert session.closed
+    assert get_http_pool_stats()["open_sessions"] == open_before - 1
+
+
+def test_failing_shutdown_hook_does_not_block_others():
+    loop = BackgroundLoop(name="test-loop")
+    calls = []
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    async def recording():
+        calls.append(1)
+
+    loop.add_shutdown_hook(broken)
+    loop.add_shutdown_hook(recording)
+    loop.start()
+    loop.stop()
+    assert calls == [1]
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
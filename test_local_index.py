@@ -0,0 +1,109 @@
+"""
+Offline checks for the local search index: BM25 ranking, min_hits and filters.
+
+Runs without API keys, either directly (python test_local_index.py) or with pytest.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.tools.local_index import LocalSearchIndex, configure_local_index
+
+
+def _paper(paper_id: str, title: str, abstract: str = "", year: int = 2020, citations: int = 10):
+    return {"paper_id": paper_id, "title": title, "abstract": abstract, "authors": [],
+            "venue": "CHI", "year": year, "citation_count": citations}
+
+
+PAPERS = [
+    _paper("p1", "Eye tracking in virtual reality", "Gaze input for VR headsets.", 2021, 50),
+    _paper("p2", "Virtual reality sickness", "Eye strain and tracking of symptoms in VR.", 2018, 5),
+    _paper("p3", "Eye tracking for reading research", "Virtual reality is mentioned once.", 2015, 200),
+    _paper("p4", "Voice assistants for older adults", "Interview study.", 2022, 30),
+]
+
+
+def _index(**kwargs) -> LocalSearchIndex:
+    index = LocalSearchIndex(path=":memory:", **kwargs)
+    index.add_papers(PAPERS)
+    return index
+
+
+def test_title_matches_rank_first():
+    hits = _index(min_hits=1).search_papers("eye tracking virtual reality", limit=3)
+    assert [p["paper_id"] for p in hits] == ["p1", "p3", "p2"]
+
+
+def test_documents_missing_query_terms_are_not_hits():
+    index = _index(min_hits=1, min_term_coverage=1.0)
+    hits = index.search_papers("eye tracking older adults", limit=5)
+    assert hits is None
+    assert index.get_stats()["fallbacks"] == 1
+
+
+def test_too_few_hits_fall_back_to_network():
+    index = _index(min_hits=3)
+    assert index.search_papers("voice assistants", limit=5) is None
+    # min_hits is capped at the requested result count
+    assert [p["paper_id"] for p in index.search_papers("voice assistants", limit=1)] == ["p4"]
+    stats = index.get_stats()
+    assert (stats["local_hits"], stats["fallbacks"]) == (1, 1)
+
+
+def test_paper_filters():
+    index = _index(min_hits=1)
+    hits = index.search_papers("eye tracking virtual reality", limit=5, year_from=2016, min_citations=10)
+    assert [p["paper_id"] for p in hits] == ["p1"]
+    assert index.search_papers("eye tracking virtual reality", limit=5, year_to=2010) is None
+
+
+def test_web_results_expire_and_are_deduplicated():
+    index = LocalSearchIndex(path=":memory:", min_hits=1, max_web_age_seconds=60)
+    results = [{"title": "Eye tracking in VR", "url": "https://www.a.org/vr/", "snippet": "Gaze input",
+                "providers": ["tavily"]}]
+    index.add_web_results(results)
+    index.add_web_results([{**results[0], "url": "https://a.org/vr"}])
+    hits = index.search_web("eye tracking vr", limit=5)
+    assert len(hits) == 1 and "providers" not in hits[0]
+    assert index.get_stats()["web_pages"] == 1
+
+    index._conn.execute("UPDATE documents SET added_at = ?", (time.time() - 120,))
+    assert index.search_web("eye tracking vr", limit=5) is None
+
+
+def test_oldest_documents_evicted():
+    index = LocalSearchIndex(path=":memory:", min_hits=1, max_documents=2)
+    for paper in PAPERS[:3]:
+        index.add_papers([paper])
+        time.sleep(0.01)
+    assert index.get_stats()["papers"] == 2
+    hits = index.search_papers("eye tracking", limit=5)
+    assert "p1" not in [p["paper_id"] for p in hits]
+
+
+def test_configure_local_index():
+    assert configure_local_index({}) is None
+    index = configure_local_index({"tools": {"local_index": {"enabled": True, "path": ":memory:", "min_hits": 0}}})
+    try:
+        assert index.min_hits == 1
+    finally:
+        configure_local_index({})
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
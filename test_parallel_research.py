@@ -0,0 +1,152 @@
+"""
+Offline checks for the parallel research team and speculative drafting.
+
+Agents run on replayed model responses, so no API keys are needed.
+Runs either directly (python test_parallel_research.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.agents.parallel_research import ParallelResearchTeam, parse_sub_questions
+from src.agents.termination import ReviewTermination
+
+PLAN = "SUB-QUESTION: What is eye tracking?\nSUB-QUESTION: How is it used in VR?"
+
+
+class SlowReplayClient(ReplayChatCompletionClient):
+    """Replay client that takes a while to answer."""
+
+    def __init__(self, replies: List[str], delay: float):
+        super().__init__(replies)
+        self.delay = delay
+
+    async def create(self, *args, **kwargs):
+        await asyncio.sleep(self.delay)
+        return await super().create(*args, **kwargs)
+
+
+def _agent(name: str, replies: List[str], delay: float = 0.0) -> AssistantAgent:
+    return AssistantAgent(name, model_client=SlowReplayClient(replies, delay))
+
+
+def _speculative_team(research_delays: List[float], writer_delay: float) -> ParallelResearchTeam:
+    plan = "\n".join(f"SUB-QUESTION: Question {i}?" for i in range(len(research_delays)))
+    return ParallelResearchTeam(
+        planner=_agent("Planner", [plan]),
+        researchers=[_agent("Researcher", [f"finding {i}"], delay) for i, delay in enumerate(research_delays)],
+        writer=_agent("Writer", ["draft 1", "draft 2", "draft 3"], writer_delay),
+        critic=_agent("Critic", ["APPROVED - RESEARCH COMPLETE"]),
+        max_sub_questions=len(research_delays),
+        termination_condition=ReviewTermination(max_revisions=1),
+        speculative_drafting=True,
+    )
+
+
+def _team(writer_replies: List[str], critic_replies: List[str], review=None, **kwargs) -> ParallelResearchTeam:
+    return ParallelResearchTeam(
+        planner=_agent("Planner", [PLAN]),
+        researchers=[_agent("Researcher", ["finding A", "finding B"]) for _ in range(2)],
+        writer=_agent("Writer", writer_replies),
+        critic=_agent("Critic", critic_replies),
+        termination_condition=review,
+        **kwargs,
+    )
+
+
+def _texts(result, source: str) -> List[str]:
+    return [m.content for m in result.messages if m.source == source]
+
+
+def test_parse_sub_questions():
+    assert parse_sub_questions(PLAN, 4) == ["What is eye tracking?", "How is it used in VR?"]
+    assert parse_sub_questions("1. First?\n2. Second?\n- first?", 4) == ["First?", "Second?"]
+    assert parse_sub_questions(PLAN, 1) == ["What is eye tracking?"]
+    assert parse_sub_questions("No questions here.", 4) == []
+
+
+def test_writer_revises_until_critic_approves():
+    review = ReviewTermination(max_revisions=1)
+    team = _team(["draft 1", "draft 2"], ["NEEDS REVISION: cite sources", "APPROVED - RESEARCH COMPLETE"],
+                 review=review)
+    result = asyncio.run(team.run("Eye tracking in VR"))
+    assert _texts(result, "Writer") == ["draft 1", "draft 2"]
+    assert len(_texts(result, "Critic")) == 2
+    assert review.outcome == "approved"
+
+
+def test_revisions_stop_at_revision_cap():
+    review = ReviewTermination(max_revisions=1)
+    team = _team(["draft 1", "draft 2", "draft 3"], ["NEEDS REVISION"] * 3, review=review)
+    result = asyncio.run(team.run("Eye tracking in VR"))
+    assert _texts(result, "Writer") == ["draft 1", "draft 2"]
+    assert review.outcome == "revision_cap"
+
+
+def test_revision_cap_without_termination_condition():
+    team = _team(["draft 1", "draft 2", "draft 3"], ["NEEDS REVISION"] * 3, max_revisions=1)
+    result = asyncio.run(team.run("Eye tracking in VR"))
+    assert _texts(result, "Writer") == ["draft 1", "draft 2"]
+    assert len(_texts(result, "Critic")) == 2
+
+
+def test_skipped_critic_stops_after_draft():
+    review = ReviewTermination(max_revisions=1)
+    review.configure(skip_critic=True)
+    team = _team(["draft 1"], ["NEEDS REVISION"], review=review)
+    result = asyncio.run(team.run("Eye tracking in VR"))
+    assert _texts(result, "Writer") == ["draft 1"]
+    assert _texts(result, "Critic") == []
+    assert review.outcome == "critic_skipped"
+
+
+def test_speculative_draft_is_revised_with_late_findings():
+    team = _speculative_team([0.0, 0.3], writer_delay=0.0)
+    result = asyncio.run(team.run("Eye tracking in VR"))
+    drafts = [m for m in result.messages if m.source == "Writer"]
+    assert [d.content for d in drafts] == ["draft 1", "draft 2"]
+    assert drafts[0].metadata.get("speculative") == "true"
+    assert "speculative" not in drafts[1].metadata
+    assert team.drafting_stats == {"drafts": 1, "revisions": 1, "discarded": 0}
+    assert team.termination_condition.outcome == "approved"
+
+
+def test_stale_speculative_draft_is_discarded():
+    # The first draft covers 1 of 3 findings when research finishes, so it is redone
+    team = _speculative_team([0.0, 0.05, 0.05], writer_delay=0.3)
+    result = asyncio.run(team.run("Eye tracking in VR"))
+    drafts = [m for m in result.messages if m.source == "Writer"]
+    assert len(drafts) == 1 and "speculative" not in drafts[0].metadata
+    assert team.drafting_stats["discarded"] == 1
+
+
+def test_speculative_drafts_do_not_trigger_critic_skip():
+    team = _speculative_team([0.0, 0.3], writer_delay=0.0)
+    team.termination_condition.configure(skip_critic=True)
+    result = asyncio.run(team.run("Eye tracking in VR"))
+    # The run stops after the complete draft, not the speculative one
+    assert [m.content for m in result.messages if m.source == "Writer"] == ["draft 1", "draft 2"]
+    assert team.termination_condition.outcome == "critic_skipped"
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
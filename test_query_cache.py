@@ -0,0 +1,122 @@
+"""
+Offline checks for the query result cache: key contents, what gets cached,
+and how cache hits are reported.
+
+The research pipeline is replaced by a stub, so no API keys are needed.
+Runs either directly (python test_query_cache.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.autogen_orchestrator import AutoGenOrchestrator
+from src.query_cache import QueryResultCache, config_fingerprint
+
+
+def _result(outcome: str = "approved", **metadata):
+    return {
+        "query": "What is HCI?",
+        "response": "answer",
+        "safety_events": [{"type": "output", "safe": True}],
+        "metadata": {
+            "usage": {"total_tokens": 1200},
+            "termination": {"outcome": outcome},
+            "budget_exhausted": False,
+            "safety_events": [{"type": "output", "safe": True}],
+            **metadata,
+        },
+    }
+
+
+def _orchestrator(result):
+    """Orchestrator with an in-memory query cache and a stubbed team run."""
+    orchestrator = AutoGenOrchestrator({
+        "system": {"team_pool_prewarm": 0},
+        "safety": {"enabled": False},
+        "tracing": {"export_path": None},
+        "cache": {"query_results": {"enabled": True, "path": ":memory:"}},
+    })
+    orchestrator.runs = 0
+
+    async def process(query, max_rounds=10, emit=None):
+        orchestrator.runs += 1
+        return _result(**result)
+
+    orchestrator._process_query_async = process
+    return orchestrator
+
+
+def test_query_cache_key_contents():
+    base = {"models": {"default": {"name": "m"}}, "safety": {"on_violation": {"action": "refuse"}},
+            "budget": {"max_tokens_per_query": 1000}}
+    fingerprint = config_fingerprint(base)
+    assert config_fingerprint({**base, "safety": {"on_violation": {"action": "sanitize"}}}) != fingerprint
+    assert config_fingerprint({**base, "budget": {"max_tokens_per_query": 2000}}) != fingerprint
+    assert config_fingerprint({**base, "models": {"default": {"name": "other"}}}) != fingerprint
+
+    cache = QueryResultCache({**base, "cache": {"query_results": {"path": ":memory:"}}})
+    cache.put("What is HCI?", {"response": "answer"}, max_rounds=10)
+    assert cache.get("  what is hci ", max_rounds=10)["response"] == "answer"
+    # Runs with a different round limit don't share entries
+    assert cache.get("What is HCI?", max_rounds=2) is None
+
+
+def test_query_cache_pending_embeddings_bounded():
+    cache = QueryResultCache({"cache": {"query_results": {"path": ":memory:"}}},
+                             embed_fn=lambda text: [1.0, float(len(text))])
+    for i in range(cache.max_pending_embeddings + 50):
+        cache.get(f"query number {i}")
+    assert len(cache._pending_embeddings) == cache.max_pending_embeddings
+
+
+def test_hit_drops_run_specific_data():
+    cache = QueryResultCache({"cache": {"query_results": {"path": ":memory:"}}})
+    cache.put("What is HCI?", _result())
+    hit = cache.get("what is HCI")
+    assert "safety_events" not in hit and "safety_events" not in hit["metadata"]
+    assert "usage" not in hit["metadata"] and "termination" not in hit["metadata"]
+    assert hit["metadata"]["cached_run"]["usage"] == {"total_tokens": 1200}
+    assert hit["metadata"]["cache_hit"] is True
+
+
+def test_approved_answer_is_served_from_cache():
+    orchestrator = _orchestrator({})
+    first = orchestrator.process_query("What is HCI?")
+    second = orchestrator.process_query("What is HCI?")
+    assert orchestrator.runs == 1
+    assert first["metadata"]["cache_hit"] is False
+    assert second["metadata"]["cache_hit"] is True
+    assert "safety_events" not in second
+
+
+def test_incomplete_answers_are_not_cached():
+    for result in [
+        {"outcome": "revision_cap"},
+        {"outcome": "critic_skipped"},
+        {"outcome": "budget_exhausted", "budget_exhausted": True},
+        {"error": True},
+        {"safety_blocked": True},
+    ]:
+        orchestrator = _orchestrator(result)
+        orchestrator.process_query("What is HCI?")
+        orchestrator.process_query("What is HCI?")
+        assert orchestrator.runs == 2, result
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,215 @@
+"""
+Offline checks for the search provider rate limiter: retries, adaptive rate and circuit breaker.
+
+Runs without API keys, either directly (python test_rate_limiter.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.tools.rate_limiter import (
+    CircuitOpenError,
+    ProviderError,
+    ProviderLimiter,
+    configure_rate_limiters,
+    get_rate_limiter,
+    parse_retry_after,
+)
+
+
+def _failing(statuses, retry_after=None):
+    """Request that fails with each status in turn, then succeeds; counts its calls."""
+    calls = []
+
+    async def request():
+        calls.append(1)
+        if len(calls) <= len(statuses):
+            raise ProviderError("test", statuses[len(calls) - 1], retry_after)
+        return "ok"
+    return request, calls
+
+
+def _open_limiter() -> ProviderLimiter:
+    """A limiter whose circuit opens after one failure and half-opens after 50ms."""
+    return ProviderLimiter("test", requests_per_second=100, burst=10, max_retries=0,
+                           failure_threshold=1, reset_seconds=0.05)
+
+
+async def _trip(limiter: ProviderLimiter):
+    """Open the circuit and wait until it half-opens."""
+    async def server_error():
+        raise ProviderError("test", 503)
+    try:
+        await limiter.call(server_error)
+    except ProviderError:
+        pass
+    assert limiter.breaker.state == "open"
+    await asyncio.sleep(0.06)
+
+
+async def _ok():
+    return "ok"
+
+
+def test_breaker_rejects_while_open():
+    async def run():
+        limiter = _open_limiter()
+        await _trip(limiter)
+        limiter.breaker.reset_seconds = 60
+        limiter.breaker.record_failure()
+        try:
+            await limiter.call(_ok)
+        except CircuitOpenError:
+            return
+        raise AssertionError("call went through an open circuit")
+    asyncio.run(run())
+
+
+def test_breaker_recovers_after_successful_trial():
+    async def run():
+        limiter = _open_limiter()
+        await _trip(limiter)
+        assert await limiter.call(_ok) == "ok"
+        assert limiter.breaker.state == "closed"
+    asyncio.run(run())
+
+
+def test_breaker_recovers_after_client_error_trial():
+    async def run():
+        limiter = _open_limiter()
+        await _trip(limiter)
+
+        async def not_found():
+            raise ProviderError("test", 404)
+        try:
+            await limiter.call(not_found)
+        except ProviderError:
+            pass
+        # A 404 shows the provider is up
+        assert limiter.breaker.state == "closed"
+        assert await limiter.call(_ok) == "ok"
+    asyncio.run(run())
+
+
+def test_breaker_recovers_after_unexpected_error_trial():
+    async def run():
+        limiter = _open_limiter()
+        await _trip(limiter)
+
+        async def broken():
+            raise ValueError("bad payload")
+        try:
+            await limiter.call(broken)
+        except ValueError:
+            pass
+        assert limiter.breaker.state == "open"
+        await asyncio.sleep(0.06)
+        assert await limiter.call(_ok) == "ok"
+    asyncio.run(run())
+
+
+def test_breaker_recovers_after_cancelled_trial():
+    async def run():
+        limiter = _open_limiter()
+        await _trip(limiter)
+
+        async def slow():
+            await asyncio.sleep(10)
+        task = asyncio.ensure_future(limiter.call(slow))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert await limiter.call(_ok) == "ok"
+        assert limiter.breaker.state == "closed"
+    asyncio.run(run())
+
+
+def test_throttled_request_retried_at_lower_rate():
+    async def run():
+        limiter = ProviderLimiter("test", requests_per_second=100, burst=10, max_retries=2, base_delay=0.01)
+        request, calls = _failing([429, 503])
+        assert await limiter.call(request) == "ok"
+        assert len(calls) == 3
+        stats = limiter.get_stats()
+        assert (stats["retries"], stats["throttled"]) == (2, 1)
+        # Halved by the 429, then recovered by a tenth of the ceiling
+        assert stats["current_rate"] == 60.0
+    asyncio.run(run())
+
+
+def test_client_errors_and_exhausted_retries_raise():
+    async def run():
+        limiter = ProviderLimiter("test", requests_per_second=100, burst=10, max_retries=1, base_delay=0.01)
+        request, calls = _failing([404])
+        try:
+            await limiter.call(request)
+            raise AssertionError("404 was not raised")
+        except ProviderError as e:
+            assert e.status == 404
+        assert len(calls) == 1
+
+        request, calls = _failing([500, 500])
+        try:
+            await limiter.call(request)
+            raise AssertionError("retries were not exhausted")
+        except ProviderError as e:
+            assert e.status == 500
+        assert len(calls) == 2
+    asyncio.run(run())
+
+
+def test_retry_after_beyond_max_delay_is_not_waited_for():
+    async def run():
+        limiter = ProviderLimiter("test", requests_per_second=100, burst=10, max_retries=3, max_delay=1.0)
+        request, calls = _failing([429], retry_after=30.0)
+        try:
+            await limiter.call(request)
+            raise AssertionError("429 was not raised")
+        except ProviderError:
+            pass
+        assert len(calls) == 1
+    asyncio.run(run())
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_rate_limit_settings_merge_order():
+    configure_rate_limiters({"tools": {"rate_limits": {
+        "default": {"requests_per_second": 2.0, "max_retries": 1},
+        "brave": {"requests_per_second": 0.5},
+    }}})
+    try:
+        # Config default beats the built-in provider default
+        assert get_rate_limiter("tavily").max_rate == 2.0
+        assert get_rate_limiter("tavily").max_retries == 1
+        # The provider's own section beats the config default
+        assert get_rate_limiter("brave").max_rate == 0.5
+    finally:
+        configure_rate_limiters({})
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
@@ -20,7 +20,11 @@ print("=" * 70)
 # Initialize safety manager
 print("\n1. Initializing SafetyManager...")
 try:
-    safety_manager = SafetyManager(config.get("safety", {}))
+    safety_manager = SafetyManager({
+        "models": config.get("models", {}),
+        "system": config.get("system", {}),
+        **config.get("safety", {}),
+    })
     print("✓ SafetyManager initialized successfully")
     print(f"  - Enabled: {safety_manager.enabled}")
     print(f"  - LLM Client: {type(safety_manager.llm_client).__name__ if safety_manager.llm_client else 'None'}")
@@ -0,0 +1,103 @@
+"""
+Offline checks for the search result cache: keys, TTLs, offline mode and LRU eviction.
+
+Runs without API keys, either directly (python test_search_cache.py) or with pytest.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import src.tools.search_cache as search_cache
+from src.tools.search_cache import SearchResultCache
+from src.tools.web_search import WebSearchTool
+
+PARAMS = {"max_results": 5}
+RESULTS = [{"url": "https://a.org"}]
+
+
+def _age(cache: SearchResultCache, seconds: float):
+    """Pretend every entry was stored `seconds` ago."""
+    cache._conn.execute("UPDATE search_results SET created_at = ?", (time.time() - seconds,))
+    cache._conn.commit()
+
+
+def test_search_cache_key_contents():
+    key = SearchResultCache.make_key("tavily", "Eye Tracking  VR?", {"max_results": 5})
+    assert key == SearchResultCache.make_key("tavily", "eye tracking vr", {"max_results": 5})
+    assert key != SearchResultCache.make_key("brave", "eye tracking vr", {"max_results": 5})
+    assert key != SearchResultCache.make_key("tavily", "eye tracking vr", {"max_results": 10})
+
+    cache = SearchResultCache(path=":memory:")
+    cache.put("tavily", "eye tracking vr", {"max_results": 5}, [{"url": "https://a.org"}])
+    assert cache.get("tavily", "Eye tracking VR", {"max_results": 5}) == [{"url": "https://a.org"}]
+    assert cache.get("semantic_scholar", "eye tracking vr", {"max_results": 5}) is None
+
+
+def test_expired_entries_are_dropped_per_provider_ttl():
+    cache = SearchResultCache(path=":memory:", ttl_seconds={"tavily": 60, "semantic_scholar": 3600})
+    cache.put("tavily", "eye tracking", PARAMS, RESULTS)
+    cache.put("semantic_scholar", "eye tracking", PARAMS, RESULTS)
+    _age(cache, 120)
+    assert cache.get("tavily", "eye tracking", PARAMS) is None
+    assert cache.get("semantic_scholar", "eye tracking", PARAMS) == RESULTS
+    stats = cache.get_stats()
+    assert stats["by_provider"]["tavily"]["expired"] == 1
+    assert stats["entries"] == 1
+
+
+def test_offline_mode_serves_expired_entries():
+    cache = SearchResultCache(path=":memory:", ttl_seconds={"tavily": 60}, offline=True)
+    cache.put("tavily", "eye tracking", PARAMS, RESULTS)
+    _age(cache, 120)
+    assert cache.get("tavily", "eye tracking", PARAMS) == RESULTS
+
+
+def test_offline_miss_returns_no_results_without_api_call():
+    cache = SearchResultCache(path=":memory:", offline=True)
+    previous = search_cache._search_cache
+    search_cache._search_cache = cache
+    try:
+        tool = WebSearchTool(provider="tavily", max_results=5)
+        tool.api_key = "unused"
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("offline mode called the search API")
+        tool._search_tavily = fail
+        assert asyncio.run(tool.search("eye tracking")) == []
+        assert cache.get_stats()["misses"] == 1
+    finally:
+        search_cache._search_cache = previous
+
+
+def test_hits_keep_entries_from_eviction():
+    cache = SearchResultCache(path=":memory:", max_entries=2)
+    cache.put("tavily", "first", PARAMS, RESULTS)
+    time.sleep(0.01)
+    cache.put("tavily", "second", PARAMS, RESULTS)
+    time.sleep(0.01)
+    # The hit is recorded in memory and written with the next store
+    assert cache.get("tavily", "first", PARAMS) == RESULTS
+    cache.put("tavily", "third", PARAMS, RESULTS)
+    assert cache.get("tavily", "first", PARAMS) == RESULTS
+    assert cache.get("tavily", "second", PARAMS) is None
+    assert cache.evictions == 1
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
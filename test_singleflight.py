@@ -0,0 +1,94 @@
+"""
+Offline checks for request coalescing of concurrent identical tool calls.
+
+Runs without API keys, either directly (python test_singleflight.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.tools.singleflight import SingleFlight
+
+
+def test_singleflight_coalesces_concurrent_calls():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return {"results": [1, 2]}
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        assert len(calls) == 1
+        assert all(result == {"results": [1, 2]} for result in results)
+        # Joined callers get copies
+        assert results[1] is not results[0]
+        assert flight.get_stats()["coalesced"] == 4
+    asyncio.run(run())
+
+
+def test_sequential_and_distinct_calls_run_separately():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return len(calls)
+
+        assert await flight.do("a", fetch) == 1
+        assert await flight.do("a", fetch) == 2
+        assert await asyncio.gather(flight.do("b", fetch), flight.do("c", fetch)) == [3, 4]
+        assert flight.get_stats()["coalesced"] == 0
+    asyncio.run(run())
+
+
+def test_errors_reach_every_caller():
+    async def run():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight.get_stats()["executed"] == 1
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    async def run():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "done"
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
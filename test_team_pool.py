@@ -0,0 +1,137 @@
+"""
+Offline checks for the team pool: reuse, reset, discard and closing of dropped teams.
+
+Runs without API keys, either directly (python test_team_pool.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.teams import RoundRobinGroupChat
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.agents.autogen_agents import close_research_team
+from src.runtime import TeamPool
+
+
+class FakeTeam:
+    """Team stand-in counting resets."""
+
+    def __init__(self, fail_reset: bool = False):
+        self.fail_reset = fail_reset
+        self.resets = 0
+
+    async def reset(self):
+        if self.fail_reset:
+            raise RuntimeError("reset failed")
+        self.resets += 1
+
+
+class CountingClient(ReplayChatCompletionClient):
+    """Replay client counting close() calls."""
+
+    def __init__(self):
+        super().__init__(["ok"])
+        self.closed = 0
+
+    async def close(self) -> None:
+        self.closed += 1
+
+
+def _pool(max_size: int = 2, fail_reset: bool = False):
+    closed = []
+
+    async def close(team):
+        closed.append(team)
+
+    return TeamPool(lambda: FakeTeam(fail_reset), max_size=max_size, close=close), closed
+
+
+def test_released_team_is_reset_and_reused():
+    async def run():
+        pool, closed = _pool()
+        team = await pool.acquire()
+        await pool.release(team)
+        assert team.resets == 1
+        assert await pool.acquire() is team
+        metrics = pool.get_metrics()
+        assert (metrics["hits"], metrics["misses"], metrics["builds"]) == (1, 1, 1)
+        assert closed == []
+    asyncio.run(run())
+
+
+def test_discarded_team_is_closed_not_reused():
+    async def run():
+        pool, closed = _pool()
+        team = await pool.acquire()
+        await pool.discard(team)
+        assert closed == [team]
+        assert await pool.acquire() is not team
+        assert pool.get_metrics()["discarded"] == 1
+        assert pool.get_metrics()["in_use"] == 1
+    asyncio.run(run())
+
+
+def test_team_failing_reset_is_closed():
+    async def run():
+        pool, closed = _pool(fail_reset=True)
+        team = await pool.acquire()
+        await pool.release(team)
+        assert closed == [team]
+        assert pool.get_metrics()["reset_failures"] == 1
+        assert pool.get_metrics()["idle"] == 0
+    asyncio.run(run())
+
+
+def test_overflow_and_clear_close_teams():
+    async def run():
+        pool, closed = _pool(max_size=1)
+        first, second = await pool.acquire(), await pool.acquire()
+        await pool.release(first)
+        await pool.release(second)
+        assert closed == [second]
+        await pool.clear()
+        assert closed == [second, first]
+        assert pool.get_metrics()["idle"] == 0
+    asyncio.run(run())
+
+
+def test_prewarm_fills_pool_up_to_max_size():
+    async def run():
+        pool, _ = _pool(max_size=2)
+        assert await pool.prewarm(5) == 2
+        await pool.acquire()
+        assert pool.get_metrics()["hits"] == 1
+    asyncio.run(run())
+
+
+def test_close_research_team_closes_shared_client_once():
+    async def run():
+        client = CountingClient()
+        team = RoundRobinGroupChat(
+            participants=[AssistantAgent(name, model_client=client) for name in ("Planner", "Writer")],
+            max_turns=1,
+        )
+        await close_research_team(team)
+        assert client.closed == 1
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,94 @@
+"""
+Offline checks for the review termination policy: Critic verdict parsing,
+revision cap and the simple-query heuristic.
+
+Runs without API keys, either directly (python test_termination.py) or with pytest.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from autogen_agentchat.messages import TextMessage
+
+from src.agents.termination import ReviewTermination, is_low_complexity_query, parse_verdict
+
+
+def test_parse_verdict():
+    assert parse_verdict("Well sourced.\n\nAPPROVED - RESEARCH COMPLETE") == "approved"
+    assert parse_verdict("**APPROVED - RESEARCH COMPLETE**") == "approved"
+    assert parse_verdict("Verdict: APPROVED – Research complete.") == "approved"
+    assert parse_verdict("NOT APPROVED") is None
+    assert parse_verdict("This can be APPROVED once the citations are fixed.") is None
+    assert parse_verdict("NOT APPROVED - RESEARCH COMPLETE") is None
+    assert parse_verdict("APPROVED - RESEARCH COMPLETE\nBut please fix the references.") is None
+    assert parse_verdict("NEEDS REVISION\n- Add sources for claim 2") == "revision"
+    assert parse_verdict("Citations are thin.\n\n**Verdict: NEEDS REVISION**") == "revision"
+    assert parse_verdict("") is None
+
+
+def test_approval_after_needs_revision_phrase():
+    assert parse_verdict("Nothing needs revision.\n\nAPPROVED - RESEARCH COMPLETE") == "approved"
+    assert parse_verdict("Earlier I said NEEDS REVISION; fixed now.\nAPPROVED - RESEARCH COMPLETE") == "approved"
+    # The phrase inside a sentence is not a verdict
+    assert parse_verdict("I don't think this needs revision, but I am unsure.") is None
+
+
+def test_review_termination():
+    async def run():
+        termination = ReviewTermination(max_revisions=1)
+        termination.configure()
+        critic = lambda text: TextMessage(content=text, source="Critic")
+        assert await termination([critic("Close, but this is NOT APPROVED yet.")]) is None
+        assert await termination([critic("NEEDS REVISION: cite the 2021 study")]) is None
+        stop = await termination([critic("Good now.\nAPPROVED - RESEARCH COMPLETE")])
+        assert stop is not None and termination.outcome == "approved"
+
+        termination.configure()
+        await termination([critic("NEEDS REVISION")])
+        stop = await termination([critic("NEEDS REVISION")])
+        assert stop is not None and termination.outcome == "revision_cap"
+    asyncio.run(run())
+
+
+def test_approval_does_not_use_up_a_revision():
+    async def run():
+        termination = ReviewTermination(max_revisions=0)
+        termination.configure()
+        message = TextMessage(content="Nothing needs revision.\nAPPROVED - RESEARCH COMPLETE", source="Critic")
+        await termination([message])
+        assert termination.outcome == "approved" and termination.revisions == 0
+    asyncio.run(run())
+
+
+def test_only_lookup_questions_are_low_complexity():
+    assert is_low_complexity_query("What is Fitts' law?")
+    assert is_low_complexity_query("Who coined the term affordance?")
+    for query in [
+        "What are the latest trends in human-computer interaction research?",
+        "What is the state of the art in eye tracking?",
+        "How do older adults use voice assistants?",
+        "Compare VR and AR for training",
+        "Explain cognitive load theory",
+        "What is usability? What is UX?",
+        "What are the main findings on haptic feedback in mobile interfaces for blind users?",
+    ]:
+        assert not is_low_complexity_query(query), query
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
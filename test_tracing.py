@@ -0,0 +1,82 @@
+"""
+Offline checks for pipeline tracing: span nesting, stage statistics and OTLP export.
+
+Runs without API keys, either directly (python test_tracing.py) or with pytest.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.tracing import Tracer, summarize_stages
+
+
+def test_spans_nest_under_the_trace():
+    tracer = Tracer(export_path=None)
+    with tracer.trace("research_query") as root:
+        with tracer.span("guardrail.input", "guardrail") as outer:
+            with tracer.span("llm.request", "llm") as inner:
+                pass
+    assert inner.parent_id == outer.span_id and outer.parent_id == root.span_id
+    assert len(root.trace.spans) == 3
+    stages = summarize_stages(root.trace.spans)
+    assert set(stages) >= {"guardrail", "llm"}
+    assert tracer.get_stage_stats()["llm"]["count"] == 1
+
+
+def test_span_outside_trace_is_noop():
+    tracer = Tracer(export_path=None)
+    with tracer.span("tool.web_search", "tool") as span:
+        assert span is None
+
+
+def test_export_runs_off_the_calling_thread():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "traces" / "traces.jsonl"
+        tracer = Tracer(export_path=str(path))
+        export = tracer.export
+        threads = []
+
+        def recording_export(trace):
+            threads.append(threading.current_thread())
+            export(trace)
+
+        tracer.export = recording_export
+        for i in range(3):
+            with tracer.trace("research_query", query=f"q{i}"):
+                with tracer.span("team.run", "team"):
+                    pass
+        tracer.flush(timeout=5)
+
+        assert threads and all(thread is not threading.current_thread() for thread in threads)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3
+        spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert {span["name"] for span in spans} == {"research_query", "team.run"}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False, export_path=None)
+    with tracer.trace("research_query") as root:
+        assert root is None
+    assert tracer.get_stage_stats() == {}
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,113 @@
+"""
+Offline checks for the guardrail verdict cache.
+
+The LLM client is replaced by a stub, so no API keys are needed.
+Runs either directly (python test_verdict_cache.py) or with pytest.
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.guardrails.llm_safety_helper import check_relevance_llm
+from src.guardrails.safety_manager import SafetyManager
+from src.guardrails.verdict_cache import VerdictCache, lookup_verdict, policy_fingerprint, store_verdict
+
+
+class StubClient:
+    """Chat client stand-in returning a fixed answer (or raising) and counting calls."""
+
+    def __init__(self, answer: str = "", error: Exception = None):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.answer = answer
+        self.error = error
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.answer))])
+
+
+def test_policy_fingerprint_contents():
+    config = {"models": {"default": {"name": "gpt-4o-mini"}}, "prohibited_categories": ["a"]}
+    fingerprint = policy_fingerprint(config, "HCI Research")
+    assert policy_fingerprint(config, "Climate Science") != fingerprint
+    assert policy_fingerprint({**config, "models": {"default": {"name": "gpt-4o"}}}, "HCI Research") != fingerprint
+    assert policy_fingerprint({**config, "policy_version": 2}, "HCI Research") != fingerprint
+
+
+def test_verdict_cache_per_safety_manager():
+    def manager(model: str, topic: str) -> SafetyManager:
+        return SafetyManager({"models": {"default": {"name": model}}, "system": {"topic": topic},
+                              "verdict_cache": {"enabled": True}})
+
+    first = manager("gpt-4o-mini", "HCI Research")
+    second = manager("gpt-4o", "Climate Science")
+    assert first.verdict_cache is not second.verdict_cache
+    assert first.input_guardrail.verdict_cache is first.verdict_cache
+    assert first.output_guardrail.verdict_cache is first.verdict_cache
+
+    key, _ = lookup_verdict(first.verdict_cache, "relevance", "eye tracking", first.config, first.topic)
+    store_verdict(first.verdict_cache, key, {"relevant": True})
+    assert lookup_verdict(first.verdict_cache, "relevance", "eye tracking", first.config, first.topic)[1] == {"relevant": True}
+    # A manager with another model and topic neither sees nor replaces that verdict
+    assert lookup_verdict(second.verdict_cache, "relevance", "eye tracking", second.config, second.topic)[1] is None
+    assert first.verdict_cache.get_stats()["entries"] == 1
+
+
+def test_verdicts_expire_and_are_evicted_lru():
+    cache = VerdictCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", {"safe": True})
+    cache.put("b", {"safe": True})
+    assert cache.get("a") == {"safe": True}
+    cache.put("c", {"safe": False})
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    cache._entries["a"] = (time.time() - 120, {"safe": True})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"safe": False}
+
+
+def test_cached_verdicts_are_copies():
+    cache = VerdictCache()
+    verdict = {"violations": []}
+    cache.put("key", verdict)
+    verdict["violations"].append("changed")
+    cache.get("key")["violations"].append("changed")
+    assert cache.get("key") == {"violations": []}
+
+
+def test_relevance_verdict_cached_failures_not():
+    cache = VerdictCache()
+    config = {"models": {"default": {"name": "gpt-4o-mini"}}}
+
+    failing = StubClient(error=RuntimeError("rate limited"))
+    assert check_relevance_llm(failing, "eye tracking", "HCI Research", config, cache)["relevant"] is True
+    assert cache.get_stats()["entries"] == 0
+
+    client = StubClient('```json\n{"relevant": false, "reasoning": "cooking", "confidence": 0.9}\n```')
+    for _ in range(2):
+        assert check_relevance_llm(client, "chocolate cake", "HCI Research", config, cache)["relevant"] is False
+    assert client.calls == 1
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
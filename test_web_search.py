@@ -0,0 +1,88 @@
+"""
+Offline checks for hedged web search: URL normalization and rank fusion.
+
+Runs without API keys, either directly (python test_web_search.py) or with pytest.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.tools.web_search import RRF_K, fuse_results, normalize_url
+
+
+def _result(url: str, **fields):
+    return {"title": url, "url": url, "snippet": "", **fields}
+
+
+def test_normalize_url_matches_same_page():
+    canonical = normalize_url("https://example.org/papers/eye-tracking")
+    for variant in [
+        "http://www.Example.org/papers/eye-tracking/",
+        "https://EXAMPLE.org/papers/eye-tracking#results",
+        "https://example.org/papers/eye-tracking?utm_source=brave&utm_medium=web",
+        "https://example.org/papers/eye-tracking?ref=tavily&fbclid=abc",
+        "  https://example.org/papers/eye-tracking  ",
+    ]:
+        assert normalize_url(variant) == canonical, variant
+
+
+def test_normalize_url_keeps_meaningful_parts():
+    assert normalize_url("https://example.org/search?q=vr&page=2") == "https://example.org/search?q=vr&page=2"
+    assert normalize_url("https://example.org/a") != normalize_url("https://example.org/b")
+    assert normalize_url("https://docs.example.org/a") != normalize_url("https://example.org/a")
+    assert normalize_url("ftp://Example.org/file") == "ftp://example.org/file"
+
+
+def test_fuse_results_prefers_pages_found_by_several_providers():
+    fused = fuse_results({
+        "tavily": [_result("https://a.org"), _result("https://b.org")],
+        "brave": [_result("https://c.org"), _result("https://www.b.org/")],
+    }, max_results=10)
+    assert [r["url"] for r in fused] == ["https://b.org", "https://a.org", "https://c.org"]
+    assert fused[0]["providers"] == ["tavily", "brave"]
+    assert fused[1]["providers"] == ["tavily"]
+    # Second place for both providers, out of first place for both
+    assert fused[0]["score"] == round((RRF_K + 1) / (RRF_K + 2), 4)
+
+
+def test_fuse_results_ties_keep_provider_order_and_limit():
+    fused = fuse_results({
+        "tavily": [_result("https://a.org")],
+        "brave": [_result("https://c.org")],
+    }, max_results=1)
+    assert [r["url"] for r in fused] == ["https://a.org"]
+    assert fused[0]["score"] == 0.5
+
+
+def test_fuse_results_fills_missing_fields():
+    fused = fuse_results({
+        "tavily": [_result("https://a.org")],
+        "brave": [_result("https://a.org/", snippet="from brave", published_date="2024-01-01")],
+    }, max_results=5)
+    assert len(fused) == 1
+    assert fused[0]["snippet"] == "from brave"
+    assert fused[0]["published_date"] == "2024-01-01"
+    assert fused[0]["score"] == 1.0
+
+
+def test_fuse_results_without_results():
+    assert fuse_results({}, max_results=5) == []
+    assert fuse_results({"tavily": [], "brave": []}, max_results=5) == []
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} checks passed")
+    sys.exit(1 if failed else 0)